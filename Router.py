@@ -11,33 +11,87 @@ Classes:
             and page rendering in the application.
 
 Functions:
+    compile_route(pattern): Compiles a route pattern with `{name}` parameters into a regex.
+    parse_route(route): Splits a route into its path and decoded query parameters (cached).
     route_change(route, page): Updates the current page content based on the route.
+    route_change_async(route, page): Asynchronous variant of `route_change`.
+    go(page, route, **data): Navigates to a route, passing data with the data strategy.
+    get_data(page, key, default=None): Returns a value passed to the current route.
     go_back(page): Navigates to the previous route in history.
     reload_page(current_route, page): Reloads the current page.
+    on_unmount(callback): Registers a callback run when the current view is unmounted.
+    singleton(page, key, factory): Returns a control shared by all views, creating it once.
 
 Usage:
     The `Router` class is used as a central mechanism for defining and managing 
     application routes and navigation.
 """
 
+import asyncio
+import importlib
+import re
+from collections import deque
 from enum import Enum
+from functools import lru_cache
+from urllib.parse import urlsplit, parse_qsl, unquote, urlencode
 import flet as ft
+from backend.Updates import get_scheduler
+from backend import Metrics
+
+HISTORY_SIZE = 50  # Maksymalna liczba tras pamiętanych w historii
+RESOLVE_CACHE_SIZE = 1024  # Maksymalna liczba zapamiętanych rozwiązań tras
+PARAMETER = re.compile(r"\{(\w+)\}")  # Parametr ścieżki, np. {pool} w /play/{pool}
 
 class DataStrategyEnum(Enum):
     """
     Enumeration to represent different data management strategies.
 
     Members:
-        QUERY: Use URL query parameters for data transfer.
-        ROUTER_DATA: Use router's internal data dictionary.
-        CLIENT_STORAGE: Use client's local storage for persisting data.
-        STATE: Use Flet's built-in state management for data transfer.
+        QUERY: Use URL query parameters for data transfer (values are encoded as strings).
+        ROUTER_DATA: Use router's internal data dictionary (objects passed by reference).
+        CLIENT_STORAGE: Use client's local storage for persisting data; data passed between
+                        routes is kept in the router's data dictionary, as with ROUTER_DATA.
+        STATE: Use Flet's built-in state management (the page session) for data transfer
+               (objects passed by reference).
     """
     QUERY = 0
     ROUTER_DATA = 1
     CLIENT_STORAGE = 2
     STATE = 3
 
+def compile_route(pattern):
+    """
+    Compiles a route pattern into a regular expression.
+
+    Args:
+        pattern (str): The route pattern, e.g. "/play/{pool}". Each `{name}` parameter
+                       matches a single path segment.
+
+    Returns:
+        re.Pattern: The compiled expression with a named group per parameter.
+    """
+    regex = ""
+    position = 0
+    for match in PARAMETER.finditer(pattern):
+        regex += re.escape(pattern[position:match.start()]) + f"(?P<{match.group(1)}>[^/]+)"
+        position = match.end()
+    regex += re.escape(pattern[position:])
+    return re.compile(f"^{regex}$")
+
+@lru_cache(maxsize=RESOLVE_CACHE_SIZE)
+def parse_route(route):
+    """
+    Splits a route into its path and query parameters. Results are cached per route.
+
+    Args:
+        route (str): The route, e.g. "/play?word=ala+ma%20kota".
+
+    Returns:
+        tuple: The path (str) and a tuple of decoded (key, value) query pairs.
+    """
+    parts = urlsplit(route)
+    return parts.path or "/", tuple(parse_qsl(parts.query, keep_blank_values=True))
+
 class Router:
     """
     A custom routing manager for handling navigation and rendering in a Flet app.
@@ -45,14 +99,26 @@ class Router:
     Attributes:
         data_strategy (DataStrategyEnum): Strategy used for managing data.
         data (dict): Dictionary to store route-related data.
-        routes (dict): A dictionary mapping routes to their respective handler functions.
+        routes (dict): A dictionary mapping routes (optionally with `{name}` parameters)
+                       to their respective handler functions, or to "module:function"
+                       strings imported on first navigation.
+        cached_routes (set): Routes whose built views are cached and reused between visits.
         body (ft.Container): The main container for the app content.
-        history (list): List of previously visited routes for navigation history.
+        history (deque): Bounded list of previously visited routes for navigation history.
+        params (dict): Path parameters of the current route.
+        views (dict): Built views of the routes in `cached_routes`, keyed by path.
+        singletons (dict): Controls shared by all views, keyed by name.
 
     Methods:
         route_change(route, page): Updates the current page content based on the route.
+        route_change_async(route, page): Asynchronous variant of `route_change`.
+        resolve(path): Finds the route pattern and path parameters matching a path.
+        go(page, route, **data): Navigates to a route, passing data with the data strategy.
+        get_data(page, key, default=None): Returns a value passed to the current route.
         go_back(page): Navigates to the previous route in the history.
         reload_page(current_route, page): Reloads the current page with updated content.
+        on_unmount(callback): Registers a callback run when the current view is unmounted.
+        singleton(page, key, factory): Returns a control shared by all views, creating it once.
     """
 
     def __init__(self, data_strategy=DataStrategyEnum.QUERY):
@@ -65,9 +131,52 @@ class Router:
         """
         self.data_strategy = data_strategy
         self.data = dict()
+        self.params = dict()
         self.routes = {}
+        self.cached_routes = set()  # Trasy, których widoki budujemy tylko raz
         self.body = ft.Container()
-        self.history = []  # Historia tras odwiedzonych w aplikacji
+        self.history = deque(maxlen=HISTORY_SIZE)  # Historia tras odwiedzonych w aplikacji
+        self.views = {}  # Zbudowane widoki tras z `cached_routes`
+        self.singletons = {}  # Kontrolki współdzielone przez widoki (np. FilePicker)
+        self._unmount_callbacks = []  # Funkcje sprzątające bieżącego widoku
+
+    @property
+    def routes(self):
+        """dict: Route patterns mapped to handlers (or "module:function" strings). Assigning compiles the route table."""
+        return self._routes
+
+    @routes.setter
+    def routes(self, routes):
+        # Kompilacja tablicy tras: trasy stałe w słowniku, trasy z parametrami jako wyrażenia regularne
+        self._routes = routes
+        self._static_routes = {path: path for path in routes if not PARAMETER.search(path)}
+        self._pattern_routes = [(compile_route(path), path) for path in routes if PARAMETER.search(path)]
+        self._resolved = {}
+
+    def resolve(self, path):
+        """
+        Finds the route pattern matching a path.
+
+        Args:
+            path (str): The path part of the route.
+
+        Returns:
+            tuple: The matched route pattern (or None) and a dict of path parameters.
+        """
+        resolved = self._resolved.get(path)
+        if resolved is None:
+            resolved = (self._static_routes.get(path), {})
+            if resolved[0] is None:
+                for regex, pattern in self._pattern_routes:
+                    match = regex.match(path)
+                    if match:
+                        params = {key: unquote(value) for key, value in match.groupdict().items()}
+                        resolved = (pattern, params)
+                        break
+            if len(self._resolved) >= RESOLVE_CACHE_SIZE:
+                self._resolved.clear()
+            self._resolved[path] = resolved
+        return resolved
 
     def route_change(self, route, page):
         """
@@ -78,28 +187,153 @@ class Router:
             page (ft.Page): The main page object to update the displayed content.
 
         This method:
-            1. Parses the route to extract the path and query parameters.
+            1. Parses the route to extract the path, path parameters and query parameters.
             2. Updates the `history` to include the new route.
-            3. Renders the content based on the route's handler function.
+            3. Unmounts the previous view and mounts the one returned by the route's
+               handler function (or the cached one for routes in `cached_routes`).
         """
         # Parsowanie trasy oraz parametrów zapytania
-        _page = route.route.split("?")[0]
-        queries = route.route.split("?")[1:]
+        _page, queries = parse_route(route.route)
+        pattern, self.params = self.resolve(_page)
 
         # Dodanie trasy do historii, jeśli nie jest identyczna z poprzednią
         if not self.history or self.history[-1] != _page:
             self.history.append(_page)
 
-        # Parsowanie parametrów zapytania i zapisanie ich w słowniku danych
-        for item in queries:
-            key = item.split("=")[0]
-            value = item.split("=")[1]
-            self.data[key] = value.replace('+', ' ')  # Zamiana '+' na spacje
+        # Zapisanie parametrów ścieżki i zapytania w słowniku danych
+        self.data.update(self.params)
+        self.data.update(queries)
+
+        # Odmontowanie poprzedniego widoku i zamontowanie nowego
+        self._unmount()
+        with Metrics.timed(f"route_render_ms[{pattern}]"):
+            self.body.content = self._mount(_page, pattern, page)
+        get_scheduler(page).request()  # Aktualizacja strony (jedna na całą akcję użytkownika)
+
+    async def route_change_async(self, route, page):
+        """
+        Asynchronous variant of `route_change`, used as the route change handler of async apps.
+
+        Args:
+            route (ft.Route): The current route object containing the route and query parameters.
+            page (ft.Page): The main page object to update the displayed content.
+
+        This method yields to the event loop once, so events queued before the navigation
+        (e.g. file loading progress) are handled first, and then renders the route.
+        """
+        await asyncio.sleep(0)
+        self.route_change(route, page)
+
+    def _mount(self, path, pattern, page):
+        # Zwraca widok trasy: z pamięci podręcznej albo zbudowany od nowa
+        view = self.views.get(path)
+        if view is None:
+            handler = self._handler(pattern)
+            view = handler(self, page)
+            if Metrics.enabled():
+                Metrics.observe(f"view_controls[{pattern}]", Metrics.count_controls(view))
+            if pattern in self.cached_routes:
+                self.views[path] = view
+        return view
+
+    def _handler(self, pattern):
+        # Zwraca funkcję widoku; moduł widoku importujemy dopiero przy pierwszej nawigacji
+        handler = self._routes.get(pattern)
+        if handler is None:
+            return lambda router, page: ft.Text("404 Not Found")
+        if isinstance(handler, str):
+            module_name, function_name = handler.split(":")
+            handler = getattr(importlib.import_module(module_name), function_name)
+            self._routes[pattern] = handler
+        return handler
+
+    def _unmount(self):
+        # Wywołanie funkcji sprzątających zarejestrowanych przez bieżący widok
+        callbacks, self._unmount_callbacks = self._unmount_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def on_unmount(self, callback):
+        """
+        Registers a callback run when the current view is unmounted, i.e. before
+        the next route change or reload.
+
+        Args:
+            callback (callable): A function without arguments.
+
+        Returns:
+            None
+        """
+        self._unmount_callbacks.append(callback)
+
+    def singleton(self, page, key, factory):
+        """
+        Returns a control shared by all views, creating it and adding it to the page
+        overlay only once. Used for non-visual controls such as `ft.FilePicker`.
+
+        Args:
+            page (ft.Page): The page that owns the control.
+            key (str): The name of the control.
+            factory (callable): A function without arguments creating the control.
+
+        Returns:
+            ft.Control: The shared control.
+        """
+        control = self.singletons.get(key)
+        if control is None:
+            control = factory()
+            self.singletons[key] = control
+            page.overlay.append(control)
+        return control
+
+    def go(self, page, route, **data):
+        """
+        Navigates to a route, passing data to it with the router's data strategy.
+
+        With QUERY the values are encoded into the URL, so they arrive as strings.
+        With ROUTER_DATA and CLIENT_STORAGE they are kept in the router's `data`
+        dictionary, and with STATE in the page session; both pass the objects
+        themselves, without any serialization. With STATE the session holds only
+        the data of the latest navigation, so a route reached without data does
+        not see the data passed to the previous one.
+
+        Args:
+            page (ft.Page): The main page object to navigate.
+            route (str): The route to navigate to.
+            **data: The values passed to the route.
 
-        # Ustawienie zawartości strony na podstawie obsługiwanej trasy
-        self.body.content = self.routes.get(_page, lambda _: ft.Text("404 Not Found"))(self, page)
-        self.body.update()  # Aktualizacja kontenera
-        page.update()  # Aktualizacja strony
+        Returns:
+            None
+        """
+        if data and self.data_strategy == DataStrategyEnum.QUERY:
+            route = f"{route}{'&' if '?' in route else '?'}{urlencode(data)}"
+        elif self.data_strategy == DataStrategyEnum.STATE:
+            # Dane w sesji dotyczą tylko trasy, na którą przechodzimy: trasa bez danych nie widzi danych poprzedniej
+            if data:
+                page.session.set("route_data", dict(data))
+            elif page.session.contains_key("route_data"):
+                page.session.remove("route_data")
+        elif data:
+            self.data.update(data)
+        page.go(route)
+
+    def get_data(self, page, key, default=None):
+        """
+        Returns a value passed to the current route with `go` (or with the URL).
+
+        Args:
+            page (ft.Page): The main page object.
+            key (str): The name of the value.
+            default (any, optional): Returned if the value was not passed. Default is None.
+
+        Returns:
+            any: The passed value or `default`.
+        """
+        if self.data_strategy == DataStrategyEnum.STATE:
+            state = page.session.get("route_data")
+            if state is not None and key in state:
+                return state[key]
+        return self.data.get(key, default)
 
     def go_back(self, page):
         """
@@ -125,7 +359,10 @@ class Router:
             current_route (ft.Route): The current route object.
             page (ft.Page): The main page object to reload.
 
-        This method triggers a re-render of the current page content.
+        This method drops the cached view of the current route (if any) and
+        triggers a re-render of the current page content.
         """
+        # Przeładowanie oznacza, że widok jest nieaktualny
+        self.views.pop(parse_route(current_route.route)[0], None)
         # Przekazanie bieżącej trasy do funkcji zmiany trasy
         self.route_change(current_route, page)
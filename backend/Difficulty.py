@@ -0,0 +1,255 @@
+"""
+Difficulty.py
+
+This module scores the words of a pool by difficulty and buckets them into difficulty
+levels, so a word of the selected level is drawn in O(1) instead of filtering the pool
+for every game.
+
+A word's score combines its length, the number of distinct letters and how rare its
+letters are in the pool itself (the mean of -log2 of the fraction of words containing
+each letter). Scores are quantized to one byte per word, which is the metadata stored
+next to the pool (`WordPool.metadata`, and the metadata section of compiled pool files),
+so compiled pools are not scored again. The levels split the pool into thirds by score.
+
+Scoring is vectorized with NumPy: a chunk of the pool is decoded into one array of code
+points, and the distinct letters of every word are found by sorting (word, letter) keys,
+so no Python code runs per word. A large pool is split into chunks processed by a process
+pool: the letter frequencies, the scores and the level buckets are each computed chunk
+by chunk in parallel and merged.
+
+Classes:
+    Difficulty: Enum of the difficulty levels.
+    DifficultyIndex: Words of a pool bucketed by difficulty level.
+
+Functions:
+    score_pool(pool, workers=None):
+        Returns the difficulty score of every word of a pool, one byte per word.
+
+    get_difficulty_index(pool, workers=None):
+        Returns the DifficultyIndex of a pool, building it on first use.
+"""
+
+import math
+import os
+import weakref
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from enum import Enum
+
+PARALLEL_MIN_WORDS = 500_000  # Od tej wielkości puli liczymy w wielu procesach
+CHUNK_WORDS = 250_000  # Liczba słówek w jednej porcji dla procesu roboczego
+LENGTH_WEIGHT = 0.5  # Waga długości słówka
+DISTINCT_WEIGHT = 1.0  # Waga liczby różnych liter
+RARITY_WEIGHT = 2.0  # Waga rzadkości liter (w bitach)
+SCALE = 4  # Wynik mnożymy przez SCALE i zapisujemy na jednym bajcie (0-255)
+
+class Difficulty(Enum):
+    """
+    Enumeration of the difficulty levels.
+
+    Members:
+        EASY: The third of the pool with the lowest scores.
+        MEDIUM: The middle third of the pool.
+        HARD: The third of the pool with the highest scores.
+    """
+    EASY = 0
+    MEDIUM = 1
+    HARD = 2
+
+def _letter_pairs(chunk):
+    # Porcja to bajty kolejnych słówek i ich przesunięcia (jak w WordPool). Zwraca alfabet porcji
+    # (punkty kodowe), długość każdego słówka w znakach oraz pary (słówko, litera) bez powtórzeń.
+    # NumPy importujemy dopiero tutaj, żeby nie wydłużać startu aplikacji
+    import numpy as np
+    blob, offsets_bytes = chunk
+    offsets = np.frombuffer(offsets_bytes, dtype=np.uint32).astype(np.int64)
+    offsets -= offsets[0]
+    codes = np.frombuffer(blob.decode('utf-8').encode('utf-32-le'), dtype=np.uint32)
+
+    # Liczba znaków przed każdym przesunięciem: bajty kontynuacji UTF-8 (10xxxxxx) nie zaczynają znaku
+    starts = (np.frombuffer(blob, dtype=np.uint8) & 0xC0) != 0x80
+    chars_before = np.zeros(len(starts) + 1, dtype=np.int64)
+    np.cumsum(starts, out=chars_before[1:])
+    lengths = np.diff(chars_before[offsets])
+
+    # Alfabet porcji i numer każdego znaku w alfabecie (zliczanie zamiast sortowania wszystkich znaków)
+    occurs = np.bincount(codes) > 0 if len(codes) else np.zeros(0, dtype=bool)
+    alphabet = np.flatnonzero(occurs)
+    inverse = (np.cumsum(occurs) - 1)[codes]
+    is_letter = np.array([chr(code).isalpha() for code in alphabet.tolist()], dtype=bool)
+
+    # Pary (słówko, litera): klucze posortowane, a powtórzenia (ta sama litera w słówku) pominięte
+    word_of_char = np.repeat(np.arange(len(lengths), dtype=np.int64), lengths)
+    letters = is_letter[inverse]  # Pomijamy spacje, myślniki itp.
+    pairs = np.sort(word_of_char[letters] * len(alphabet) + inverse[letters])
+    first = np.ones(len(pairs), dtype=bool)
+    first[1:] = pairs[1:] != pairs[:-1]
+    pairs = pairs[first]
+    return alphabet, lengths, pairs // len(alphabet), pairs % len(alphabet)
+
+def _count_letters(chunk):
+    # Proces roboczy: w ilu słówkach porcji występuje każda litera
+    import numpy as np
+    alphabet, _, _, letters = _letter_pairs(chunk)
+    counts = np.bincount(letters, minlength=len(alphabet))
+    return Counter({chr(code): int(n) for code, n in zip(alphabet.tolist(), counts.tolist()) if n})
+
+def _score_chunk(chunk, rarity):
+    # Proces roboczy: wynik każdego słówka porcji, po jednym bajcie
+    import numpy as np
+    alphabet, lengths, words, letters = _letter_pairs(chunk)
+    weights = np.array([rarity.get(chr(code), 0.0) for code in alphabet.tolist()])
+    distinct = np.bincount(words, minlength=len(lengths))  # Liczba różnych liter słówka
+    rare = np.bincount(words, weights=weights[letters], minlength=len(lengths)) / np.maximum(distinct, 1)
+    value = LENGTH_WEIGHT * lengths + DISTINCT_WEIGHT * distinct + RARITY_WEIGHT * rare
+    scores = np.minimum(255, (value * SCALE).astype(np.int64))
+    scores[distinct == 0] = 0  # Słówko bez liter
+    return scores.astype(np.uint8).tobytes()
+
+def _bucket_chunk(scores, start, levels):
+    # Proces roboczy: indeksy słówek porcji podzielone według poziomów
+    import numpy as np
+    level_of = np.frombuffer(levels, dtype=np.uint8)[np.frombuffer(scores, dtype=np.uint8)]
+    return tuple((np.flatnonzero(level_of == level.value) + start).astype(np.uint32).tobytes() for level in Difficulty)
+
+def _chunks(pool):
+    # Dzielimy pulę na porcje bez dekodowania słówek w procesie głównym
+    for start in range(0, len(pool), CHUNK_WORDS):
+        yield pool._chunk(start, min(start + CHUNK_WORDS, len(pool)))
+
+def _map(executor, func, items, *args):
+    # Bez puli procesów liczymy w bieżącym procesie
+    if executor is None:
+        return [func(item, *args) for item in items]
+    return list(executor.map(func, items, *(([arg] * len(items)) for arg in args)))
+
+def _executor(pool, workers):
+    # Pula procesów opłaca się tylko dla dużych pul i przy więcej niż jednym procesorze
+    workers = workers or os.cpu_count() or 1
+    if len(pool) < PARALLEL_MIN_WORDS or workers < 2:
+        return None
+    return ProcessPoolExecutor(max_workers=workers)
+
+def score_pool(pool, workers=None):
+    """
+    Returns the difficulty score of every word of a pool. Pools of at least
+    PARALLEL_MIN_WORDS words are scored in a process pool.
+
+    Args:
+        pool (WordPool): The word pool.
+        workers (int, optional): The number of worker processes. Default is the number of CPUs.
+
+    Returns:
+        bytes: One score (0-255) per word.
+    """
+    executor = _executor(pool, workers)
+    try:
+        chunks = list(_chunks(pool))
+        return _score(executor, chunks, len(pool))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+def _score(executor, chunks, count):
+    # Częstość liter w puli, a z niej rzadkość każdej litery w bitach
+    counts = Counter()
+    for partial in _map(executor, _count_letters, chunks):
+        counts.update(partial)
+    rarity = {letter: -math.log2(n / count) for letter, n in counts.items()}
+    return b"".join(_map(executor, _score_chunk, chunks, rarity))
+
+
+class DifficultyIndex:
+    """
+    Words of a pool bucketed by difficulty level.
+
+    Attributes:
+        levels (bytes): Maps a score (0-255) to the value of its Difficulty level.
+        buckets (tuple): For each level, an `array('I')` of the indexes of its words.
+
+    Methods:
+        draw(level, rng): Returns the index of a random word of a level.
+    """
+
+    def __init__(self, scores, executor=None):
+        """
+        Initializes the DifficultyIndex instance, splitting the words into thirds by score.
+
+        Args:
+            scores (bytes): One score per word (see `score_pool`).
+            executor (ProcessPoolExecutor, optional): Used to bucket the words in parallel.
+                                                      Default is None.
+        """
+        count = len(scores)
+        histogram = Counter(scores)
+
+        # Poziom wyniku zależy od tego, w której trzeciej części puli zaczynają się słówka z tym wynikiem
+        levels = bytearray(256)
+        total = 0
+        for score in range(256):
+            levels[score] = min(Difficulty.HARD.value, 3 * total // count) if count else 0
+            total += histogram[score]
+        self.levels = bytes(levels)
+
+        starts = range(0, count, CHUNK_WORDS)
+        parts = [bytes(scores[start:start + CHUNK_WORDS]) for start in starts]
+        self.buckets = tuple(array('I') for _ in Difficulty)
+        if executor is None:
+            partials = [_bucket_chunk(part, start, self.levels) for part, start in zip(parts, starts)]
+        else:
+            partials = executor.map(_bucket_chunk, parts, starts, [self.levels] * len(parts))
+        for partial in partials:
+            for bucket, data in zip(self.buckets, partial):
+                bucket.frombytes(data)
+
+    def draw(self, level, rng):
+        """
+        Returns the index of a random word of a difficulty level.
+
+        Args:
+            level (Difficulty): The difficulty level.
+            rng (random.Random): The source of randomness.
+
+        Returns:
+            int: The index of the word in the pool, or None if the level has no words.
+        """
+        bucket = self.buckets[level.value]
+        if not bucket:
+            return None
+        return bucket[rng.randrange(len(bucket))]
+
+    def __repr__(self):
+        sizes = ", ".join(f"{level.name}={len(bucket)}" for level, bucket in zip(Difficulty, self.buckets))
+        return f"DifficultyIndex({sizes})"
+
+# Indeksy poziomów budowane raz na pulę i zwalniane razem z nią
+_indexes = weakref.WeakKeyDictionary()
+
+def get_difficulty_index(pool, workers=None):
+    """
+    Returns the DifficultyIndex of a pool, building it on first use. The scores stored
+    in the pool's metadata are used if present; otherwise the pool is scored and the
+    scores are stored in its metadata.
+
+    Args:
+        pool (WordPool): The word pool.
+        workers (int, optional): The number of worker processes. Default is the number of CPUs.
+
+    Returns:
+        DifficultyIndex: The index of the pool.
+    """
+    index = _indexes.get(pool)
+    if index is not None:
+        return index
+
+    executor = _executor(pool, workers)
+    try:
+        if pool.metadata is None:
+            pool.metadata = _score(executor, list(_chunks(pool)), len(pool))
+        index = DifficultyIndex(pool.metadata, executor)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    _indexes[pool] = index
+    return index
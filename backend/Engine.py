@@ -0,0 +1,128 @@
+"""
+Engine.py
+
+This module contains the UI-free rules of the game: selecting a word from a pool, starting
+a game and playing it to the end. It does not depend on Flet, so it can be used both by
+the views (through `backend.Game`) and by headless tools such as `backend.Simulator`.
+
+Functions:
+    pick_word(pool, rng=random, difficulty=None):
+        Selects a random word (optionally of a difficulty level) from a word pool.
+
+    word_indexes(pool, difficulty=None):
+        Returns the indexes of the words of a difficulty level.
+
+    draw_word(pool, bag, difficulty=None):
+        Draws the next word of a shuffle bag, so words do not repeat until all were drawn.
+
+    start_game(pool, max_mistakes, rng=random, fold=False):
+        Starts a new game with a random word from a pool.
+
+    is_over(state):
+        Checks whether a game has been won or lost.
+
+    play(state, strategy):
+        Plays a game to the end using a guessing strategy.
+"""
+
+import random
+from backend.GameState import GameState
+from backend.Difficulty import get_difficulty_index
+
+def pick_word(pool, rng=random, difficulty=None):
+    """
+    Selects a random word from a word pool. With a difficulty level the word is drawn
+    from the level's precomputed bucket, falling back to the whole pool if it is empty.
+
+    Args:
+        pool (WordPool): The pool to select the word from.
+        rng (random.Random, optional): The source of randomness. Default is the `random` module.
+        difficulty (Difficulty, optional): The difficulty level of the word. Default is None (any).
+
+    Returns:
+        str: A random word from the pool.
+    """
+    if difficulty is not None:
+        index = get_difficulty_index(pool).draw(difficulty, rng)
+        if index is not None:
+            return pool[index]
+    return pool[rng.randrange(len(pool))]
+
+def word_indexes(pool, difficulty=None):
+    """
+    Returns the indexes of the words of a difficulty level.
+
+    Args:
+        pool (WordPool): The word pool.
+        difficulty (Difficulty, optional): The difficulty level. Default is None (any).
+
+    Returns:
+        sequence: The indexes of the words of the level (its precomputed bucket), or of
+                  the whole pool if no level is selected or the level has no words.
+    """
+    if difficulty is not None:
+        bucket = get_difficulty_index(pool).buckets[difficulty.value]
+        if bucket:
+            return bucket
+    return range(len(pool))
+
+def draw_word(pool, bag, difficulty=None):
+    """
+    Draws the next word of a shuffle bag, so words do not repeat until all were drawn.
+
+    Args:
+        pool (WordPool): The word pool.
+        bag (ShuffleBag): The bag of `len(word_indexes(pool, difficulty))` indexes.
+        difficulty (Difficulty, optional): The difficulty level. Default is None (any).
+
+    Returns:
+        str: The drawn word.
+    """
+    return pool[word_indexes(pool, difficulty)[bag.draw()]]
+
+def start_game(pool, max_mistakes, rng=random, fold=False):
+    """
+    Starts a new game with a random word from a pool.
+
+    Args:
+        pool (WordPool): The pool to select the word from.
+        max_mistakes (int): The maximum number of allowed mistakes.
+        rng (random.Random, optional): The source of randomness. Default is the `random` module.
+        fold (bool, optional): Whether letters with and without diacritics are the same letter.
+                               Default is False.
+
+    Returns:
+        GameState: The state of the new game.
+    """
+    return GameState(pick_word(pool, rng), max_mistakes, fold)
+
+def is_over(state):
+    """
+    Checks whether a game has been won or lost.
+
+    Args:
+        state (GameState): The state of the game.
+
+    Returns:
+        bool: True if the game has ended.
+    """
+    return state.is_won() or state.is_lost()
+
+def play(state, strategy):
+    """
+    Plays a game to the end using a guessing strategy.
+
+    Args:
+        state (GameState): The state of the game.
+        strategy (callable): Called with the state, returns the next letter to guess
+                             or None when it has no more letters to try.
+
+    Returns:
+        GameState: The final state of the game.
+    """
+    while not is_over(state):
+        letter = strategy(state)
+        if letter is None:
+            break  # Strategia nie ma już liter do sprawdzenia
+        state.guess(letter)
+    return state
@@ -0,0 +1,165 @@
+"""
+Gallows.py
+
+This module draws the hangman figure on a Flet canvas, one stage per mistake.
+
+The figure is a fixed sequence of strokes (the gallows, then the man). For a given
+`max_mistakes` the strokes are spread evenly over the stages, so the figure is complete
+exactly at the last allowed mistake; when there are more stages than strokes, every stroke
+is split into equal segments, so each mistake still draws something. The stage-to-stroke
+mapping and the scaled geometry of every stage are computed once per limit and canvas size
+and cached. A wrong guess only appends the shapes of the new stages to the canvas, so the
+update sent to the client carries just the new strokes instead of the whole figure.
+
+Functions:
+    stage_units(max_mistakes):
+        Returns the range of stroke segments drawn at each stage.
+
+    stage_frames(max_mistakes, width, height):
+        Returns the scaled geometry of the segments drawn at each stage.
+
+    gallows_canvas(state, width=WIDTH, height=HEIGHT):
+        Creates a canvas with the figure of a game drawn up to its current stage.
+
+    draw_mistakes(canvas, state):
+        Appends the shapes of the stages reached since the last drawing.
+"""
+
+import math
+from functools import lru_cache
+import flet as ft
+import flet.canvas as cv
+from backend import Metrics
+
+WIDTH = 200  # Domyślna szerokość rysunku (px)
+HEIGHT = 220  # Domyślna wysokość rysunku (px)
+STROKE_WIDTH = 4  # Grubość linii (px)
+
+# Kolejne kreski rysunku we współrzędnych od 0 do 1: ("line", x1, y1, x2, y2) albo ("circle", x, y, promień)
+STROKES = (
+    ("line", 0.05, 0.95, 0.60, 0.95),  # Podstawa
+    ("line", 0.20, 0.95, 0.20, 0.05),  # Słup
+    ("line", 0.20, 0.05, 0.70, 0.05),  # Belka
+    ("line", 0.20, 0.20, 0.35, 0.05),  # Podpora
+    ("line", 0.70, 0.05, 0.70, 0.20),  # Sznur
+    ("circle", 0.70, 0.28, 0.08),  # Głowa
+    ("line", 0.70, 0.36, 0.70, 0.62),  # Tułów
+    ("line", 0.70, 0.42, 0.58, 0.54),  # Lewa ręka
+    ("line", 0.70, 0.42, 0.82, 0.54),  # Prawa ręka
+    ("line", 0.70, 0.62, 0.60, 0.80),  # Lewa noga
+    ("line", 0.70, 0.62, 0.80, 0.80),  # Prawa noga
+)
+
+def _split(stroke, parts):
+    # Dzieli kreskę na równe odcinki (okrąg na łuki), żeby każdy etap coś dorysowywał
+    if stroke[0] == "circle":
+        if parts == 1:
+            return [stroke]
+        _, x, y, radius = stroke
+        sweep = 2 * math.pi / parts
+        return [("arc", x, y, radius, -math.pi / 2 + i * sweep, sweep) for i in range(parts)]
+    _, x1, y1, x2, y2 = stroke
+    return [
+        ("line", x1 + (x2 - x1) * i / parts, y1 + (y2 - y1) * i / parts,
+         x1 + (x2 - x1) * (i + 1) / parts, y1 + (y2 - y1) * (i + 1) / parts)
+        for i in range(parts)
+    ]
+
+@lru_cache(maxsize=64)
+def _segments(parts):
+    return tuple(segment for stroke in STROKES for segment in _split(stroke, parts))
+
+@lru_cache(maxsize=64)
+def stage_units(max_mistakes):
+    """
+    Returns the range of stroke segments drawn at each stage, for a mistakes limit.
+    The figure is complete at the last stage.
+
+    Args:
+        max_mistakes (int): The maximum number of allowed mistakes.
+
+    Returns:
+        tuple: For each stage (mistake 1 to `max_mistakes`), a `range` of segment indexes.
+    """
+    stages = max(1, max_mistakes)
+    count = len(_segments(math.ceil(stages / len(STROKES))))
+    # Po k pomyłkach widać ceil(k * count / stages) odcinków
+    visible = [-(-k * count // stages) for k in range(stages + 1)]
+    return tuple(range(visible[k - 1], visible[k]) for k in range(1, stages + 1))
+
+@lru_cache(maxsize=64)
+def stage_frames(max_mistakes, width, height):
+    """
+    Returns the geometry of the segments drawn at each stage, scaled to a canvas size.
+
+    Args:
+        max_mistakes (int): The maximum number of allowed mistakes.
+        width (int): The width of the canvas.
+        height (int): The height of the canvas.
+
+    Returns:
+        tuple: For each stage, a tuple of segments in canvas coordinates:
+               ("line", x1, y1, x2, y2), ("circle", x, y, radius) or ("arc", x, y, radius, start, sweep).
+    """
+    segments = _segments(math.ceil(max(1, max_mistakes) / len(STROKES)))
+    scale = min(width, height)
+
+    def scaled(segment):
+        kind, x, y, *rest = segment
+        if kind == "line":
+            return (kind, x * width, y * height, rest[0] * width, rest[1] * height)
+        return (kind, x * width, y * height, rest[0] * scale, *rest[1:])
+
+    return tuple(tuple(scaled(segments[i]) for i in units) for units in stage_units(max_mistakes))
+
+def _shape(segment, paint):
+    # Kontrolki nie mogą być współdzielone między kanwami, więc z gotowej geometrii tworzymy nowe
+    kind = segment[0]
+    if kind == "line":
+        return cv.Line(*segment[1:], paint=paint)
+    if kind == "circle":
+        return cv.Circle(*segment[1:], paint=paint)
+    _, x, y, radius, start, sweep = segment
+    return cv.Arc(x - radius, y - radius, 2 * radius, 2 * radius, start, sweep, paint=paint)
+
+def gallows_canvas(state, width=WIDTH, height=HEIGHT):
+    """
+    Creates a canvas with the figure of a game drawn up to its current stage. The number
+    of drawn stages is kept in the canvas' `data`.
+
+    Args:
+        state (GameState): The state of the game.
+        width (int, optional): The width of the canvas. Default is WIDTH.
+        height (int, optional): The height of the canvas. Default is HEIGHT.
+
+    Returns:
+        cv.Canvas: The canvas with the figure.
+    """
+    canvas = cv.Canvas(shapes=[], width=width, height=height, data=0)
+    draw_mistakes(canvas, state)
+    return canvas
+
+def draw_mistakes(canvas, state):
+    """
+    Appends to a canvas the shapes of the stages reached since the last drawing.
+    The shapes already on the canvas are left untouched, so updating the canvas
+    sends only the new ones.
+
+    Args:
+        canvas (cv.Canvas): A canvas created by `gallows_canvas`.
+        state (GameState): The state of the game.
+
+    Returns:
+        bool: True if any shapes were added (the canvas needs an update).
+    """
+    frames = stage_frames(state.max_mistakes, canvas.width, canvas.height)
+    drawn, stage = canvas.data, min(state.mistakes, len(frames))
+    if stage <= drawn:
+        return False
+
+    paint = ft.Paint(stroke_width=STROKE_WIDTH, style=ft.PaintingStyle.STROKE, stroke_cap=ft.StrokeCap.ROUND)
+    added = [_shape(segment, paint) for frame in frames[drawn:stage] for segment in frame]
+    canvas.shapes.extend(added)
+    canvas.data = stage
+    Metrics.increment("gallows_shapes_sent", len(added))
+    return True
@@ -1,7 +1,7 @@
 """
 game.py
 
-This module contains functions to handle the game logic for a word-guessing game.
+This module connects the UI-free game engine (`backend.Engine`) with the Flet page.
 It includes functionality for randomly selecting a word, handling letter guesses, 
 updating the display, and handling game restart, win, and loss conditions.
 
@@ -9,14 +9,27 @@ Functions:
     random_word(page):
         Selects a random word from the session's word pool.
 
-    guess_letter(page, router, letter_input, correct_word, guessed_letters, mistakes, guessed_letters_set, max_trials):
+    new_game(page):
+        Starts a new game and stores its GameState in the session.
+
+    guess_letter(page, router, letter_input, state, word_display, used_trials, gallows=None):
         Processes the player's letter guess and updates the game state.
 
-    update_display(page, router, guessed_letters, mistakes, max_trials):
-        Updates the game interface with the current guessed letters and number of mistakes.
+    update_display(page, router, state, letter_input, word_display, used_trials, gallows=None):
+        Patches the game controls in place, or reloads the page when the game ends.
+
+    record_game(page, state):
+        Appends a finished game to the history of games.
+
+    show_hint(page, state, hint_btn=None):
+        Shows the most informative next letter as a snack bar, preparing the hint index
+        in the background on first use.
+
+    set_hint_preparing(hint_btn, preparing):
+        Shows on the hint button whether the hint index is being prepared.
 
     restart_game(page, router):
-        Resets the game session and reloads the page.
+        Removes the game state from the session and reloads the page.
 
     handle_win(page, content, restart_btn, word_display):
         Handles the win condition by displaying a congratulatory message and enabling the restart button.
@@ -25,27 +38,81 @@ Functions:
         Handles the loss condition by displaying a loss message and showing the correct word.
 """
 
-import random
+import asyncio
+import sqlite3
+import sys
 import flet as ft
 from backend.CurrentRoute import CurrentRoute
 from backend.Snack import add_snack
+from backend.GameState import GameState, GuessResult
+from backend.Difficulty import Difficulty
+from backend.Engine import draw_word, word_indexes, is_over
+from backend.ShuffleBag import ShuffleBag
+from backend.PoolRegistry import session_pool
+from backend.Persistence import remember, forget, recall
+from backend.Updates import get_scheduler, request_focus
+from backend.Gallows import draw_mistakes
+from backend.History import get_history
+from backend.Settings import LOADER
+
+def word_bag(page, pool, difficulty):
+    """
+    Returns the shuffle bag of the session for its pool and difficulty level. A new bag is
+    created (or restored from the client storage) when the pool or the level changes.
+
+    Args:
+        page (ft.Page): The page instance.
+        pool (WordPool): The word pool of the session.
+        difficulty (Difficulty): The selected difficulty level, or None.
+
+    Returns:
+        ShuffleBag: The bag stored in the session under "word_bag".
+    """
+    handle = page.session.get("words")
+    key = f"{handle.key}:{difficulty.name if difficulty is not None else 'ANY'}"
+    bag = page.session.get("word_bag")
+    if bag is None or bag.key != key:
+        # Z pamięci klienta przywracamy tylko ziarno i pozycję; kolejność wylicza się z nich od nowa
+        bag = ShuffleBag.restore(recall(page, "bag"), key, len(word_indexes(pool, difficulty)))
+        page.session.set("word_bag", bag)
+    return bag
 
 def random_word(page):
     """
-    Selects a random word from the word pool stored in the session.
+    Draws the next word of the selected difficulty level from the word pool stored in the session.
+    Words are drawn from a shuffle bag, so none repeats until all words of the level were drawn.
 
     Args:
-        page (ft.Page): The page instance containing the word pool in the session.
+        page (ft.Page): The page instance containing the word pool and the difficulty in the session.
 
     Returns:
         str: A random word from the session's word pool.
     """
-    # Wybieramy losowy indeks z dostępnych słówek
-    random_index = random.randint(0, len(page.session.get("words"))-1)
-    word = page.session.get("words")[random_index]
+    # Kolejne słówko z worka (bez powtórzeń), z kubełka wybranego poziomu trudności
+    pool = session_pool(page)
+    level = page.session.get("difficulty")
+    difficulty = Difficulty(level) if level is not None else None
+    bag = word_bag(page, pool, difficulty)
+    word = draw_word(pool, bag, difficulty)
+    remember(page, "bag", bag.snapshot())
     return word
 
-def guess_letter(page, router, letter_input, correct_word, guessed_letters, mistakes, guessed_letters_set, max_trials):
+def new_game(page):
+    """
+    Starts a new game with a random word and stores its state in the session.
+
+    Args:
+        page (ft.Page): The page instance containing the word pool and settings in the session.
+
+    Returns:
+        GameState: The state of the new game.
+    """
+    state = GameState(random_word(page=page), page.session.get("max_mistakes"), bool(page.session.get("fold_diacritics")))
+    page.session.set("game_state", state)
+    remember(page, "game", state.snapshot())
+    return state
+
+def guess_letter(page, router, letter_input, state, word_display, used_trials, gallows=None):
     """
     Processes the player's guess by validating the input, updating the game state, 
     and handling incorrect or repeated guesses.
@@ -54,85 +121,179 @@ def guess_letter(page, router, letter_input, correct_word, guessed_letters, mist
         page (ft.Page): The page instance to update the game state.
         router (Router): The router instance to reload the page.
         letter_input (ft.TextField): The input field where the player enters a letter.
-        correct_word (str): The correct word to guess.
-        guessed_letters (list): A list representing the guessed letters.
-        mistakes (int): The number of incorrect guesses made so far.
-        guessed_letters_set (set): A set containing all guessed letters.
-        max_trials (int): The maximum number of allowed mistakes.
+        state (GameState): The state of the current game.
+        word_display (ft.Text): The display showing the word being guessed.
+        used_trials (ft.Text): The display showing the number of mistakes.
+        gallows (cv.Canvas, optional): The hangman figure (see `backend.Gallows`). Default is None.
 
     Returns:
         None
     """
-    letter = letter_input.value.strip().lower()
+    was_over = is_over(state)
+    result = state.guess(letter_input.value)
     letter_input.value = ""  # Resetujemy pole tekstowe
 
     # Sprawdzenie, czy litera jest poprawna
-    if len(letter) != 1 or not letter.isalpha():
+    if result == GuessResult.INVALID:
         add_snack(content="Proszę podać jedną literę!", color=ft.Colors.RED, page=page)
-        cr = CurrentRoute(page=page)
-        router.reload_page(current_route = cr, page=page)
-        return
-
     # Sprawdzamy, czy litera została już zgadnięta
-    if letter in guessed_letters_set:
+    elif result == GuessResult.REPEATED:
         add_snack(content="Ta litera została już użyta!", color=ft.Colors.YELLOW, page=page)
-        cr = CurrentRoute(page=page)
-        router.reload_page(current_route = cr, page=page)
-        return
-
-    # Sprawdzanie, czy litera jest w słowie
-    if letter in correct_word:
-        for i, char in enumerate(correct_word):
-            if char == letter:
-                guessed_letters[i] = letter
     else:
-        mistakes += 1
-
-    # Dodajemy literę do zbioru zgadniętych liter
-    guessed_letters_set.add(letter)
-
-    # Zapisujemy stan gry w sesji
-    page.session.set("guessed_letters", guessed_letters)
-    page.session.set("mistakes", mistakes)
-    page.session.set("guessed_letters_set", guessed_letters_set)
+        # Stan gry trafia do pamięci klienta z opóźnieniem, bez czekania na zapis
+        remember(page, "game", state.snapshot())
+        if is_over(state) and not was_over:
+            # Zapisujemy grę raz, przy ruchu, który ją kończy (a nie przy każdym wyświetleniu wyniku)
+            record_game(page, state)
 
     # Aktualizacja widoku
-    update_display(page, router, guessed_letters, mistakes, max_trials)
+    update_display(page, router, state, letter_input, word_display, used_trials, gallows)
 
 
-def update_display(page, router, guessed_letters, mistakes, max_trials):
+def update_display(page, router, state, letter_input, word_display, used_trials, gallows=None):
     """
     Updates the display with the current game state, including the guessed letters 
     and the number of mistakes made.
 
+    During the game only the changed controls are patched in place. The whole page
+    is rebuilt only when the game ends, because the layout changes then.
+
     Args:
         page (ft.Page): The page instance to update the display.
         router (Router): The router instance to reload the page.
-        guessed_letters (list): The list of guessed letters.
-        mistakes (int): The number of incorrect guesses made.
-        max_trials (int): The maximum number of allowed mistakes.
+        state (GameState): The state of the current game.
+        letter_input (ft.TextField): The input field where the player enters a letter.
+        word_display (ft.Text): The display showing the word being guessed.
+        used_trials (ft.Text): The display showing the number of mistakes.
+        gallows (cv.Canvas, optional): The hangman figure; only the strokes of new mistakes
+                                       are added to it. Default is None.
 
     Returns:
         None
     """
-    # Zakładając, że to jest kontrolka dla prób
-    used_trials = page.controls[1]
-    # Zakładając, że to jest kontrolka wyświetlająca słowo
-    word_display = page.controls[0]
-    # Zakładając, że to jest kontrolka dla puli słówek
-    word_pool = page.controls[2]
-
-    used_trials.text = f"Pomyłki: {mistakes}/{max_trials}"
-    word_display.text = " ".join(guessed_letters)
-    word_pool.text = f"Pula słówek: {len(page.session.get('words'))}"
-    
-    cr = CurrentRoute(page=page)
-    router.reload_page(current_route=cr, page=page)
+    if is_over(state):
+        # Koniec gry zmienia układ widoku, więc przebudowujemy całą trasę
+        cr = CurrentRoute(page=page)
+        router.reload_page(current_route=cr, page=page)
+        return
+
+    word_display.value = " ".join(state.pattern())
+    used_trials.value = f"Pomyłki: {state.mistakes}/{state.max_mistakes}"
+    changed = [word_display, used_trials, letter_input]
+    if gallows is not None and draw_mistakes(gallows, state):
+        changed.append(gallows)  # Do klienta trafiają tylko nowe kreski rysunku
+    get_scheduler(page).request(*changed)  # Aktualizacja tylko zmienionych kontrolek
+    request_focus(page, letter_input)  # Fokus wraca do pola w tej samej aktualizacji
+
+
+def record_game(page, state):
+    """
+    Appends a finished game to the history of games (see `backend.History`). A failure
+    to write the history is shown to the player but does not interrupt the game.
+
+    Args:
+        page (ft.Page): The page instance to display an error message.
+        state (GameState): The state of the finished game.
+
+    Returns:
+        None
+    """
+    try:
+        get_history().record(state.word, state.is_won(), state.mistakes, state.max_mistakes, len(state.guessed))
+    except (sqlite3.Error, OSError) as e:
+        add_snack(content=f"Nie udało się zapisać wyniku gry: {e}", color=ft.Colors.RED, page=page)
+
+
+def show_hint(page, state, hint_btn=None):
+    """
+    Shows the most informative next letter, based on the pool words matching the game so far.
+
+    The first hint for a pool needs its hint index (see `backend.Hint`), which takes a while
+    for large pools. It is built in a worker thread; meanwhile the hint button is disabled,
+    and the hint is shown once the index is ready.
+
+    Args:
+        page (ft.Page): The page instance containing the word pool in the session.
+        state (GameState): The state of the current game.
+        hint_btn (ft.TextButton, optional): The hint button, disabled while the index is prepared.
+                                            Default is None.
+
+    Returns:
+        None
+    """
+    pool = session_pool(page)
+    if not _hint_ready(pool):
+        if page.session.get("hint_indexing") is not pool:
+            page.session.set("hint_indexing", pool)
+            page.run_task(_prepare_hint, page, state, pool, hint_btn)
+        if hint_btn is not None:
+            set_hint_preparing(hint_btn, True)
+            get_scheduler(page).request(hint_btn)
+        return
+
+    from backend.Hint import suggest_letter
+    letter = suggest_letter(pool, state)
+    if letter is None:
+        add_snack(content="Brak podpowiedzi dla tego słówka", color=ft.Colors.YELLOW, page=page)
+    else:
+        add_snack(content=f"Spróbuj litery: {letter}", page=page)
+
+
+def set_hint_preparing(hint_btn, preparing):
+    """
+    Shows on the hint button whether the hint index is being prepared.
+
+    Args:
+        hint_btn (ft.TextButton): The hint button.
+        preparing (bool): Whether the index is being prepared (the button is then disabled).
+
+    Returns:
+        None
+    """
+    hint_btn.disabled = preparing
+    hint_btn.text = "Przygotowywanie podpowiedzi..." if preparing else "Podpowiedź"
+
+
+def _hint_ready(pool):
+    # Bez zaimportowanego modułu podpowiedzi nie ma też indeksu (NumPy ładujemy dopiero przy pierwszej podpowiedzi)
+    hint = sys.modules.get("backend.Hint")
+    return hint is not None and hint.is_indexed(pool)
+
+
+def _build_hint_index(pool):
+    # Wątek roboczy: import NumPy i kodowanie całej puli
+    from backend.Hint import get_hint_index
+    get_hint_index(pool)
+
+
+async def _prepare_hint(page, state, pool, hint_btn):
+    # Indeks budujemy poza pętlą zdarzeń, a po zbudowaniu pokazujemy podpowiedź, jeśli gra trwa
+    loop = asyncio.get_running_loop()
+    try:
+        await loop.run_in_executor(LOADER, _build_hint_index, pool)
+    except Exception:
+        add_snack(content="Nie udało się przygotować podpowiedzi", color=ft.Colors.RED, page=page)
+        return
+    finally:
+        if page.session.get("hint_indexing") is pool:
+            page.session.remove("hint_indexing")
+
+    with get_scheduler(page).batch():
+        if hint_btn is not None and hint_btn.page is not None:
+            set_hint_preparing(hint_btn, False)
+            get_scheduler(page).request(hint_btn)
+        elif page.route == "/play":
+            # Widok gry zbudowano w międzyczasie od nowa, z nieaktywnym przyciskiem
+            router = page.session.get("router")
+            if router is not None:
+                router.reload_page(current_route=CurrentRoute(page=page), page=page)
+        if page.session.get("game_state") is state and not is_over(state) and session_pool(page) is pool:
+            show_hint(page, state)
 
 
 def restart_game(page, router):
     """
-    Resets the game session by removing the current game state data and reloads the page.
+    Resets the game session by removing the current game state and reloads the page.
 
     Args:
         page (ft.Page): The page instance to reset the game session.
@@ -141,10 +302,8 @@ def restart_game(page, router):
     Returns:
         None
     """
-    page.session.remove("correct_word")
-    page.session.remove("guessed_letters")
-    page.session.remove("mistakes")
-    page.session.remove("guessed_letters_set")
+    page.session.remove("game_state")
+    forget(page, "game")
     cr = CurrentRoute(page=page)  # Aktualizacja widoku
     router.reload_page(current_route=cr, page=page)
 
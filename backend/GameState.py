@@ -0,0 +1,170 @@
+"""
+GameState.py
+
+This module defines the GameState class, which holds the whole state of a single game
+of Hangman, and the GuessResult enumeration describing the outcome of a guess.
+
+When a word is selected, GameState precomputes a letter -> positions bitmask map and
+a bitmask of the positions that are still hidden, so a guess is a dictionary lookup
+plus a few bit operations, and the game is won when the mask reaches zero.
+
+In the "fold diacritics" mode the map is keyed by the letters without diacritics
+(see `fold_letter`), so guessing "a" reveals both "a" and "ą" with the same single lookup.
+
+Classes:
+    GuessResult: Enum describing the outcome of a single guess.
+    GameState: The state of a single game, stored in the session under "game_state".
+"""
+
+from enum import Enum
+from backend.Normalize import normalize_text, fold_letter
+
+class GuessResult(Enum):
+    """
+    Enumeration describing the outcome of a single guess.
+
+    Members:
+        INVALID: The input was not a single letter.
+        REPEATED: The letter has already been guessed.
+        HIT: The letter is in the word.
+        MISS: The letter is not in the word.
+    """
+    INVALID = 0
+    REPEATED = 1
+    HIT = 2
+    MISS = 3
+
+class GameState:
+    """
+    The state of a single game of Hangman.
+
+    Attributes:
+        word (str): The word to guess.
+        max_mistakes (int): The maximum number of allowed mistakes.
+        mistakes (int): The number of incorrect guesses made so far.
+        guessed (set): All letters guessed so far (without diacritics in the fold mode).
+        positions (dict): Maps each letter of the word (without diacritics in the fold mode)
+                          to a bitmask of its positions.
+        fold (bool): Whether letters with and without diacritics are treated as the same letter.
+        mask (int): A bitmask of the positions that are still hidden.
+
+    Methods:
+        guess(letter): Processes a guess and returns its GuessResult.
+        pattern(): Returns the word with hidden letters replaced by "_".
+        is_won(): Checks whether the whole word has been revealed.
+        is_lost(): Checks whether the mistakes limit has been reached.
+        snapshot(): Returns a compact, JSON-serializable copy of the state.
+        restore(snapshot): Recreates a state from a snapshot.
+    """
+
+    __slots__ = ("word", "max_mistakes", "mistakes", "guessed", "positions", "mask", "fold")
+
+    def __init__(self, word, max_mistakes, fold=False):
+        """
+        Initializes the GameState instance and precomputes the letter index of the word.
+
+        Args:
+            word (str): The word to guess.
+            max_mistakes (int): The maximum number of allowed mistakes.
+            fold (bool, optional): Whether guessing a letter also reveals its variants with
+                                   diacritics (e.g. "a" reveals "ą"). Default is False.
+        """
+        self.word = word
+        self.max_mistakes = max_mistakes
+        self.mistakes = 0
+        self.guessed = set()
+        self.positions = {}
+        self.mask = 0
+        self.fold = fold
+
+        for i, char in enumerate(word):
+            if char.isalpha():
+                key = fold_letter(char) if fold else char
+                self.positions[key] = self.positions.get(key, 0) | (1 << i)
+                self.mask |= 1 << i
+            # Znaki inne niż litery (spacje, myślniki) są widoczne od początku
+
+    def guess(self, letter):
+        """
+        Processes the player's guess and updates the state.
+
+        Args:
+            letter (str): The guessed letter, as entered by the player (also decomposed,
+                          e.g. "a" followed by a combining ogonek).
+
+        Returns:
+            GuessResult: The outcome of the guess.
+        """
+        # Ta sama normalizacja co słówek w puli, więc litera złożona z kilku znaków staje się jednym
+        letter = normalize_text(letter.strip())
+
+        if len(letter) != 1 or not letter.isalpha():
+            return GuessResult.INVALID
+        if self.fold:
+            letter = fold_letter(letter)
+        if letter in self.guessed:
+            return GuessResult.REPEATED
+
+        self.guessed.add(letter)
+        positions = self.positions.get(letter, 0)
+        if positions:
+            self.mask &= ~positions  # Odsłaniamy wszystkie wystąpienia litery naraz
+            return GuessResult.HIT
+        self.mistakes += 1
+        return GuessResult.MISS
+
+    def pattern(self):
+        """
+        Returns the word with the hidden letters replaced by "_".
+
+        Returns:
+            list: One character (or "_") per letter of the word.
+        """
+        return ['_' if self.mask >> i & 1 else char for i, char in enumerate(self.word)]
+
+    def is_won(self):
+        """
+        Checks whether the whole word has been revealed.
+
+        Returns:
+            bool: True if no letters are hidden.
+        """
+        return self.mask == 0
+
+    def is_lost(self):
+        """
+        Checks whether the mistakes limit has been reached.
+
+        Returns:
+            bool: True if the player made at least `max_mistakes` mistakes.
+        """
+        return self.mistakes >= self.max_mistakes
+
+    def snapshot(self):
+        """
+        Returns a compact, JSON-serializable copy of the state. Only the word, the limit,
+        the guessed letters and the fold mode are kept; everything else is recomputed on restore.
+
+        Returns:
+            dict: The snapshot of the state.
+        """
+        snapshot = {"w": self.word, "x": self.max_mistakes, "g": "".join(sorted(self.guessed))}
+        if self.fold:
+            snapshot["f"] = 1
+        return snapshot
+
+    @classmethod
+    def restore(cls, snapshot):
+        """
+        Recreates a state from a snapshot by replaying the guessed letters.
+
+        Args:
+            snapshot (dict): A snapshot returned by `snapshot`.
+
+        Returns:
+            GameState: The restored state.
+        """
+        state = cls(snapshot["w"], snapshot["x"], bool(snapshot.get("f")))
+        for letter in snapshot["g"]:
+            state.guess(letter)
+        return state
@@ -0,0 +1,186 @@
+"""
+Hint.py
+
+This module suggests the most informative next letter for the current game, based on
+the words of the pool that still match what the player has revealed so far.
+
+The pool is encoded once into fixed-width NumPy matrices of code points (mapped to the
+pool's alphabet), one per word length. For a hint, the matching candidates are filtered
+with array operations (revealed letters must match, guessed letters must not appear in
+hidden positions) and letter frequencies over the hidden positions are counted with `bincount`.
+In the "fold diacritics" mode letters are counted together with their variants with diacritics.
+
+Class:
+    HintIndex:
+        - Letter matrices of a word pool, bucketed by word length.
+
+Functions:
+    get_hint_index(pool):
+        Returns the HintIndex of a pool, building it on first use.
+
+    is_indexed(pool):
+        Checks whether the HintIndex of a pool has already been built.
+
+    suggest_letter(pool, state):
+        Suggests the next letter to guess in a game.
+"""
+
+import weakref
+from collections import defaultdict
+import numpy as np
+from backend.Normalize import fold_letter
+
+class HintIndex:
+    """
+    Letter matrices of a word pool, bucketed by word length.
+
+    Attributes:
+        alphabet (np.ndarray): Sorted code points of all characters occurring in the pool.
+        is_letter (np.ndarray): Whether each character of `alphabet` is a letter.
+        folded (np.ndarray): For each character of `alphabet`, the index of the character
+                             without diacritics (or its own index if it is not in `alphabet`).
+        buckets (dict): Maps a word length to a (words, length) matrix of indexes into `alphabet`.
+
+    Methods:
+        suggest(pattern, guessed, fold=False): Returns the most informative letter not guessed yet.
+    """
+
+    def __init__(self, pool):
+        """
+        Initializes the HintIndex instance by encoding the whole pool.
+
+        Args:
+            pool (WordPool): The word pool.
+        """
+        # Grupujemy słówka według długości, a każdą grupę kodujemy jednym wywołaniem
+        words_by_length = defaultdict(list)
+        for word in pool:
+            words_by_length[len(word)].append(word)
+
+        code_points = {
+            length: np.frombuffer("".join(words).encode("utf-32-le"), dtype=np.uint32).reshape(len(words), length)
+            for length, words in words_by_length.items()
+        }
+        unique = [np.unique(matrix) for matrix in code_points.values()]
+        self.alphabet = np.unique(np.concatenate(unique)) if unique else np.empty(0, dtype=np.uint32)
+        self.is_letter = np.array([chr(code).isalpha() for code in self.alphabet], dtype=bool)
+        self._fold_keys = [fold_letter(chr(code)) if letter else chr(code) for code, letter in zip(self.alphabet, self.is_letter)]
+        self.folded = np.array([
+            index if (folded := self._index_of(key)) is None else folded
+            for index, key in enumerate(self._fold_keys)
+        ], dtype=np.intp)
+
+        # Zamiast punktów kodowych trzymamy numery znaków w alfabecie puli (zwykle 1 bajt)
+        dtype = np.uint8 if len(self.alphabet) <= 256 else np.uint16
+        self.buckets = {
+            length: np.searchsorted(self.alphabet, matrix).astype(dtype)
+            for length, matrix in code_points.items()
+        }
+
+    def _index_of(self, char):
+        # Numer znaku w alfabecie puli albo None, jeśli w puli go nie ma
+        position = np.searchsorted(self.alphabet, ord(char))
+        if position < len(self.alphabet) and self.alphabet[position] == ord(char):
+            return position
+        return None
+
+    def suggest(self, pattern, guessed, fold=False):
+        """
+        Returns the letter occurring in the most candidate words among the ones not guessed yet.
+
+        Args:
+            pattern (list): The word with the hidden letters replaced by "_".
+            guessed (set): All letters guessed so far.
+            fold (bool, optional): Whether `guessed` holds letters without diacritics, each standing
+                                   for all its variants (see `GameState.fold`). Default is False.
+
+        Returns:
+            str: The suggested letter, or None if no candidate word matches.
+        """
+        letters = self.buckets.get(len(pattern))
+        if letters is None:
+            return None
+
+        size = len(self.alphabet)
+        excluded = ~self.is_letter  # Tablica: czy znak jest już sprawdzony (albo nie jest literą)
+        if fold:
+            # Sprawdzone "a" wyklucza też "ą"
+            excluded |= np.array([key in guessed for key in self._fold_keys], dtype=bool)
+        else:
+            for letter in guessed:
+                index = self._index_of(letter)
+                if index is not None:
+                    excluded[index] = True
+
+        # Odsłonięte pozycje muszą się zgadzać, a na ukrytych nie może być żadnej sprawdzonej litery
+        mask = np.ones(len(letters), dtype=bool)
+        hidden = []
+        for position, char in enumerate(pattern):
+            if char == '_':
+                hidden.append(position)
+                continue
+            index = self._index_of(char)
+            if index is None:
+                return None
+            mask &= letters[:, position] == index
+        candidates = letters[mask][:, hidden]
+        candidates = candidates[~excluded[candidates].any(axis=1) & self.is_letter[candidates].all(axis=1)]
+        if candidates.size == 0:
+            return None
+        if fold:
+            candidates = self.folded[candidates]  # Warianty z ogonkami liczymy razem z literą bazową
+
+        # Liczymy, w ilu słówkach występuje każda litera (każde słówko liczy się raz): po posortowaniu
+        # wierszy bierzemy tylko pierwsze wystąpienie litery, bez macierzy słówka x alfabet
+        ordered = np.sort(candidates, axis=1)
+        first = np.ones(ordered.shape, dtype=bool)
+        first[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+        counts = np.bincount(ordered[first], minlength=size)
+        counts[excluded] = 0
+        if counts.max() == 0:
+            return None
+        return self._fold_keys[counts.argmax()] if fold else chr(self.alphabet[counts.argmax()])
+
+# Indeksy podpowiedzi budowane raz na pulę i zwalniane razem z nią
+_indexes = weakref.WeakKeyDictionary()
+
+def get_hint_index(pool):
+    """
+    Returns the HintIndex of a pool, building it on first use.
+
+    Args:
+        pool (WordPool): The word pool.
+
+    Returns:
+        HintIndex: The index of the pool.
+    """
+    index = _indexes.get(pool)
+    if index is None:
+        index = HintIndex(pool)
+        _indexes[pool] = index
+    return index
+
+def is_indexed(pool):
+    """
+    Checks whether the HintIndex of a pool has already been built.
+
+    Args:
+        pool (WordPool): The word pool.
+
+    Returns:
+        bool: True if `get_hint_index` returns without building the index.
+    """
+    return pool in _indexes
+
+def suggest_letter(pool, state):
+    """
+    Suggests the next letter to guess in a game.
+
+    Args:
+        pool (WordPool): The word pool the word was selected from.
+        state (GameState): The state of the game.
+
+    Returns:
+        str: The suggested letter, or None if there is no suggestion.
+    """
+    return get_hint_index(pool).suggest(state.pattern(), state.guessed, state.fold)
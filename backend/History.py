@@ -0,0 +1,234 @@
+"""
+History.py
+
+This module keeps the history of finished games in a local SQLite database in WAL mode,
+shared by all sessions of the process.
+
+Every game is appended to the `games` table. The running statistics are maintained
+incrementally in the same transaction: a single-row `totals` table (games, wins, mistakes)
+and a `words` table with the same counters per word. Reading the statistics is therefore
+a primary-key lookup, however many games were recorded, and the history is read page by
+page with keyset pagination (`id < ?`), never with OFFSET, so every page costs the same.
+
+Classes:
+    History: The store of finished games and their running statistics.
+
+Functions:
+    get_history():
+        Returns the History shared by all sessions, opening it on first use.
+
+Attributes:
+    ENV_VAR (str): The environment variable with the path of the database.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+ENV_VAR = "WISIELEC_HISTORY"  # Ścieżka pliku bazy (domyślnie DEFAULT_PATH)
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".wisielec", "history.sqlite3")
+PAGE_SIZE = 50  # Liczba gier na jednej stronie historii
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    played_at INTEGER NOT NULL,
+    word TEXT NOT NULL,
+    won INTEGER NOT NULL,
+    mistakes INTEGER NOT NULL,
+    max_mistakes INTEGER NOT NULL,
+    guesses INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    mistakes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals VALUES (0, 0, 0, 0);
+CREATE TABLE IF NOT EXISTS words (
+    word TEXT PRIMARY KEY,
+    games INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    mistakes INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS words_by_games ON words (games DESC);
+"""
+
+def _summary(games, wins, mistakes):
+    # Statystyki wyliczane z liczników, bez przeglądania gier
+    return {
+        "games": games,
+        "wins": wins,
+        "losses": games - wins,
+        "win_rate": wins / games if games else None,
+        "average_mistakes": mistakes / games if games else None,
+    }
+
+class History:
+    """
+    The store of finished games and their running statistics.
+
+    Attributes:
+        path (str): The path of the database file.
+
+    Methods:
+        record(word, won, mistakes, max_mistakes, guesses): Appends a finished game.
+        summary(): Returns the statistics of all games.
+        word_summary(word): Returns the statistics of the games with a word.
+        top_words(limit): Returns the statistics of the most played words.
+        games(before=None, limit=PAGE_SIZE): Returns a page of the history, newest first.
+        close(): Closes the database.
+    """
+
+    def __init__(self, path):
+        """
+        Initializes the History instance, creating the database if needed.
+
+        Args:
+            path (str): The path of the database file (":memory:" for a temporary one).
+        """
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Jedno połączenie dla wszystkich sesji; dostęp z różnych wątków chroni blokada
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")  # W trybie WAL bez fsync przy każdym zatwierdzeniu
+            self._connection.executescript(SCHEMA)
+
+    def record(self, word, won, mistakes, max_mistakes, guesses):
+        """
+        Appends a finished game and updates the running statistics in the same transaction.
+
+        Args:
+            word (str): The word of the game.
+            won (bool): Whether the game was won.
+            mistakes (int): The number of mistakes made.
+            max_mistakes (int): The mistakes limit of the game.
+            guesses (int): The number of guessed letters.
+
+        Returns:
+            int: The id of the recorded game.
+        """
+        won = int(bool(won))
+        with self._lock:
+            connection = self._connection
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                cursor = connection.execute(
+                    "INSERT INTO games (played_at, word, won, mistakes, max_mistakes, guesses) VALUES (?, ?, ?, ?, ?, ?)",
+                    (int(time.time()), word, won, mistakes, max_mistakes, guesses),
+                )
+                connection.execute(
+                    "UPDATE totals SET games = games + 1, wins = wins + ?, mistakes = mistakes + ? WHERE id = 0",
+                    (won, mistakes),
+                )
+                connection.execute(
+                    "INSERT INTO words VALUES (?, 1, ?, ?) ON CONFLICT (word) DO UPDATE SET "
+                    "games = games + 1, wins = wins + excluded.wins, mistakes = mistakes + excluded.mistakes",
+                    (word, won, mistakes),
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            return cursor.lastrowid
+
+    def _query(self, sql, parameters=()):
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def summary(self):
+        """
+        Returns the statistics of all games, read from the running totals.
+
+        Returns:
+            dict: The number of games, wins and losses, the win rate and the average number
+                  of mistakes (None if no game was recorded).
+        """
+        return _summary(*self._query("SELECT games, wins, mistakes FROM totals WHERE id = 0")[0])
+
+    def word_summary(self, word):
+        """
+        Returns the statistics of the games with a word.
+
+        Args:
+            word (str): The word.
+
+        Returns:
+            dict: The statistics (see `summary`), or None if the word was never played.
+        """
+        rows = self._query("SELECT games, wins, mistakes FROM words WHERE word = ?", (word,))
+        return _summary(*rows[0]) if rows else None
+
+    def top_words(self, limit=10):
+        """
+        Returns the statistics of the most played words.
+
+        Args:
+            limit (int, optional): The number of words. Default is 10.
+
+        Returns:
+            list: Pairs (word, statistics), the most played first.
+        """
+        rows = self._query("SELECT word, games, wins, mistakes FROM words ORDER BY games DESC LIMIT ?", (limit,))
+        return [(word, _summary(games, wins, mistakes)) for word, games, wins, mistakes in rows]
+
+    def games(self, before=None, limit=PAGE_SIZE):
+        """
+        Returns a page of the history, newest first. The next page is read by passing
+        the id of the last game of the previous one as `before`.
+
+        Args:
+            before (int, optional): Only games with a smaller id are returned. Default is None (newest).
+            limit (int, optional): The maximum number of games. Default is PAGE_SIZE.
+
+        Returns:
+            list: Dictionaries with the id, time (Unix seconds), word, result, mistakes,
+                  limit and number of guessed letters of each game.
+        """
+        columns = "id, played_at, word, won, mistakes, max_mistakes, guesses"
+        if before is None:
+            rows = self._query(f"SELECT {columns} FROM games ORDER BY id DESC LIMIT ?", (limit,))
+        else:
+            rows = self._query(f"SELECT {columns} FROM games WHERE id < ? ORDER BY id DESC LIMIT ?", (before, limit))
+        names = ("id", "played_at", "word", "won", "mistakes", "max_mistakes", "guesses")
+        return [dict(zip(names, row)) for row in rows]
+
+    def close(self):
+        """
+        Closes the database.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._connection.close()
+
+    def __repr__(self):
+        return f"History({self.path!r})"
+
+_history = None
+_history_lock = threading.Lock()
+
+def get_history():
+    """
+    Returns the History shared by all sessions, opening it on first use. The database
+    is stored at the path given by the WISIELEC_HISTORY environment variable, or at DEFAULT_PATH.
+
+    Raises:
+        sqlite3.Error: If the database cannot be opened.
+        OSError: If the directory of the database cannot be created.
+
+    Returns:
+        History: The history of the process.
+    """
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = History(os.environ.get(ENV_VAR) or DEFAULT_PATH)
+        return _history
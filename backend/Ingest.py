@@ -0,0 +1,143 @@
+"""
+Ingest.py
+
+This module loads several word lists at once (e.g. all files picked together, or all word
+lists in a directory) into a single deduplicated pool. Text files, including gzip, bzip2
+and xz compressed ones, are parsed concurrently in a process pool; compiled pool files are
+memory-mapped in place. The results are merged in the order of the paths, and a report of
+every file (words, words new to the pool, errors) is kept in the pool's `sources`.
+
+Functions:
+    list_word_files(directory):
+        Returns the word lists found in a directory and its subdirectories.
+
+    load_word_files(paths, on_progress=None, cancel_event=None, workers=None):
+        Loads several word lists into one deduplicated pool.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from backend.WordPool import WordPool
+from backend.PoolFile import LoadingCancelled, is_pool_file, load_pool, load_words
+
+WORD_FILE_EXTENSIONS = (".txt", ".csv", ".gz", ".bz2", ".xz", ".pool")  # Pliki brane z wybranego folderu
+
+def list_word_files(directory):
+    """
+    Returns the word lists found in a directory and its subdirectories, i.e. the files
+    with one of the WORD_FILE_EXTENSIONS.
+
+    Args:
+        directory (str): The directory to search.
+
+    Returns:
+        list: The sorted paths of the word lists.
+    """
+    paths = []
+    for root, _, names in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in names if name.lower().endswith(WORD_FILE_EXTENSIONS))
+    return sorted(paths)
+
+def _parse(path):
+    # Proces roboczy: wczytuje jeden plik tekstowy i zwraca zamkniętą pulę (przesyłaną jako bajty)
+    return load_words(path)
+
+def load_word_files(paths, on_progress=None, cancel_event=None, workers=None):
+    """
+    Loads several word lists into one deduplicated pool. Safe to run in a worker thread.
+
+    Text files are parsed concurrently in a process pool (sequentially if there is only
+    one CPU or one text file) and merged in the order of `paths`. A file that cannot be
+    read is skipped and its error is reported.
+
+    Args:
+        paths (list): The paths of the word lists and compiled pool files.
+        on_progress (callable, optional): Called with the total number of bytes of the loaded
+                                          files after every loaded file. Default is None.
+        cancel_event (threading.Event, optional): When set, loading stops with LoadingCancelled.
+                                                  Default is None.
+        workers (int, optional): The number of worker processes. Default is the number of CPUs.
+
+    Raises:
+        LoadingCancelled: If `cancel_event` was set during loading.
+        Exception: If none of the files could be read.
+
+    Returns:
+        WordPool: The merged pool; its `sources` lists a report of every file.
+    """
+    paths = list(dict.fromkeys(paths))  # Ten sam plik wybrany dwa razy wczytujemy raz
+    results = {}  # ścieżka -> wczytana pula albo wyjątek
+    bytes_done = 0
+
+    def finished(path, result):
+        nonlocal bytes_done
+        results[path] = result
+        bytes_done += _size(path)
+        if on_progress is not None:
+            on_progress(bytes_done)
+
+    def check_cancelled():
+        if cancel_event is not None and cancel_event.is_set():
+            raise LoadingCancelled()
+
+    # Skompilowane pule tylko mapujemy, a pliki tekstowe parsujemy równolegle
+    text_paths = [path for path in paths if not is_pool_file(path)]
+    for path in paths:
+        if path not in text_paths:
+            finished(path, _load(load_pool, path))
+
+    workers = min(workers or os.cpu_count() or 1, len(text_paths))
+    if workers < 2:
+        for path in text_paths:
+            check_cancelled()
+            finished(path, _load(load_words, path, None, cancel_event))
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = {executor.submit(_parse, path): path for path in text_paths}
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                check_cancelled()
+                for future in done:
+                    error = future.exception()
+                    finished(futures[future], error if error is not None else future.result())
+        finally:
+            # Po anulowaniu nie czekamy na pliki, które są jeszcze parsowane
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    return _merge(paths, results)
+
+def _size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0  # Plik, którego nie ma, trafi do raportu jako błąd
+
+def _load(loader, path, *args):
+    # Błąd jednego pliku nie przerywa wczytywania pozostałych
+    try:
+        return loader(path, *args)
+    except LoadingCancelled:
+        raise
+    except Exception as e:
+        return e
+
+def _merge(paths, results):
+    # Łączymy pule w kolejności plików; słówka powtórzone w kilku plikach trafiają do puli raz
+    pool = WordPool()
+    report = []
+    for path in paths:
+        result = results[path]
+        if isinstance(result, Exception):
+            report.append({"path": path, "words": 0, "added": 0, "duplicates": 0, "error": str(result) or type(result).__name__})
+            continue
+        added = pool.extend(result)
+        report.append({"path": path, "words": len(result), "added": added, "duplicates": result.duplicates, "error": None})
+        if hasattr(result, "close"):
+            result.close()  # Słówka zostały skopiowane, mapowanie nie jest już potrzebne
+
+    if not any(entry["error"] is None for entry in report):
+        raise Exception("Nie udało się wczytać żadnego pliku")
+    pool.sources = report
+    return pool.freeze()
@@ -0,0 +1,364 @@
+"""
+Metrics.py
+
+This module is an opt-in instrumentation layer for the hot paths of the app. It is enabled
+by setting the WISIELEC_METRICS environment variable (e.g. WISIELEC_METRICS=1); otherwise
+every hook returns right after checking a module constant, so production code pays nothing.
+
+When enabled, the router records the render time of every route and the number of controls
+built by every view, the update scheduler records the `page.update()` calls with an estimate
+of their payload (the number of controls sent) and the overlay length, and pool loading
+records its duration. Values are kept as counters, gauges and histograms, which can be
+polled from the `/debug/metrics` route or appended to a JSON-lines file: set
+WISIELEC_METRICS_FILE to a path and a snapshot is written every WISIELEC_METRICS_INTERVAL
+seconds (60 by default) and when the process exits.
+
+Classes:
+    Histogram:
+        - Count, sum, extremes and bucketed distribution of observed values.
+    Metrics:
+        - Thread-safe collection of counters, gauges and histograms.
+
+Functions:
+    enabled():
+        Checks whether instrumentation is enabled.
+
+    increment(name, value=1):
+        Increments a counter.
+
+    gauge(name, value):
+        Sets a gauge to its current value.
+
+    observe(name, value):
+        Records a value in a histogram.
+
+    timed(name):
+        Context manager recording the duration of its body (ms) in a histogram.
+
+    count_controls(*controls):
+        Counts the controls in the given control trees.
+
+    snapshot():
+        Returns all recorded metrics.
+
+    dump(path=None):
+        Appends a snapshot of all metrics to a JSON-lines file.
+
+Attributes:
+    METRICS (Metrics): The metrics of the process, or None when instrumentation is disabled.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+ENV_VAR = "WISIELEC_METRICS"  # Włącza pomiary (dowolna niepusta wartość poza "0")
+FILE_ENV_VAR = "WISIELEC_METRICS_FILE"  # Plik JSON-lines, do którego dopisujemy pomiary
+INTERVAL_ENV_VAR = "WISIELEC_METRICS_INTERVAL"  # Co ile sekund zapisujemy pomiary do pliku
+DEFAULT_INTERVAL = 60.0
+BUCKETS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000)  # Górne granice przedziałów histogramu
+
+class Histogram:
+    """
+    Count, sum, extremes and bucketed distribution of observed values.
+
+    Attributes:
+        count (int): The number of observed values.
+        total (float): The sum of observed values.
+        min (float): The smallest observed value.
+        max (float): The largest observed value.
+        buckets (list): The numbers of values falling into each of BUCKETS (and above the last).
+
+    Methods:
+        observe(value): Records a value.
+        to_dict(): Returns the histogram as a JSON-serializable dictionary.
+    """
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        """
+        Initializes an empty Histogram instance.
+        """
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, value):
+        """
+        Records a value.
+
+        Args:
+            value (float): The observed value.
+
+        Returns:
+            None
+        """
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def to_dict(self):
+        """
+        Returns the histogram as a JSON-serializable dictionary.
+
+        Returns:
+            dict: The count, sum, mean, extremes and non-empty buckets of the histogram.
+        """
+        labels = [f"<={bound}" for bound in BUCKETS] + [f">{BUCKETS[-1]}"]
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min,
+            "max": self.max,
+            "buckets": {label: n for label, n in zip(labels, self.buckets) if n},
+        }
+
+
+class Metrics:
+    """
+    Thread-safe collection of counters, gauges and histograms.
+
+    Methods:
+        increment(name, value=1): Increments a counter.
+        gauge(name, value): Sets a gauge.
+        observe(name, value): Records a value in a histogram.
+        snapshot(): Returns all metrics as a JSON-serializable dictionary.
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty Metrics instance.
+        """
+        self.started = time.time()
+        self._counters = {}
+        self._gauges = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name, value=1):
+        """
+        Increments a counter.
+
+        Args:
+            name (str): The name of the counter.
+            value (int, optional): The increment. Default is 1.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def gauge(self, name, value):
+        """
+        Sets a gauge to its current value.
+
+        Args:
+            name (str): The name of the gauge.
+            value (float): The current value.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name, value):
+        """
+        Records a value in a histogram.
+
+        Args:
+            name (str): The name of the histogram.
+            value (float): The observed value.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(value)
+
+    def snapshot(self):
+        """
+        Returns all metrics as a JSON-serializable dictionary.
+
+        Returns:
+            dict: The time of the snapshot, the uptime and all counters, gauges and histograms.
+        """
+        with self._lock:
+            return {
+                "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "pid": os.getpid(),
+                "uptime": time.time() - self.started,
+                "counters": dict(self._counters),
+                "gauges": dict(self._gauges),
+                "histograms": {name: histogram.to_dict() for name, histogram in self._histograms.items()},
+            }
+
+# Pomiary procesu; None, gdy instrumentacja jest wyłączona
+METRICS = Metrics() if os.environ.get(ENV_VAR, "0") not in ("", "0") else None
+_NULL_TIMER = nullcontext()
+
+def enabled():
+    """
+    Checks whether instrumentation is enabled.
+
+    Returns:
+        bool: True if the WISIELEC_METRICS environment variable enables it.
+    """
+    return METRICS is not None
+
+def increment(name, value=1):
+    """
+    Increments a counter, if instrumentation is enabled.
+
+    Args:
+        name (str): The name of the counter.
+        value (int, optional): The increment. Default is 1.
+
+    Returns:
+        None
+    """
+    if METRICS is not None:
+        METRICS.increment(name, value)
+
+def gauge(name, value):
+    """
+    Sets a gauge to its current value, if instrumentation is enabled.
+
+    Args:
+        name (str): The name of the gauge.
+        value (float): The current value.
+
+    Returns:
+        None
+    """
+    if METRICS is not None:
+        METRICS.gauge(name, value)
+
+def observe(name, value):
+    """
+    Records a value in a histogram, if instrumentation is enabled.
+
+    Args:
+        name (str): The name of the histogram.
+        value (float): The observed value.
+
+    Returns:
+        None
+    """
+    if METRICS is not None:
+        METRICS.observe(name, value)
+
+@contextmanager
+def _timer(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        METRICS.observe(name, (time.perf_counter() - started) * 1000)
+
+def timed(name):
+    """
+    Returns a context manager recording the duration of its body, in milliseconds,
+    in a histogram. When instrumentation is disabled it does nothing.
+
+    Args:
+        name (str): The name of the histogram.
+
+    Returns:
+        contextmanager: The timer.
+    """
+    return _timer(name) if METRICS is not None else _NULL_TIMER
+
+def count_controls(*controls):
+    """
+    Counts the controls in the given control trees (the controls themselves and
+    everything nested in their `controls`, `content` and `actions`).
+
+    Args:
+        *controls (ft.Control): The roots of the trees.
+
+    Returns:
+        int: The number of controls.
+    """
+    count = 0
+    pending = list(controls)
+    while pending:
+        control = pending.pop()
+        if control is None or isinstance(control, str):
+            continue
+        count += 1
+        pending.extend(getattr(control, "controls", None) or [])
+        pending.extend(getattr(control, "actions", None) or [])
+        pending.append(getattr(control, "content", None))
+    return count
+
+def snapshot():
+    """
+    Returns all recorded metrics.
+
+    Returns:
+        dict: The snapshot of the metrics, or None when instrumentation is disabled.
+    """
+    return METRICS.snapshot() if METRICS is not None else None
+
+def dump(path=None):
+    """
+    Appends a snapshot of all metrics, as one JSON line, to a file.
+
+    Args:
+        path (str, optional): The file to append to. Default is the WISIELEC_METRICS_FILE
+                              environment variable.
+
+    Raises:
+        OSError: If the file cannot be written.
+
+    Returns:
+        bool: True if the snapshot was written.
+    """
+    path = path or os.environ.get(FILE_ENV_VAR)
+    if METRICS is None or not path:
+        return False
+    line = json.dumps(METRICS.snapshot(), ensure_ascii=False)
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(line + "\n")
+    return True
+
+def _dump_quietly():
+    # Zapis w tle i przy wyjściu: błąd zapisu nie może zatrzymać wątku ani zakończenia programu
+    try:
+        dump()
+    except OSError:
+        pass
+
+def _write_periodically(interval):
+    # Wątek w tle dopisujący pomiary do pliku co `interval` sekund
+    while True:
+        time.sleep(interval)
+        _dump_quietly()
+
+if METRICS is not None and os.environ.get(FILE_ENV_VAR):
+    atexit.register(_dump_quietly)
+    threading.Thread(
+        target=_write_periodically,
+        args=(float(os.environ.get(INTERVAL_ENV_VAR, DEFAULT_INTERVAL)),),
+        name="metrics-writer",
+        daemon=True,
+    ).start()
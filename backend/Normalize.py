@@ -0,0 +1,57 @@
+"""
+Normalize.py
+
+This module defines the Unicode normalization of words and guessed letters. Words are
+normalized once, when a word list is loaded, to NFC (so "ą" written as "a" followed by
+a combining ogonek becomes the single letter "ą") and case-folded. Guessed letters are
+normalized the same way, so decomposed keyboard input matches too.
+
+It also defines the folding of diacritics used by the "fold diacritics" mode of the game,
+in which guessing "a" reveals both "a" and "ą".
+
+Functions:
+    normalize_text(text):
+        Returns the text in NFC, case-folded.
+
+    fold_letter(letter):
+        Returns the letter without diacritics (e.g. "ą" -> "a", "ł" -> "l").
+"""
+
+import unicodedata
+from functools import lru_cache
+
+# Litery, których nie da się rozłożyć na literę bazową i znak diakrytyczny
+FOLDS = {"ł": "l", "ø": "o", "đ": "d", "ħ": "h", "ı": "i"}
+
+def normalize_text(text):
+    """
+    Returns the text in NFC, case-folded. Already normalized text is returned as is.
+
+    Args:
+        text (str): The text to normalize (a word, a guessed letter or a whole chunk of a file).
+
+    Returns:
+        str: The normalized text.
+    """
+    text = text.casefold()
+    if unicodedata.is_normalized("NFC", text):
+        return text
+    return unicodedata.normalize("NFC", text)
+
+@lru_cache(maxsize=None)
+def fold_letter(letter):
+    """
+    Returns the letter without diacritics (e.g. "ą" -> "a", "ż" -> "z", "ł" -> "l").
+    Letters without diacritics are returned unchanged.
+
+    Args:
+        letter (str): A single, normalized letter.
+
+    Returns:
+        str: The folded letter.
+    """
+    if letter in FOLDS:
+        return FOLDS[letter]
+    # Rozkład NFD oddziela literę bazową od znaków diakrytycznych
+    base = unicodedata.normalize("NFD", letter)[0]
+    return base if base.isalpha() else letter
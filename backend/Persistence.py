@@ -0,0 +1,274 @@
+"""
+Persistence.py
+
+This module implements the CLIENT_STORAGE data strategy: settings and the game in progress
+are mirrored into `page.client_storage`, so they survive reloading the app.
+
+Writes go through a write-behind buffer. Changed values are only kept in memory and written
+together, as one compact JSON snapshot under a single key, once no more changes arrive for
+a short while. A guess therefore never waits for a storage round-trip.
+
+Class:
+    WriteBehindStorage:
+        - Buffers values in memory and writes them to the client storage in debounced batches.
+
+Functions:
+    enable_persistence(page):
+        Creates the WriteBehindStorage of the page, loading the stored snapshot.
+
+    flush_persistence(page):
+        Writes the buffered changes to the client storage now, e.g. when the session closes.
+
+    remember(page, key, value):
+        Stores a value in the client storage if persistence is enabled.
+
+    forget(page, key):
+        Removes a value from the client storage if persistence is enabled.
+
+    recall(page, key, default=None):
+        Returns a value stored in the client storage if persistence is enabled.
+
+    restore_session(page):
+        Restores the settings and the game in progress from the client storage.
+"""
+
+import json
+import threading
+import time
+from backend.GameState import GameState
+
+STORAGE_KEY = "wisielec.snapshot"  # Klucz, pod którym w pamięci klienta leży cały stan
+WRITE_DELAY = 0.5  # Po ilu sekundach bez zmian zapisujemy stan
+MAX_WRITE_DELAY = 3.0  # Najdłuższy czas, przez jaki zmiana może czekać na zapis
+
+class WriteBehindStorage:
+    """
+    Buffers values in memory and writes them to the client storage in debounced batches.
+
+    Attributes:
+        page (ft.Page): The page whose client storage is used.
+        snapshot (dict): The current values, as they will be written.
+        writes (int): The number of changed values.
+        flushes (int): The number of actual writes to the client storage.
+
+    Methods:
+        get(key, default=None): Returns a value from the snapshot.
+        set(key, value): Changes a value and schedules a write.
+        remove(key): Removes a value and schedules a write.
+        flush(): Writes the snapshot to the client storage now.
+    """
+
+    def __init__(self, page, delay=WRITE_DELAY, max_delay=MAX_WRITE_DELAY):
+        """
+        Initializes the WriteBehindStorage instance and loads the stored snapshot.
+
+        Args:
+            page (ft.Page): The page whose client storage is used.
+            delay (float, optional): Seconds without changes after which the snapshot is written.
+                                     Default is WRITE_DELAY.
+            max_delay (float, optional): The longest time a change may wait to be written.
+                                         Default is MAX_WRITE_DELAY.
+        """
+        self.page = page
+        self.delay = delay
+        self.max_delay = max_delay
+        self.writes = 0
+        self.flushes = 0
+        self._lock = threading.Lock()
+        self._timer = None
+        self._dirty_since = None  # Czas pierwszej niezapisanej zmiany
+
+        try:
+            stored = page.client_storage.get(STORAGE_KEY)
+            self.snapshot = json.loads(stored) if stored else {}
+        except Exception:
+            self.snapshot = {}  # Uszkodzony lub niedostępny stan zaczynamy od nowa
+
+    def get(self, key, default=None):
+        """
+        Returns a value from the snapshot.
+
+        Args:
+            key (str): The name of the value.
+            default (any, optional): Returned if the value is not stored. Default is None.
+
+        Returns:
+            any: The stored value or `default`.
+        """
+        with self._lock:
+            return self.snapshot.get(key, default)
+
+    def set(self, key, value):
+        """
+        Changes a value and schedules writing the snapshot.
+
+        Args:
+            key (str): The name of the value.
+            value (any): A JSON-serializable value.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self.snapshot.get(key) == value:
+                return
+            self.snapshot[key] = value
+            self._schedule()
+
+    def remove(self, key):
+        """
+        Removes a value and schedules writing the snapshot.
+
+        Args:
+            key (str): The name of the value.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if key not in self.snapshot:
+                return
+            del self.snapshot[key]
+            self._schedule()
+
+    def _schedule(self):
+        # Odkładamy zapis; kolejne zmiany przesuwają go, ale nie dłużej niż o max_delay
+        self.writes += 1
+        now = time.monotonic()
+        if self._dirty_since is None:
+            self._dirty_since = now
+        if self._timer is not None:
+            self._timer.cancel()
+        delay = min(self.delay, max(0.0, self._dirty_since + self.max_delay - now))
+        self._timer = threading.Timer(delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """
+        Writes the snapshot to the client storage now, if anything has changed.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            if self._dirty_since is None:
+                return
+            self._dirty_since = None
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            data = json.dumps(self.snapshot, separators=(",", ":"), ensure_ascii=False)
+            self.flushes += 1
+        try:
+            self.page.client_storage.set(STORAGE_KEY, data)
+        except Exception:
+            pass  # Klient mógł się już rozłączyć; stan zapiszemy przy następnej zmianie
+
+def enable_persistence(page):
+    """
+    Creates the WriteBehindStorage of the page, loading the stored snapshot.
+
+    Args:
+        page (ft.Page): The page instance.
+
+    Returns:
+        WriteBehindStorage: The storage stored in the page session.
+    """
+    storage = WriteBehindStorage(page)
+    page.session.set("client_storage", storage)
+    return storage
+
+def flush_persistence(page):
+    """
+    Writes the changes buffered by the WriteBehindStorage of the page to the client storage
+    now, without waiting for the write delay. Does nothing if persistence is not enabled.
+
+    Args:
+        page (ft.Page): The page instance.
+
+    Returns:
+        None
+    """
+    storage = page.session.get("client_storage")
+    if storage is not None:
+        storage.flush()
+
+def remember(page, key, value):
+    """
+    Stores a value in the client storage if persistence is enabled for the page.
+
+    Args:
+        page (ft.Page): The page instance.
+        key (str): The name of the value.
+        value (any): A JSON-serializable value.
+
+    Returns:
+        None
+    """
+    storage = page.session.get("client_storage")
+    if storage is not None:
+        storage.set(key, value)
+
+def forget(page, key):
+    """
+    Removes a value from the client storage if persistence is enabled for the page.
+
+    Args:
+        page (ft.Page): The page instance.
+        key (str): The name of the value.
+
+    Returns:
+        None
+    """
+    storage = page.session.get("client_storage")
+    if storage is not None:
+        storage.remove(key)
+
+def recall(page, key, default=None):
+    """
+    Returns a value stored in the client storage if persistence is enabled for the page.
+
+    Args:
+        page (ft.Page): The page instance.
+        key (str): The name of the value.
+        default (any, optional): Returned if the value is not stored. Default is None.
+
+    Returns:
+        any: The stored value or `default`.
+    """
+    storage = page.session.get("client_storage")
+    if storage is None:
+        return default
+    return storage.get(key, default)
+
+def restore_session(page):
+    """
+    Restores the settings and the game in progress from the client storage.
+
+    Args:
+        page (ft.Page): The page instance.
+
+    Returns:
+        str or list: The path (or paths) of the last loaded word lists, to be loaded again, or None.
+    """
+    storage = page.session.get("client_storage")
+    if storage is None:
+        return None
+
+    max_mistakes = storage.get("max_mistakes")
+    if max_mistakes is not None:
+        page.session.set("max_mistakes", max_mistakes)
+
+    difficulty = storage.get("difficulty")
+    if difficulty is not None:
+        page.session.set("difficulty", difficulty)
+
+    if storage.get("fold_diacritics"):
+        page.session.set("fold_diacritics", True)
+
+    game = storage.get("game")
+    if game is not None and not page.session.contains_key("game_state"):
+        page.session.set("game_state", GameState.restore(game))
+
+    return storage.get("pool_path")
@@ -0,0 +1,280 @@
+"""
+PoolFile.py
+
+This module defines a precompiled, binary word-pool format and a loader that memory-maps it.
+A compiled pool is loaded instantly regardless of its size: words are read straight from the
+mapped file on demand, and the operating system shares the mapped pages between processes.
+
+File layout (native little-endian byte order):
+    header    MAGIC, version, flags, word count and the positions of the sections below
+    offsets   (count + 1) x uint32, word `i` is blob[offsets[i]:offsets[i + 1]]
+    blob      all words, UTF-8 encoded, one after another
+    metadata  optional, one byte per word (the difficulty score, see backend.Difficulty)
+
+Classes:
+    MappedWordPool: A WordPool backed by a memory-mapped pool file.
+    LoadingCancelled: Raised when loading a word list is cancelled.
+
+Functions:
+    compile_pool(pool, path, metadata=None):
+        Writes a WordPool to a binary pool file.
+
+    is_pool_file(path):
+        Checks whether a file is a compiled pool file.
+
+    load_pool(path):
+        Memory-maps a compiled pool file.
+
+    decompressed(file):
+        Wraps a gzip, bzip2 or xz compressed file in a decompressing stream.
+
+    load_words(path, on_progress=None, cancel_event=None):
+        Loads a word list or a compiled pool file; safe to run in a worker thread.
+
+Usage:
+    Compile a word list once with `python -m backend.PoolFile words.txt words.pool`
+    and pick the resulting file in the settings view.
+"""
+
+import bz2
+import gzip
+import lzma
+import mmap
+import struct
+import sys
+import weakref
+from backend.WordPool import WordPool, iter_words
+
+MAGIC = b"WISIELEC"  # Sygnatura pliku z pulą słówek
+VERSION = 1
+FLAG_METADATA = 1  # Plik zawiera sekcję metadanych
+HEADER = struct.Struct("<8sIIQQQQ")  # magic, wersja, flagi, liczba słówek, pozycje sekcji
+COMPRESSED_FORMATS = (  # Sygnatury skompresowanych plików i strumienie, które je rozpakowują
+    (b"\x1f\x8b", lambda file: gzip.GzipFile(fileobj=file, mode='rb')),
+    (b"BZh", bz2.BZ2File),
+    (b"\xfd7zXZ\x00", lzma.LZMAFile),
+)
+
+def compile_pool(pool, path, metadata=None):
+    """
+    Writes a word pool to a binary pool file.
+
+    Args:
+        pool (WordPool): The pool to compile.
+        path (str): The path of the output file.
+        metadata (bytes, optional): One byte of metadata per word. Default is None.
+
+    Raises:
+        Exception: If the metadata length does not match the pool length.
+
+    Returns:
+        None
+    """
+    count = len(pool)
+    if metadata is not None and len(metadata) != count:
+        raise Exception("Metadane muszą mieć po jednym bajcie na słówko")
+
+    offsets = pool._offsets.tobytes()
+    offsets_pos = HEADER.size
+    blob_pos = offsets_pos + len(offsets)
+    blob_size = pool._offsets[count]
+    meta_pos = blob_pos + blob_size if metadata is not None else 0
+    flags = FLAG_METADATA if metadata is not None else 0
+
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, flags, count, offsets_pos, blob_pos, meta_pos))
+        file.write(offsets)
+        file.write(pool._buffer[:blob_size])
+        if metadata is not None:
+            file.write(bytes(metadata))
+
+def is_pool_file(path):
+    """
+    Checks whether a file is a compiled pool file.
+
+    Args:
+        path (str): The path of the file to check.
+
+    Returns:
+        bool: True if the file starts with the pool file signature.
+    """
+    try:
+        with open(path, 'rb') as file:
+            return file.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+def load_pool(path):
+    """
+    Memory-maps a compiled pool file.
+
+    Args:
+        path (str): The path of the pool file.
+
+    Returns:
+        MappedWordPool: The pool backed by the mapped file.
+    """
+    return MappedWordPool(path)
+
+
+def decompressed(file):
+    """
+    Wraps a gzip, bzip2 or xz compressed file in a stream decompressing it on the fly,
+    so compressed word lists are never unpacked to disk. The format is recognized by
+    the signature of the file, not by its extension.
+
+    Args:
+        file (BinaryIO): The file opened in binary mode, positioned at its start.
+
+    Returns:
+        BinaryIO: The decompressing stream, or `file` itself if it is not compressed.
+    """
+    head = file.peek(8)[:8] if hasattr(file, "peek") else b""
+    for magic, opener in COMPRESSED_FORMATS:
+        if head.startswith(magic):
+            return opener(file)
+    return file
+
+
+class LoadingCancelled(Exception):
+    """
+    Raised inside a loader thread when loading a word list has been cancelled.
+    """
+
+def load_words(path, on_progress=None, cancel_event=None):
+    """
+    Loads a word list (or a compiled pool file) into a word pool. Safe to run in a worker thread.
+    Word lists compressed with gzip, bzip2 or xz are decompressed while they are read.
+
+    Args:
+        path (str): The file path to read from.
+        on_progress (callable, optional): Called with the number of bytes of the file read after
+                                          every chunk (compressed bytes for compressed files).
+                                          Default is None.
+        cancel_event (threading.Event, optional): When set, loading stops with LoadingCancelled.
+                                                  Default is None.
+
+    Raises:
+        LoadingCancelled: If `cancel_event` was set during loading.
+
+    Returns:
+        WordPool: The loaded pool.
+    """
+    if is_pool_file(path):
+        # Skompilowaną pulę tylko mapujemy do pamięci, bez parsowania
+        return load_pool(path)
+
+    # Otwieramy plik w trybie binarnym i czytamy go porcjami prosto do puli słówek
+    pool = WordPool()
+    with open(path, 'rb') as raw, decompressed(raw) as file:
+
+        def report_progress(bytes_read):
+            if cancel_event is not None and cancel_event.is_set():
+                raise LoadingCancelled()
+            if on_progress is not None:
+                on_progress(raw.tell())  # Postęp liczymy w bajtach pliku, także skompresowanego
+
+        for word in iter_words(file, on_progress=report_progress):
+            pool.add(word)
+    return pool.freeze()
+
+
+def _unmap(mapping, views):
+    # Widoki trzeba zwolnić przed zamknięciem mapowania
+    try:
+        for view in views:
+            if isinstance(view, memoryview):
+                view.release()
+        mapping.close()
+    except BufferError:
+        pass  # Ktoś nadal korzysta z mapowania; zamknie się samo, gdy zniknie ostatni widok
+
+
+class MappedWordPool(WordPool):
+    """
+    A read-only WordPool backed by a memory-mapped pool file.
+
+    Nothing is parsed or copied on load: the offsets table is a view into the mapping
+    and each word is decoded only when it is accessed.
+
+    Attributes:
+        path (str): The path of the mapped pool file.
+        metadata (memoryview): One byte of metadata per word, or None if the file has none
+                               (until the scores are computed, see `backend.Difficulty`).
+
+    Methods:
+        close(): Unmaps the pool file.
+    """
+
+    def __init__(self, path):
+        """
+        Initializes the MappedWordPool instance.
+
+        Args:
+            path (str): The path of the pool file.
+
+        Raises:
+            Exception: If the file is not a valid pool file.
+        """
+        self.path = path
+        self.duplicates = 0
+        self.sources = None
+        self._lookup = None  # Pula z pliku jest tylko do odczytu
+
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, flags, count, offsets_pos, blob_pos, meta_pos = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise Exception("Nieprawidłowy plik puli słówek")
+
+        # Tablica przesunięć i metadane to widoki na zmapowany plik, bez kopiowania
+        self._view = memoryview(self._map)
+        self._offsets = self._view[offsets_pos:offsets_pos + (count + 1) * 4].cast('I')
+        self._blob_pos = blob_pos
+        self.metadata = self._view[meta_pos:meta_pos + count] if flags & FLAG_METADATA else None
+
+        # Mapowanie zamykamy dopiero, gdy nikt już nie używa puli (albo przy jawnym close())
+        self._finalizer = weakref.finalize(self, _unmap, self._map, (self._offsets, self.metadata, self._view))
+
+    def _raw(self, index):
+        start = self._blob_pos + self._offsets[index]
+        end = self._blob_pos + self._offsets[index + 1]
+        return self._map[start:end]
+
+    def _blob(self):
+        return self._map, self._blob_pos
+
+    def _chunk(self, start, stop):
+        blob = self._map[self._blob_pos + self._offsets[start]:self._blob_pos + self._offsets[stop]]
+        return blob, self._offsets[start:stop + 1].tobytes()
+
+    def add(self, word):
+        raise Exception("Pula słówek z pliku jest tylko do odczytu")
+
+    def close(self):
+        """
+        Unmaps the pool file now, instead of when the pool is garbage collected. Only for
+        pools no one else holds: the pool must not be used afterwards.
+
+        Returns:
+            None
+        """
+        self.metadata = None
+        self._finalizer()
+
+    def __repr__(self):
+        return f"MappedWordPool({len(self)} words from {self.path!r})"
+
+
+if __name__ == "__main__":
+    # Kompilacja listy słówek: python -m backend.PoolFile slowa.txt slowa.pool
+    if len(sys.argv) != 3:
+        print("Użycie: python -m backend.PoolFile <lista_słówek.txt> <pula.pool>")
+        sys.exit(1)
+    from backend.Difficulty import score_pool  # Wyniki trudności zapisujemy w metadanych pliku
+    with open(sys.argv[1], 'rb') as source:
+        word_pool = WordPool(iter_words(source)).freeze()
+    compile_pool(word_pool, sys.argv[2], score_pool(word_pool))
+    print(f"Zapisano {len(word_pool)} słówek do {sys.argv[2]}")
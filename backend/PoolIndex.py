@@ -0,0 +1,175 @@
+"""
+PoolIndex.py
+
+This module searches the words of a pool without creating a control or even a `str`
+per word. A prefix search uses a sorted index of the pool: the word indexes ordered by
+their UTF-8 bytes (which is the order of code points), built once per pool, so the words
+starting with a prefix are one contiguous range found with two binary searches.
+A substring search scans the raw UTF-8 buffer of the pool with `find` and stops after
+a page of results; the next page continues where the previous one stopped.
+
+Classes:
+    SortedIndex: The word indexes of a pool in alphabetical order.
+
+Functions:
+    get_sorted_index(pool):
+        Returns the SortedIndex of a pool, building it on first use.
+
+    is_indexed(pool):
+        Checks whether the SortedIndex of a pool has already been built.
+
+    find_substring(pool, text, start=0, limit=PAGE_SIZE):
+        Returns the indexes of the words containing a text, one page at a time.
+"""
+
+import weakref
+from array import array
+from bisect import bisect_left, bisect_right
+from backend.Normalize import normalize_text
+
+PAGE_SIZE = 100  # Liczba wyników jednej strony wyszukiwania
+
+class SortedIndex:
+    """
+    The word indexes of a pool in alphabetical (code point) order. The index does not
+    keep a reference to its pool (it is cached under the pool as a weak key), so the pool
+    is passed to every lookup.
+
+    Attributes:
+        order (array): The indexes of the words of the pool, sorted by the words.
+
+    Methods:
+        prefix_range(pool, prefix): Returns the positions in `order` of the words starting with a prefix.
+        find(pool, word): Returns the index of a word in the pool.
+    """
+
+    def __init__(self, pool):
+        """
+        Initializes the SortedIndex instance by sorting the whole pool.
+
+        Args:
+            pool (WordPool): The word pool.
+        """
+        count = len(pool)
+        # Sortujemy surowe bajty słówek (kolejność bajtów UTF-8 to kolejność punktów kodowych)
+        blob, offsets_bytes = pool._chunk(0, count) if count else (b"", b"")
+        offsets = array('I')
+        offsets.frombytes(offsets_bytes)
+        base = offsets[0] if count else 0
+        keys = [blob[start - base:end - base] for start, end in zip(offsets, offsets[1:])]
+        self.order = array('I', sorted(range(count), key=keys.__getitem__))
+
+    def _keys(self, pool):
+        # Klucz sortowania pozycji w `order`: surowe bajty słówka
+        order, raw = self.order, pool._raw
+        return lambda position: raw(order[position])
+
+    def prefix_range(self, pool, prefix):
+        """
+        Returns the positions in `order` of the words starting with a prefix.
+
+        Args:
+            pool (WordPool): The indexed pool.
+            prefix (str): The prefix (normalized like the words of the pool).
+
+        Returns:
+            range: The positions of the matching words; `order[i]` is the index of a word.
+        """
+        data = normalize_text(prefix).encode('utf-8')
+        positions = range(len(self.order))
+        key = self._keys(pool)
+        start = bisect_left(positions, data, key=key)
+        # Bajt 0xFF nie występuje w UTF-8, więc każde słówko z tym początkiem jest mniejsze
+        stop = bisect_left(positions, data + b"\xff", lo=start, key=key)
+        return range(start, stop)
+
+    def find(self, pool, word):
+        """
+        Returns the index of a word in the pool.
+
+        Args:
+            pool (WordPool): The indexed pool.
+            word (str): The word (normalized like the words of the pool).
+
+        Returns:
+            int: The index of the word, or None if it is not in the pool.
+        """
+        data = normalize_text(word).encode('utf-8')
+        key = self._keys(pool)
+        position = bisect_left(range(len(self.order)), data, key=key)
+        if position < len(self.order) and key(position) == data:
+            return self.order[position]
+        return None
+
+    def __len__(self):
+        return len(self.order)
+
+# Indeksy budowane raz na pulę i zwalniane razem z nią
+_indexes = weakref.WeakKeyDictionary()
+
+def get_sorted_index(pool):
+    """
+    Returns the SortedIndex of a pool, building it on first use. Safe to run in a worker thread.
+
+    Args:
+        pool (WordPool): The word pool.
+
+    Returns:
+        SortedIndex: The index of the pool.
+    """
+    index = _indexes.get(pool)
+    if index is None:
+        index = SortedIndex(pool)
+        _indexes[pool] = index
+    return index
+
+def is_indexed(pool):
+    """
+    Checks whether the SortedIndex of a pool has already been built.
+
+    Args:
+        pool (WordPool): The word pool.
+
+    Returns:
+        bool: True if `get_sorted_index` returns without building the index.
+    """
+    return pool in _indexes
+
+def find_substring(pool, text, start=0, limit=PAGE_SIZE):
+    """
+    Returns the indexes of the words containing a text, scanning the raw buffer of the pool
+    from the word `start` on and stopping after `limit` words.
+
+    Args:
+        pool (WordPool): The word pool.
+        text (str): The text to find (normalized like the words of the pool).
+        start (int, optional): The index of the first word to scan. Default is 0.
+        limit (int, optional): The maximum number of words returned. Default is PAGE_SIZE.
+
+    Returns:
+        tuple: The list of the indexes of the matching words and the index of the word
+               to continue from (None if the whole pool has been scanned).
+    """
+    data = normalize_text(text).encode('utf-8')
+    count = len(pool)
+    if not data:
+        stop = min(count, start + limit)
+        return list(range(start, stop)), stop if stop < count else None
+
+    blob, base = pool._blob()
+    offsets = pool._offsets
+    end = base + offsets[count]
+    position = base + offsets[start] if start < count else end
+    found = []
+    while len(found) < limit:
+        position = blob.find(data, position, end)
+        if position < 0:
+            return found, None
+        index = bisect_right(offsets, position - base) - 1
+        word_end = base + offsets[index + 1]
+        if position + len(data) <= word_end:
+            found.append(index)
+            position = word_end  # Kolejne wystąpienia w tym samym słówku nas nie interesują
+        else:
+            position += 1  # Dopasowanie na styku dwóch słówek
+    return found, index + 1 if index + 1 < count else None
@@ -0,0 +1,257 @@
+"""
+PoolRegistry.py
+
+This module defines a process-wide registry of loaded word pools. When the app is served
+on the web, every session loading the same word list shares one read-only pool instead of
+keeping its own copy: pools are keyed by the hash of the file content, reference counted,
+and evicted when the last session releases them. Sessions only store a PoolHandle.
+
+Classes:
+    PoolHandle: A session's reference to a shared pool.
+    PoolRegistry: Loads, shares and evicts word pools.
+
+Functions:
+    file_key(path):
+        Returns the key identifying the content of a word list file.
+
+    pool_key(paths):
+        Returns the key identifying the content of one or several word list files.
+
+    session_pool(page):
+        Returns the word pool of a session, or None.
+
+    set_session_pool(page, handle):
+        Stores a pool handle in the session, releasing the previous one.
+
+    release_session_pool(page):
+        Releases the pool handle of a session (e.g. when the session closes).
+
+Attributes:
+    REGISTRY (PoolRegistry): The registry shared by all sessions of the process.
+"""
+
+import hashlib
+import os
+import threading
+from backend.PoolFile import is_pool_file
+
+HASH_CHUNK_SIZE = 1024 * 1024  # Rozmiar porcji czytanej przy liczeniu skrótu pliku
+
+def file_key(path):
+    """
+    Returns the key identifying the content of a word list file.
+
+    Text word lists are identified by a hash of their content. Compiled pool files are
+    identified by their path, size and modification time instead, so they are not read
+    in full just to compute the key (mapping the same file shares its pages anyway).
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        str: The key of the file.
+    """
+    if is_pool_file(path):
+        stat = os.stat(path)
+        return f"pool:{os.path.realpath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return f"text:{digest.hexdigest()}"
+
+def pool_key(paths):
+    """
+    Returns the key identifying the content of one or several word list files. Pools merged
+    from the same set of files share a key, whatever order the files were picked in.
+
+    Args:
+        paths (str or list): The path of the file, or the paths of several files.
+
+    Returns:
+        str: The key of the files.
+    """
+    if isinstance(paths, str):
+        return file_key(paths)
+    keys = sorted({file_key(path) for path in paths})
+    if len(keys) == 1:
+        return keys[0]
+    return "files:" + hashlib.blake2b("\n".join(keys).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class PoolHandle:
+    """
+    A session's reference to a shared pool. Releasing it more than once has no effect.
+
+    Attributes:
+        key (str): The key of the pool in the registry.
+        pool (WordPool): The shared, read-only pool.
+
+    Methods:
+        release(): Gives the reference back to the registry.
+    """
+
+    __slots__ = ("key", "pool", "_registry")
+
+    def __init__(self, registry, key, pool):
+        """
+        Initializes the PoolHandle instance.
+
+        Args:
+            registry (PoolRegistry): The registry the pool belongs to.
+            key (str): The key of the pool in the registry.
+            pool (WordPool): The shared pool.
+        """
+        self._registry = registry
+        self.key = key
+        self.pool = pool
+
+    def release(self):
+        """
+        Gives the reference back to the registry.
+
+        Returns:
+            None
+        """
+        if self._registry is not None:
+            registry, self._registry = self._registry, None
+            registry.release(self.key)
+            self.pool = None
+
+
+class _Entry:
+    # Wpis rejestru: pula, liczba odwołań i blokada chroniąca jej wczytywanie
+    __slots__ = ("pool", "refs", "lock")
+
+    def __init__(self):
+        self.pool = None
+        self.refs = 0
+        self.lock = threading.Lock()
+
+
+class PoolRegistry:
+    """
+    Loads, shares and evicts word pools.
+
+    Methods:
+        acquire(key, loader): Returns a handle to the pool with the given key, loading it if needed.
+        release(key): Drops one reference to a pool, evicting it when none are left.
+        stats(): Returns the number of pools and references held.
+    """
+
+    def __init__(self):
+        """
+        Initializes the PoolRegistry instance.
+        """
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, key, loader):
+        """
+        Returns a handle to the pool with the given key, loading it if no session holds it yet.
+        Sessions acquiring a pool that is being loaded wait for it instead of loading it again.
+
+        Args:
+            key (str): The key of the pool (see `file_key`).
+            loader (callable): A function without arguments returning the loaded pool.
+
+        Returns:
+            PoolHandle: The handle to the shared pool.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry()
+            entry.refs += 1
+
+        try:
+            with entry.lock:
+                if entry.pool is None:
+                    entry.pool = loader()
+        except BaseException:
+            self.release(key)
+            raise
+        return PoolHandle(self, key, entry.pool)
+
+    def release(self, key):
+        """
+        Drops one reference to a pool. The last reference evicts the pool from the registry;
+        the pool itself is freed once nothing else (an index, a background task, a game) uses it.
+
+        Args:
+            key (str): The key of the pool.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refs -= 1
+            if entry.refs > 0:
+                return
+            del self._entries[key]
+        # Puli nie zamykamy: mogą jej jeszcze używać indeksy, zadania w tle albo trwająca gra.
+        # Zwolni ją odśmiecacz, gdy zniknie ostatnie odwołanie (zmapowany plik zamyka wtedy MappedWordPool)
+
+    def stats(self):
+        """
+        Returns the number of pools and references held.
+
+        Returns:
+            dict: The numbers of pools and session references.
+        """
+        with self._lock:
+            return {
+                "pools": len(self._entries),
+                "references": sum(entry.refs for entry in self._entries.values()),
+            }
+
+# Rejestr wspólny dla wszystkich sesji procesu
+REGISTRY = PoolRegistry()
+
+def session_pool(page):
+    """
+    Returns the word pool of a session.
+
+    Args:
+        page (ft.Page): The page instance.
+
+    Returns:
+        WordPool: The pool, or None if the session has not loaded any words.
+    """
+    handle = page.session.get("words")
+    return handle.pool if handle is not None else None
+
+def set_session_pool(page, handle):
+    """
+    Stores a pool handle in the session, releasing the previously held one.
+
+    Args:
+        page (ft.Page): The page instance.
+        handle (PoolHandle): The handle to store.
+
+    Returns:
+        None
+    """
+    previous = page.session.get("words")
+    page.session.set("words", handle)
+    if previous is not None and previous is not handle:
+        previous.release()
+
+def release_session_pool(page):
+    """
+    Releases the pool handle of a session, e.g. when the session closes.
+
+    Args:
+        page (ft.Page): The page instance.
+
+    Returns:
+        None
+    """
+    handle = page.session.get("words")
+    if handle is not None:
+        page.session.remove("words")
+        handle.release()
@@ -5,72 +5,378 @@ This module provides functions for handling file reading, processing the maximum
 and managing file selection events for the application.
 
 Functions:
+    acquire_pool(path, on_progress=None, cancel_event=None):
+        Returns a handle to the pool of a file (or of several merged files) shared by all sessions.
+
     read_file(page, path, router):
-        Reads a file and processes the words contained in it.
+        Reads a file (or several files) and stores a handle to its shared WordPool in the session.
+
+    read_file_async(page, path, progress_bar=None):
+        Loads a file (or several files) in a worker thread, cancelling the previous load of the page.
         
-    handle_file_select(event, page, router):
-        Handles the file selection event and reads the selected file.
+    handle_file_select(event, page, router, progress_bar=None):
+        Handles the selection of files or a directory and loads them asynchronously.
         
+    restore_word_pool(page, path):
+        Loads again the word lists remembered in the client storage.
+
+    acquire_pool_without(handle, indexes, removed_words):
+        Returns a handle to the shared copy of a pool without some of its words.
+
+    remove_words(page, router, indexes):
+        Removes words from the session's pool and remembers them as removed.
+
     on_max_mistakes_input_clicked(page, router, value):
         Handles the setting of the maximum number of mistakes allowed in the game.
 
+    on_difficulty_changed(page, value):
+        Handles the selection of the difficulty level of drawn words.
+
+    on_fold_diacritics_changed(page, value):
+        Handles switching the mode in which letters with and without diacritics are the same letter.
+
 Usage:
     Import this module to handle file reading, setting maximum mistakes, and processing file selection in the app.
 """
 
+import asyncio
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import flet as ft
 from backend.Snack import add_snack
 from backend.CurrentRoute import CurrentRoute
+from backend.Updates import get_scheduler
+from backend.WordPool import CHUNK_SIZE
+from backend.PoolFile import LoadingCancelled, load_words
+from backend.Ingest import list_word_files, load_word_files
+from backend.PoolRegistry import REGISTRY, pool_key, set_session_pool
+from backend.Persistence import remember, forget, recall
+from backend.PoolIndex import get_sorted_index
+from backend.Difficulty import Difficulty, get_difficulty_index
+from backend import Metrics
+
+PROGRESS_MIN_SIZE = 8 * CHUNK_SIZE  # Minimalny rozmiar pliku, dla którego pokazujemy postęp
+PROGRESS_STEP = 0.25  # Co jaką część pliku raportujemy postęp
+LOADER = ThreadPoolExecutor(max_workers=2, thread_name_prefix="word-loader")  # Wątki wczytujące pliki
+REMOVED_MARK = "|removed:"  # Oddziela w kluczu puli klucz plików od skrótu usuniętych słówek
+
+def _paths(path):
+    # Jedna ścieżka albo lista ścieżek, bez powtórzeń
+    return [path] if isinstance(path, str) else list(dict.fromkeys(path))
+
+def _total_size(path):
+    return sum(os.path.getsize(p) for p in _paths(path))
+
+def acquire_pool(path, on_progress=None, cancel_event=None):
+    """
+    Returns a handle to the shared pool of a file, loading the file only if no other
+    session has it loaded already. Several files are merged into one pool (see
+    `backend.Ingest`), with a report of every file in the pool's `sources`. The difficulty index of a newly loaded pool is built
+    right away, so drawing a word of a difficulty level never waits for it. Safe to run
+    in a worker thread.
+
+    Args:
+        path (str or list): The file path to read from, or a list of paths.
+        on_progress (callable, optional): Called with the number of bytes read so far.
+                                          Default is None.
+        cancel_event (threading.Event, optional): When set, loading stops with LoadingCancelled.
+                                                  Default is None.
+
+    Returns:
+        PoolHandle: The handle to the shared pool.
+    """
+    paths = _paths(path)
+
+    def load():
+        # Czas wczytywania mierzymy tylko dla faktycznych wczytań, nie dla pul już współdzielonych
+        with Metrics.timed("pool_load_ms"):
+            if len(paths) == 1:
+                pool = load_words(paths[0], on_progress, cancel_event)
+            else:
+                pool = load_word_files(paths, on_progress, cancel_event)
+        Metrics.observe("pool_words", len(pool))
+        with Metrics.timed("difficulty_index_ms"):
+            get_difficulty_index(pool)
+        return pool
+
+    Metrics.increment("pool_acquires")
+    return REGISTRY.acquire(pool_key(paths), load)
 
 def read_file(page, path, router):
     """
-    Reads the content of a file and processes it as a list of words.
+    Reads the content of a file and stores a handle to its shared WordPool in the session.
+
+    The file is streamed in chunks (see `iter_words`), and for large files the loading
+    progress is reported with snack bars. Pool files compiled with `backend.PoolFile`
+    are memory-mapped instead of parsed. Several files are merged into one pool.
 
     Args:
         page (ft.Page): The page instance where snack bars and session data are updated.
-        path (str): The file path to read from.
+        path (str or list): The file path to read from, or a list of paths.
         router (Router): The router instance to reload the page after processing the file.
 
     Returns:
         None
     """
     try:
-        # Otwieramy plik w trybie odczytu
-        with open(path, 'r', encoding='utf-8') as file:
-            file_content = file.read()
-            elements = file_content.split(',')  # Dzielimy zawartość pliku po przecinkach
-            elements = [element.strip() for element in elements]  # Usuwamy zbędne spacje
-            # Wyświetlamy komunikat o sukcesie
-            add_snack(color=ft.Colors.GREEN, content=f"Pomyślnie dodano {len(elements)} słówek", page=page)
+        total_size = _total_size(path)
+        next_report = PROGRESS_STEP
+
+        def report_progress(bytes_read):
+            nonlocal next_report
+            # Postęp pokazujemy tylko dla dużych plików, co PROGRESS_STEP
+            if total_size < PROGRESS_MIN_SIZE or bytes_read / total_size < next_report:
+                return
+            add_snack(content=f"Wczytywanie słówek: {int(bytes_read / total_size * 100)}%", page=page)
+            while next_report <= bytes_read / total_size:
+                next_report += PROGRESS_STEP
+
+        handle = acquire_pool(path, on_progress=report_progress)
+        # Wyświetlamy komunikat o sukcesie
+        add_snack(color=ft.Colors.GREEN, content=f"Pomyślnie dodano {len(handle.pool)} słówek", page=page)
     except Exception as e:
         # Jeśli wystąpi błąd, wyświetlamy komunikat o błędzie
-        add_snack(content="Błąd przy wczytywaniu pliku", color=ft.Colors.RED)
+        add_snack(content="Błąd przy wczytywaniu pliku", color=ft.Colors.RED, page=page)
         return
 
-    # Ustawiamy w sesji słówka
-    page.session.set("words", elements)
+    # Ustawiamy w sesji uchwyt do wspólnej puli słówek (bez powtórzeń)
+    set_session_pool(page, handle)
+    remember(page, "pool_path", path)
+    _forget_removed_words(page)
+
+async def read_file_async(page, path, progress_bar=None):
+    """
+    Acquires the shared pool of a file (or of several files) in a worker thread without
+    blocking the session.
+
+    Starting a new load cancels the previous one still running for the same page.
+    While the file loads, `progress_bar` is shown and updated.
+
+    Args:
+        page (ft.Page): The page instance where snack bars are shown.
+        path (str or list): The file path to read from, or a list of paths.
+        progress_bar (ft.ProgressBar, optional): The progress indicator. Default is None.
+
+    Returns:
+        PoolHandle: The handle to the shared pool, or None if loading failed or was cancelled.
+    """
+    # Anulujemy wczytywanie poprzednio wybranego pliku
+    previous = page.session.get("file_loading")
+    if previous is not None:
+        previous.set()
+    cancel_event = threading.Event()
+    page.session.set("file_loading", cancel_event)
+
+    scheduler = get_scheduler(page)
+    last_percent = -1
+
+    def report_progress(bytes_read):
+        nonlocal last_percent
+        percent = int(bytes_read / total_size * 100) if total_size else 100
+        # Aktualizujemy pasek tylko przy zmianie o pełny procent i gdy jest na stronie
+        if progress_bar is None or percent == last_percent or progress_bar.page is None:
+            return
+        last_percent = percent
+        progress_bar.value = percent / 100
+        scheduler.request(progress_bar)
+
+    def set_progress_visible(visible):
+        if progress_bar is not None and progress_bar.page is not None:
+            progress_bar.visible = visible
+            progress_bar.value = None if visible else 0  # Bez wartości pasek jest nieokreślony
+            scheduler.request(progress_bar)
+
+    try:
+        total_size = _total_size(path)
+        set_progress_visible(True)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(LOADER, acquire_pool, path, report_progress, cancel_event)
+    except LoadingCancelled:
+        return None  # Użytkownik wybrał w międzyczasie inny plik
+    except Exception as e:
+        add_snack(content="Błąd przy wczytywaniu pliku", color=ft.Colors.RED, page=page)
+        return None
+    finally:
+        # Pasek chowamy tylko, jeśli nie trwa już wczytywanie kolejnego pliku
+        if page.session.get("file_loading") is cancel_event:
+            page.session.remove("file_loading")
+            set_progress_visible(False)
 
-def handle_file_select(event, page, router):
+async def handle_file_select(event, page, router, progress_bar=None):
     """
-    Handles the file selection event and processes the selected file.
+    Handles the selection of files or a directory and loads them off the event loop.
+    All picked files (or all word lists found in the picked directory) are merged into
+    one pool.
 
     Args:
-        event (FilePickerResult): The event containing the file selection data.
+        event (FilePickerResult): The event containing the picked files or directory.
         page (ft.Page): The page instance to interact with the user interface.
         router (Router): The router instance to reload the page after file processing.
+        progress_bar (ft.ProgressBar, optional): The progress indicator shown while loading.
+                                                 Default is None.
 
     Returns:
         None
     """
-    # Obsługujemy wybór pliku
-    if event.files:  # Sprawdzamy, czy plik został wybrany
-        selected_file = event.files[0]  # Wybieramy pierwszy plik
-        read_file(page=page, path=selected_file.path, router=router)  # Wywołujemy funkcję do wczytania pliku
+    # Obsługujemy wybór plików albo folderu
+    if event.files:  # Sprawdzamy, czy wybrano pliki
+        paths = [selected_file.path for selected_file in event.files]
+    elif getattr(event, "path", None):  # Wybrano folder: bierzemy wszystkie listy słówek z niego
+        paths = list_word_files(event.path)
+        if not paths:
+            add_snack(content="W wybranym folderze nie ma list słówek", color=ft.Colors.RED, page=page)
+            return
+    else:
+        return
+
+    path = paths[0] if len(paths) == 1 else paths
+    handle = await read_file_async(page=page, path=path, progress_bar=progress_bar)
+    if handle is None:
+        return
+
+    # Zapis do sesji, komunikat i przeładowanie strony wysyłamy jedną aktualizacją
+    with get_scheduler(page).batch():
+        # Ustawiamy w sesji uchwyt do wspólnej puli słówek (bez powtórzeń)
+        set_session_pool(page, handle)
+        remember(page, "pool_path", path)
+        _forget_removed_words(page)
+        sources = handle.pool.sources
+        if sources is None:
+            add_snack(color=ft.Colors.GREEN, content=f"Pomyślnie dodano {len(handle.pool)} słówek", page=page)
+        else:
+            failed = sum(entry["error"] is not None for entry in sources)
+            add_snack(color=ft.Colors.GREEN if not failed else ft.Colors.YELLOW,
+                      content=f"Pomyślnie dodano {len(handle.pool)} słówek z {len(sources) - failed} plików"
+                              + (f" (nie udało się wczytać: {failed})" if failed else ""), page=page)
         # Tworzymy obiekt CurrentRoute
         cr = CurrentRoute(page=page)
         # Ponownie ładujemy stronę
         router.reload_page(current_route=cr, page=page)
 
+async def restore_word_pool(page, path):
+    """
+    Loads again the word lists remembered in the client storage, skipping the files
+    that no longer exist.
+
+    Args:
+        page (ft.Page): The page instance.
+        path (str or list): The path of the remembered word list, or a list of paths.
+
+    Returns:
+        None
+    """
+    paths = [p for p in _paths(path) if os.path.exists(p)]
+    if not paths:
+        return
+    path = paths[0] if len(paths) == 1 else paths
+    handle = await read_file_async(page=page, path=path)
+    removed_words = recall(page, "removed_words")
+    if handle is not None and removed_words:
+        # Słówka usunięte w przeglądarce puli usuwamy ponownie z wczytanej puli
+        loop = asyncio.get_running_loop()
+        handle = await loop.run_in_executor(LOADER, _apply_removed_words, handle, removed_words)
+        page.session.set("removed_words", removed_words)
+    if handle is not None and not page.session.contains_key("words"):
+        set_session_pool(page, handle)
+    elif handle is not None:
+        handle.release()  # Użytkownik zdążył w międzyczasie wczytać inną pulę
+
+def _forget_removed_words(page):
+    # Nowa pula: słówka usunięte z poprzedniej już nie obowiązują
+    if page.session.contains_key("removed_words"):
+        page.session.remove("removed_words")
+    forget(page, "removed_words")
+
+def _apply_removed_words(handle, removed_words):
+    # Wątek roboczy: szuka usuniętych słówek w świeżo wczytanej puli i zastępuje ją kopią bez nich
+    index = get_sorted_index(handle.pool)
+    found = (index.find(handle.pool, word) for word in removed_words)
+    indexes = [i for i in found if i is not None]
+    edited = acquire_pool_without(handle, indexes, removed_words)
+    handle.release()
+    return edited
+
+def acquire_pool_without(handle, indexes, removed_words):
+    """
+    Returns a handle to the shared copy of a pool without some of its words. The copy
+    is keyed by the files of the pool and all words removed from them, so sessions that
+    removed the same words share it. Safe to run in a worker thread.
+
+    Args:
+        handle (PoolHandle): The handle to the pool.
+        indexes (iterable): The indexes of the words to remove from the pool.
+        removed_words (list): All words removed from the files of the pool so far,
+                              including the ones at `indexes`.
+
+    Returns:
+        PoolHandle: The handle to the shared copy.
+    """
+    indexes = list(indexes)
+
+    def load():
+        # Kopia przejmuje wyniki trudności słówek (metadata), więc nie liczymy ich od nowa, tylko dzielimy na poziomy
+        pool = handle.pool.without(indexes)
+        get_difficulty_index(pool)
+        return pool
+
+    files_key = handle.key.partition(REMOVED_MARK)[0]
+    digest = hashlib.blake2b("\n".join(sorted(set(removed_words))).encode('utf-8'), digest_size=16).hexdigest()
+    return REGISTRY.acquire(f"{files_key}{REMOVED_MARK}{digest}", load)
+
+def remove_words(page, router, indexes):
+    """
+    Removes words from the session's pool: the pool is replaced by a copy without them,
+    built once for the whole batch. The copy is built in a worker thread (copying a large
+    pool takes a while); until it is ready, the session key "pool_removing" holds the pool
+    being edited, so the pool browser shows its progress placeholder. The removed words are
+    remembered, so they are removed again when the word lists are loaded in the next session.
+
+    Args:
+        page (ft.Page): The page instance where the session data is updated.
+        router (Router): The router instance to reload the page after removing the words.
+        indexes (iterable): The indexes of the words to remove.
+
+    Returns:
+        None
+    """
+    handle = page.session.get("words")
+    indexes = sorted(set(indexes))
+    if handle is None or not indexes:
+        return
+    words = [handle.pool[i] for i in indexes]
+    removed_words = list(dict.fromkeys((page.session.get("removed_words") or []) + words))
+
+    # Własne odwołanie do puli: sesja może ją zwolnić (wczytując inną), zanim kopia będzie gotowa
+    source = REGISTRY.acquire(handle.key, lambda: handle.pool)
+    page.session.set("pool_removing", handle.pool)
+    page.run_task(_remove_words_async, page, router, handle, source, indexes, removed_words, len(words))
+    router.reload_page(current_route=CurrentRoute(page=page), page=page)
+
+async def _remove_words_async(page, router, handle, source, indexes, removed_words, count):
+    # Kopię puli budujemy w wątku roboczym i podmieniamy pulę sesji, jeśli sesja nadal ma tę samą
+    loop = asyncio.get_running_loop()
+    try:
+        edited = await loop.run_in_executor(LOADER, acquire_pool_without, source, indexes, removed_words)
+    except Exception as e:
+        edited = None
+        add_snack(content=f"Nie udało się usunąć słówek: {e}", color=ft.Colors.RED, page=page)
+    finally:
+        if page.session.get("pool_removing") is source.pool:
+            page.session.remove("pool_removing")
+        source.release()
+
+    with get_scheduler(page).batch():
+        if edited is not None and page.session.get("words") is handle:
+            set_session_pool(page, edited)
+            page.session.set("removed_words", removed_words)
+            remember(page, "removed_words", removed_words)
+            add_snack(content=f"Usunięto z puli {count} słówek", color=ft.Colors.GREEN, page=page)
+        elif edited is not None:
+            edited.release()  # Użytkownik zdążył w międzyczasie wczytać inną pulę
+        router.reload_page(current_route=CurrentRoute(page=page), page=page)
+
 def on_max_mistakes_input_clicked(page, router, value):
     """
     Handles the input for setting the maximum number of mistakes allowed.
@@ -86,6 +392,7 @@ def on_max_mistakes_input_clicked(page, router, value):
     try:
         # Próbujemy zapisać wartość maksymalnej liczby błędów do sesji
         page.session.set("max_mistakes", int(value))
+        remember(page, "max_mistakes", int(value))
         # Wyświetlamy komunikat o sukcesie
         add_snack(content="Zapisano ustawienie", color="green", page=page)
     except Exception as e:
@@ -96,3 +403,44 @@ def on_max_mistakes_input_clicked(page, router, value):
         cr = CurrentRoute(page=page)
         # Ponownie ładujemy stronę
         router.reload_page(current_route=cr, page=page)
+
+def on_difficulty_changed(page, value):
+    """
+    Handles the selection of the difficulty level of drawn words.
+
+    Args:
+        page (ft.Page): The page instance where the session data is updated.
+        value (str): The name of the Difficulty level, or "ANY" for words of any difficulty.
+
+    Returns:
+        None
+    """
+    if value in Difficulty.__members__:
+        page.session.set("difficulty", Difficulty[value].value)
+        remember(page, "difficulty", Difficulty[value].value)
+    else:
+        if page.session.contains_key("difficulty"):
+            page.session.remove("difficulty")
+        forget(page, "difficulty")
+    add_snack(content="Zapisano ustawienie", color="green", page=page)
+
+def on_fold_diacritics_changed(page, value):
+    """
+    Handles switching the mode in which guessing a letter also reveals its variants with
+    diacritics (e.g. "a" reveals "ą"). The mode applies from the next game on.
+
+    Args:
+        page (ft.Page): The page instance where the session data is updated.
+        value (bool): Whether the mode is on.
+
+    Returns:
+        None
+    """
+    if value:
+        page.session.set("fold_diacritics", True)
+        remember(page, "fold_diacritics", True)
+    else:
+        if page.session.contains_key("fold_diacritics"):
+            page.session.remove("fold_diacritics")
+        forget(page, "fold_diacritics")
+    add_snack(content="Zapisano ustawienie (obowiązuje od następnej gry)", color="green", page=page)
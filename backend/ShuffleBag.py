@@ -0,0 +1,181 @@
+"""
+ShuffleBag.py
+
+This module draws the words of a pool in a random order without repeats: every word is
+served once before any word is served again.
+
+The order is a seeded, bijective permutation of the word indexes computed on demand (a small
+Feistel network, with cycle-walking to map it onto exactly `range(size)`), so no shuffled
+array is ever materialized, even for pools of millions of words. The whole state of a bag
+is its seed and its cursor, which makes it cheap to keep in the client storage.
+
+Classes:
+    FeistelPermutation: A seeded bijection of `range(size)` computed index by index.
+    ShuffleBag: Serves the indexes `0..size-1` in a random order without repeats.
+"""
+
+import random
+
+ROUNDS = 4  # Liczba rund sieci Feistela
+MASK64 = (1 << 64) - 1
+SEED_BITS = 53  # Ziarno mieści się dokładnie w liczbie JavaScriptu, gdyby stan czytał klient
+
+def _mix(value):
+    # Funkcja rundy: finalizator SplitMix64, każdy bit wyniku zależy od wszystkich bitów wejścia
+    value = (value + 0x9E3779B97F4A7C15) & MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+class FeistelPermutation:
+    """
+    A seeded bijection of `range(size)` computed index by index.
+
+    The indexes are permuted by a balanced Feistel network over the smallest domain of an even
+    number of bits holding `size` values. Values falling outside `range(size)` are permuted
+    again (cycle-walking) until they land inside; as the domain is less than four times larger
+    than `size`, this takes a few steps at most on average.
+
+    Attributes:
+        size (int): The number of permuted indexes.
+        seed (int): The seed of the permutation.
+
+    Methods:
+        __getitem__(index): Returns the image of an index.
+    """
+
+    __slots__ = ("size", "seed", "_half_bits", "_half_mask", "_keys")
+
+    def __init__(self, size, seed):
+        """
+        Initializes the FeistelPermutation instance.
+
+        Args:
+            size (int): The number of permuted indexes.
+            seed (int): The seed of the permutation.
+        """
+        self.size = size
+        self.seed = seed
+        bits = max(2, (size - 1).bit_length())
+        self._half_bits = (bits + 1) // 2
+        self._half_mask = (1 << self._half_bits) - 1
+        rng = random.Random(seed)
+        self._keys = tuple(rng.getrandbits(64) for _ in range(ROUNDS))
+
+    def _encrypt(self, value):
+        # Jedna runda: (L, R) -> (R, L ^ F(R, klucz))
+        half_bits, half_mask = self._half_bits, self._half_mask
+        left, right = value >> half_bits, value & half_mask
+        for key in self._keys:
+            left, right = right, left ^ (_mix(right ^ key) & half_mask)
+        return (left << half_bits) | right
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError("Indeks poza zakresem permutacji")
+        value = self._encrypt(index)
+        while value >= self.size:
+            value = self._encrypt(value)  # Wartości spoza zakresu permutujemy dalej (cycle-walking)
+        return value
+
+    def __len__(self):
+        return self.size
+
+
+class ShuffleBag:
+    """
+    Serves the indexes `0..size-1` in a random order without repeats. When all indexes
+    have been served, a new round starts with a new seed derived from the previous one.
+
+    Attributes:
+        key (str): Identifies what the indexes refer to (e.g. a pool and a difficulty level).
+        size (int): The number of indexes.
+        seed (int): The seed of the current round.
+        cursor (int): The number of indexes served in the current round.
+
+    Methods:
+        draw(): Returns the next index.
+        remaining(): Returns the number of indexes left in the current round.
+        snapshot(): Returns the state of the bag as a JSON-serializable dictionary.
+        restore(snapshot, key, size): Recreates a bag from a snapshot.
+    """
+
+    __slots__ = ("key", "size", "cursor", "_permutation")
+
+    def __init__(self, key, size, seed=None, cursor=0):
+        """
+        Initializes the ShuffleBag instance.
+
+        Args:
+            key (str): Identifies what the indexes refer to.
+            size (int): The number of indexes.
+            seed (int, optional): The seed of the order. Default is a random seed.
+            cursor (int, optional): The number of indexes already served. Default is 0.
+
+        Raises:
+            Exception: If the bag is empty.
+        """
+        if size <= 0:
+            raise Exception("Nie można losować z pustej puli")
+        self.key = key
+        self.size = size
+        self.cursor = cursor
+        self._permutation = FeistelPermutation(size, seed if seed is not None else random.getrandbits(SEED_BITS))
+
+    @property
+    def seed(self):
+        """int: The seed of the current round."""
+        return self._permutation.seed
+
+    def draw(self):
+        """
+        Returns the next index of the random order.
+
+        Returns:
+            int: An index from `range(size)` not served yet in the current round.
+        """
+        if self.cursor >= self.size:
+            # Wszystkie indeksy wydane: nowa runda z nowym ziarnem wyprowadzonym z poprzedniego
+            self._permutation = FeistelPermutation(self.size, random.Random(self.seed).getrandbits(SEED_BITS))
+            self.cursor = 0
+        index = self._permutation[self.cursor]
+        self.cursor += 1
+        return index
+
+    def remaining(self):
+        """
+        Returns the number of indexes left in the current round.
+
+        Returns:
+            int: The number of indexes not served yet.
+        """
+        return self.size - self.cursor
+
+    def snapshot(self):
+        """
+        Returns the state of the bag as a JSON-serializable dictionary (key, seed and cursor).
+
+        Returns:
+            dict: The snapshot of the bag.
+        """
+        return {"k": self.key, "s": self.seed, "c": self.cursor}
+
+    @classmethod
+    def restore(cls, snapshot, key, size):
+        """
+        Recreates a bag from a snapshot, if the snapshot belongs to the same key.
+
+        Args:
+            snapshot (dict): A snapshot returned by `snapshot`, or None.
+            key (str): The key the bag must have.
+            size (int): The number of indexes.
+
+        Returns:
+            ShuffleBag: The restored bag, or a new one if the snapshot does not match.
+        """
+        if snapshot is not None and snapshot.get("k") == key and 0 <= snapshot.get("c", -1) <= size:
+            return cls(key, size, snapshot["s"], snapshot["c"])
+        return cls(key, size)
+
+    def __repr__(self):
+        return f"ShuffleBag({self.key!r}, {self.cursor}/{self.size})"
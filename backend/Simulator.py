@@ -0,0 +1,162 @@
+"""
+Simulator.py
+
+This module plays large numbers of headless games against a word pool and reports
+how fast they run and how often they are won. It is used to tune the default
+`max_mistakes` for a given word list.
+
+Games are split between worker processes. Each worker loads the pool itself, so
+compiled pool files (see `backend.PoolFile`) are memory-mapped and shared between
+the workers instead of being copied.
+
+Functions:
+    letter_order(pool):
+        Returns the letters of a pool ordered by the number of words containing them.
+
+    random_strategy(letters, rng):
+        Creates a strategy guessing the pool's letters in random order.
+
+    frequency_strategy(letters, rng):
+        Creates a strategy guessing the most common letters first.
+
+    simulate(path, games, strategy="frequency", max_mistakes=7, workers=None, seed=None):
+        Plays `games` games in a process pool and returns the statistics.
+
+Usage:
+    python -m backend.Simulator words.pool --games 1000000 --max-mistakes 5 7 9
+"""
+
+import argparse
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from backend.Engine import start_game, play
+from backend.PoolFile import load_words
+
+def letter_order(pool):
+    """
+    Returns the letters of a pool ordered by the number of words containing them.
+
+    Args:
+        pool (WordPool): The word pool.
+
+    Returns:
+        list: The letters, most common first.
+    """
+    counts = Counter()
+    for word in pool:
+        counts.update(set(word.lower()))
+    return [letter for letter, _ in counts.most_common() if letter.isalpha()]
+
+def random_strategy(letters, rng):
+    """
+    Creates a strategy guessing the pool's letters in random order.
+
+    Args:
+        letters (list): The letters of the pool.
+        rng (random.Random): The source of randomness.
+
+    Returns:
+        callable: The strategy, called with a GameState, returning the next letter.
+    """
+    def strategy(state):
+        remaining = [letter for letter in letters if letter not in state.guessed]
+        return rng.choice(remaining) if remaining else None
+    return strategy
+
+def frequency_strategy(letters, rng):
+    """
+    Creates a strategy guessing the most common letters of the pool first.
+
+    Args:
+        letters (list): The letters of the pool, most common first.
+        rng (random.Random): The source of randomness (unused).
+
+    Returns:
+        callable: The strategy, called with a GameState, returning the next letter.
+    """
+    def strategy(state):
+        for letter in letters:
+            if letter not in state.guessed:
+                return letter
+        return None
+    return strategy
+
+# Dostępne strategie: nazwa -> funkcja tworząca strategię z listy liter i generatora losowego
+STRATEGIES = {
+    "random": random_strategy,
+    "frequency": frequency_strategy,
+}
+
+def _play_batch(path, games, strategy, max_mistakes, letters, seed):
+    # Rozgrywa część gier w procesie roboczym i zwraca (gry, wygrane, suma pomyłek)
+    pool = load_words(path)
+    rng = random.Random(seed)
+    guess = STRATEGIES[strategy](letters, rng)
+    wins = mistakes = 0
+    for _ in range(games):
+        state = play(start_game(pool, max_mistakes, rng), guess)
+        wins += state.is_won()
+        mistakes += state.mistakes
+    return games, wins, mistakes
+
+def simulate(path, games, strategy="frequency", max_mistakes=7, workers=None, seed=None):
+    """
+    Plays games against a word pool in a process pool and returns the statistics.
+
+    Args:
+        path (str): The path of a word list or a compiled pool file.
+        games (int): The number of games to play.
+        strategy (str, optional): The name of a strategy from STRATEGIES. Default is "frequency".
+        max_mistakes (int, optional): The maximum number of allowed mistakes. Default is 7.
+        workers (int, optional): The number of worker processes. Default is the number of CPUs.
+        seed (int, optional): The seed making the simulation repeatable. Default is None.
+
+    Returns:
+        dict: The number of games, wins, win rate, average mistakes, duration and games per second.
+    """
+    workers = workers or os.cpu_count() or 1
+    letters = letter_order(load_words(path))  # Kolejność liter liczymy raz, a nie w każdym procesie
+    seeds = random.Random(seed)
+    batches = [games // workers + (1 if i < games % workers else 0) for i in range(workers)]
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_play_batch, path, batch, strategy, max_mistakes, letters, seeds.getrandbits(64))
+            for batch in batches if batch
+        ]
+        results = [future.result() for future in futures]
+    duration = time.perf_counter() - started
+
+    played = sum(result[0] for result in results)
+    wins = sum(result[1] for result in results)
+    mistakes = sum(result[2] for result in results)
+    return {
+        "games": played,
+        "wins": wins,
+        "win_rate": wins / played if played else 0.0,
+        "avg_mistakes": mistakes / played if played else 0.0,
+        "seconds": duration,
+        "games_per_second": played / duration if duration else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Symulacja wielu gier w wisielca bez interfejsu")
+    parser.add_argument("path", help="lista słówek lub skompilowana pula")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="frequency")
+    parser.add_argument("--max-mistakes", type=int, nargs="+", default=[7])
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    for limit in args.max_mistakes:
+        stats = simulate(args.path, args.games, args.strategy, limit, args.workers, args.seed)
+        print(
+            f"max_mistakes={limit}: {stats['games']} gier, wygrane {stats['win_rate']:.1%}, "
+            f"średnio {stats['avg_mistakes']:.2f} pomyłek, {stats['games_per_second']:.0f} gier/s"
+        )
@@ -3,7 +3,17 @@ snack.py
 
 This module provides a utility function to display snack bars (temporary notifications) on the page.
 
+Every page gets a single SnackManager, which owns one reusable snack bar in the page overlay.
+Messages arriving while a snack bar is visible are queued, and repeated messages are merged,
+so the overlay and the size of page updates stay constant over arbitrarily long sessions.
+
+Classes:
+    SnackManager: Shows snack bars on a page using a single, reused `ft.SnackBar`.
+
 Functions:
+    get_snack_manager(page):
+        Returns the SnackManager of the page, creating it on first use.
+
     add_snack(page=None, color=ft.Colors.INDIGO_ACCENT_100, content=None, duration=1500, font_color=ft.Colors.BLACK):
         Displays a snack bar on the page with the specified properties.
 
@@ -11,7 +21,147 @@ Usage:
     Import this module and call the `add_snack` function to show a snack bar notification on the page.
 """
 
+import threading
+import time
+from collections import deque
 import flet as ft
+from backend.Updates import get_scheduler
+
+CLOSE_DELAY = 0.3  # Czas (w sekundach) na animację zamknięcia snack bara przed pokazaniem kolejnego
+MAX_PENDING = 5  # Maksymalna liczba komunikatów czekających w kolejce
+
+class SnackManager:
+    """
+    Shows snack bars on a page using a single, reused `ft.SnackBar`.
+
+    Attributes:
+        page (ft.Page): The page on which the snack bars are shown.
+        snack_bar (ft.SnackBar): The snack bar reused for every message.
+        pending (deque): Messages waiting until the current snack bar disappears.
+        shown (int): The number of messages shown.
+        coalesced (int): The number of messages merged with an identical visible or queued one.
+        dropped (int): The number of messages dropped because the queue was full.
+
+    Methods:
+        show(content, color, duration, font_color): Shows a message or queues it.
+        stats(): Returns the counters as a dictionary.
+    """
+
+    def __init__(self, page, max_pending=MAX_PENDING):
+        """
+        Initializes the SnackManager instance and adds its snack bar to the page overlay.
+
+        Args:
+            page (ft.Page): The page on which the snack bars are shown.
+            max_pending (int, optional): The maximum number of queued messages. Default is MAX_PENDING.
+        """
+        self.page = page
+        self.snack_bar = ft.SnackBar(content=ft.Text(""))
+        self.page.overlay.append(self.snack_bar)  # Jedyny snack bar w nakładce strony
+        self._attached = False  # Czy nakładka z snack barem trafiła już do klienta
+        self.pending = deque(maxlen=max_pending)
+        self.current = None  # Aktualnie widoczny komunikat
+        self.visible_until = 0.0
+        self.shown = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def show(self, content, color, duration, font_color):
+        """
+        Shows a message, or queues it if another snack bar is still visible.
+
+        Args:
+            content (str): The text content of the snack bar.
+            color (str): The background color of the snack bar.
+            duration (int): The duration (in milliseconds) for which the snack bar will be visible.
+            font_color (str): The color of the text inside the snack bar.
+
+        Returns:
+            None
+        """
+        message = (content, color, duration, font_color)
+        with self._lock:
+            if self.current is not None and time.monotonic() < self.visible_until:
+                # Powtórzone komunikaty (np. "Ta litera została już użyta!") łączymy w jeden
+                if message == self.current or message in self.pending:
+                    self.coalesced += 1
+                    return
+                if len(self.pending) == self.pending.maxlen:
+                    self.dropped += 1  # Najstarszy komunikat wypada z kolejki
+                self.pending.append(message)
+                return
+            self._open(message)
+
+    def _open(self, message):
+        # Pokazanie komunikatu w jedynym snack barze (wywoływane z założoną blokadą)
+        content, color, duration, font_color = message
+        self.snack_bar.content.value = content
+        self.snack_bar.content.color = font_color
+        self.snack_bar.bgcolor = color
+        self.snack_bar.duration = duration
+        self.snack_bar.open = True
+        self.current = message
+        self.visible_until = time.monotonic() + duration / 1000 + CLOSE_DELAY
+        self.shown += 1
+        if self._attached:
+            get_scheduler(self.page).request(self.snack_bar)
+        else:
+            # Za pierwszym razem trzeba wysłać całą nakładkę strony
+            get_scheduler(self.page).request()
+            self._attached = True
+
+        # Po zniknięciu snack bara pokazujemy kolejny komunikat z kolejki
+        self._timer = threading.Timer(duration / 1000 + CLOSE_DELAY, self._schedule_next)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _schedule_next(self):
+        # Wątek timera nie aktualizuje strony sam (paczki aktualizacji są wspólne dla całej strony),
+        # tylko przekazuje pokazanie kolejnego komunikatu do pętli zdarzeń strony
+        try:
+            self.page.run_task(self._next)
+        except RuntimeError:
+            pass  # Sesja została już zamknięta
+
+    async def _next(self):
+        with get_scheduler(self.page).batch():
+            with self._lock:
+                self.current = None
+                self.snack_bar.open = False
+                if self.pending:
+                    self._open(self.pending.popleft())
+
+    def stats(self):
+        """
+        Returns the counters of the manager.
+
+        Returns:
+            dict: The numbers of shown, coalesced, dropped and pending messages.
+        """
+        return {
+            "shown": self.shown,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+            "pending": len(self.pending),
+        }
+
+def get_snack_manager(page):
+    """
+    Returns the SnackManager of the page, creating it on first use.
+
+    Args:
+        page (ft.Page): The page instance.
+
+    Returns:
+        SnackManager: The snack bar manager stored in the page session.
+    """
+    manager = page.session.get("snack_manager")
+    if manager is None:
+        manager = SnackManager(page)
+        page.session.set("snack_manager", manager)
+    return manager
 
 def add_snack(page=None, color=ft.Colors.INDIGO_ACCENT_100, content=None, duration=1500, font_color=ft.Colors.BLACK):
     """
@@ -34,14 +184,5 @@ def add_snack(page=None, color=ft.Colors.INDIGO_ACCENT_100, content=None, durati
     if page is None:
         raise Exception("Nie przekazano page")  # Wyjątek, gdy nie przekazano obiektu `page`
 
-    # Tworzenie snack bara z podanymi ustawieniami
-    snack_bar = ft.SnackBar(
-        content=ft.Text(content, color=font_color),  # Treść i kolor czcionki snack bara
-        bgcolor=color,  # Kolor tła snack bara
-        duration=duration,  # Czas trwania snack bara w milisekundach
-        open=True,  # Ustawienie snack bara jako otwartego
-    )
-    
-    # Dodanie snack bara do nakładki strony
-    page.overlay.append(snack_bar)
-    page.update()  # Aktualizacja widoku strony
+    # Komunikat trafia do jedynego snack bara strony zamiast do nowej kontrolki w nakładce
+    get_snack_manager(page).show(content, color, duration, font_color)
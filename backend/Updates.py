@@ -0,0 +1,231 @@
+"""
+Updates.py
+
+This module defines the UpdateScheduler class, which coalesces page updates so that a single
+user action results in exactly one update sent to the client.
+
+Instead of calling `page.update()` or `control.update()` directly, the code requests an update
+from the scheduler of the page. Requests made inside a batch (an event handler wrapped with
+`batched`) only mark the controls as dirty, and everything is flushed once when the outermost
+batch ends. Requests made outside of any batch are flushed immediately.
+
+Class:
+    UpdateScheduler:
+        - Collects update requests for a page and flushes them in a single update.
+
+Functions:
+    get_scheduler(page):
+        Returns the UpdateScheduler of the page, creating it on first use.
+
+    batched(page, handler):
+        Wraps an event handler so that all updates it requests are flushed once.
+
+    request_focus(page, control):
+        Moves the keyboard focus to a control with the next scheduled update.
+
+    request_scroll(page, control, offset=0):
+        Scrolls a scrollable control to an offset with the next scheduled update.
+
+Usage:
+    Call `get_scheduler(page).request(*controls)` instead of `page.update(*controls)`, and wrap
+    event handlers with `batched(page, handler)`.
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from backend import Metrics
+
+class UpdateScheduler:
+    """
+    Collects update requests for a page and flushes them in a single update.
+
+    Attributes:
+        page (ft.Page): The page being updated.
+        requested (int): The number of update requests.
+        flushed (int): The number of updates actually sent.
+
+    Methods:
+        request(*controls): Marks controls (or the whole page) as needing an update.
+        batch(): Context manager delaying the flush until the outermost batch ends.
+        flush(): Sends the pending update, if any.
+        stats(): Returns the counters as a dictionary.
+    """
+
+    def __init__(self, page):
+        """
+        Initializes the UpdateScheduler instance.
+
+        Args:
+            page (ft.Page): The page being updated.
+        """
+        self.page = page
+        self.requested = 0
+        self.flushed = 0
+        self._dirty = {}  # id kontrolki -> kontrolka do aktualizacji
+        self._full = False  # Czy trzeba zaktualizować całą stronę
+        self._lock = threading.Lock()
+        self._local = threading.local()  # Głębokość zagnieżdżenia batchy w danym wątku
+
+    def request(self, *controls):
+        """
+        Marks controls as needing an update. Without arguments the whole page is marked.
+
+        Args:
+            *controls (ft.Control): The controls to update.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            self.requested += 1
+            if not controls:
+                self._full = True
+                self._dirty.clear()
+            elif not self._full:
+                for control in controls:
+                    self._dirty[id(control)] = control
+        if getattr(self._local, "depth", 0) == 0:
+            self.flush()
+
+    @contextmanager
+    def batch(self):
+        """
+        Delays flushing the requested updates until the outermost batch ends.
+
+        Yields:
+            UpdateScheduler: The scheduler itself.
+        """
+        self._local.depth = getattr(self._local, "depth", 0) + 1
+        try:
+            yield self
+        finally:
+            self._local.depth -= 1
+            if self._local.depth == 0:
+                self.flush()
+
+    def flush(self):
+        """
+        Sends the pending update, if any, in a single call.
+
+        Returns:
+            None
+        """
+        with self._lock:
+            full, controls = self._full, list(self._dirty.values())
+            self._full = False
+            self._dirty.clear()
+            if not full and not controls:
+                return
+            self.flushed += 1
+        if Metrics.enabled():
+            self._record(full, controls)
+        if full:
+            self.page.update()
+        else:
+            self.page.update(*controls)
+
+    def _record(self, full, controls):
+        # Instrumentacja: liczba aktualizacji i szacowany rozmiar (liczba wysyłanych kontrolek)
+        page = self.page
+        if full:
+            controls = list(page.controls) + list(page.overlay)
+        Metrics.increment("page_updates")
+        Metrics.increment("page_updates_full" if full else "page_updates_partial")
+        Metrics.observe("update_payload_controls", Metrics.count_controls(*controls))
+        Metrics.gauge("overlay_length", len(page.overlay))
+
+    def stats(self):
+        """
+        Returns the counters of the scheduler.
+
+        Returns:
+            dict: The numbers of requested, flushed and coalesced updates.
+        """
+        return {
+            "requested": self.requested,
+            "flushed": self.flushed,
+            "coalesced": self.requested - self.flushed,
+        }
+
+def get_scheduler(page):
+    """
+    Returns the UpdateScheduler of the page, creating it on first use.
+
+    Args:
+        page (ft.Page): The page instance.
+
+    Returns:
+        UpdateScheduler: The scheduler stored in the page session.
+    """
+    scheduler = page.session.get("update_scheduler")
+    if scheduler is None:
+        scheduler = UpdateScheduler(page)
+        page.session.set("update_scheduler", scheduler)
+    return scheduler
+
+def batched(page, handler):
+    """
+    Wraps an event handler so that all updates it requests are flushed once at the end.
+    Coroutine handlers are supported, but they should not await long-running work inside
+    the batch, as updates requested meanwhile on the event loop thread would wait for it.
+
+    Args:
+        page (ft.Page): The page instance.
+        handler (callable): The event handler to wrap.
+
+    Returns:
+        callable: The wrapped handler.
+    """
+    if asyncio.iscoroutinefunction(handler):
+        async def async_wrapper(*args, **kwargs):
+            with get_scheduler(page).batch():
+                return await handler(*args, **kwargs)
+        return async_wrapper
+
+    def wrapper(*args, **kwargs):
+        with get_scheduler(page).batch():
+            return handler(*args, **kwargs)
+    return wrapper
+
+def request_focus(page, control):
+    """
+    Moves the keyboard focus to a control with the next scheduled update. `control.focus()`
+    cannot be used inside a batch, as it sends its own update right away.
+
+    Args:
+        page (ft.Page): The page instance.
+        control (ft.Control): The control to focus (e.g. a TextField).
+
+    Returns:
+        None
+    """
+    # Flet 0.25: focus() ustawia atrybut "focus" i od razu wywołuje update(); ustawiamy tylko atrybut
+    set_attr = getattr(control, "_set_attr_json", None)
+    if callable(set_attr):
+        set_attr("focus", str(time.time()))
+    get_scheduler(page).request(control)
+
+def request_scroll(page, control, offset=0):
+    """
+    Scrolls a scrollable control (e.g. a ListView) to an offset with the next scheduled update.
+    `control.scroll_to()` cannot be used inside a batch, as it sends its own update right away.
+
+    Args:
+        page (ft.Page): The page instance.
+        control (ft.Control): The scrollable control.
+        offset (float, optional): The scroll offset in pixels. Default is 0 (the top).
+
+    Returns:
+        None
+    """
+    # Flet 0.25: scroll_to() ustawia atrybut "method" i od razu wywołuje update(); ustawiamy tylko atrybut
+    set_attr = getattr(control, "_set_attr_json", None)
+    if callable(set_attr):
+        set_attr("method", {
+            "n": "scroll_to",
+            "i": str(time.time()),
+            "p": {"offset": offset, "delta": None, "key": None, "duration": None, "curve": None},
+        })
+    get_scheduler(page).request(control)
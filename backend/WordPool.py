@@ -0,0 +1,239 @@
+"""
+WordPool.py
+
+This module defines the WordPool class, a compact and deduplicated container for the words
+used in the game. Instead of keeping a Python list of `str` objects, all words are stored
+in a single contiguous UTF-8 buffer with an `array('I')` table of offsets into it.
+
+Class:
+    WordPool:
+        - Stores unique words in one buffer and exposes them like a read-only sequence.
+
+Functions:
+    iter_words(file, chunk_size=CHUNK_SIZE, on_progress=None):
+        Streams words from a file in fixed-size chunks.
+
+Usage:
+    Build a pool with `WordPool(words)` (or `add` words one by one), call `freeze` once
+    loading is finished and store the pool in the session in place of a list of words.
+"""
+
+import codecs
+import re
+from array import array
+from backend.Normalize import normalize_text
+
+CHUNK_SIZE = 1024 * 1024  # Rozmiar porcji czytanej z pliku (1 MiB)
+SEPARATORS = re.compile(r"[,\n]")  # Słówka rozdzielone przecinkami lub nowymi liniami
+
+def iter_words(file, chunk_size=CHUNK_SIZE, on_progress=None):
+    """
+    Streams words from a binary file object, reading it in fixed-size chunks.
+
+    Words may be separated by commas or new lines. A word cut in half by a chunk
+    boundary is carried over and completed with the next chunk, so the whole file
+    is never held in memory at once. Every chunk is normalized to NFC and case-folded
+    (see `normalize_text`), so the words of a pool are normalized once, at load time.
+
+    Args:
+        file (BinaryIO): The file opened in binary mode.
+        chunk_size (int, optional): The number of bytes read at once. Default is CHUNK_SIZE.
+        on_progress (callable, optional): Called with the total number of bytes read so far
+                                          after every chunk. Default is None.
+
+    Yields:
+        str: The next non-empty, stripped and normalized word.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    remainder = ""
+    bytes_read = 0
+    while True:
+        chunk = file.read(chunk_size)
+        final = not chunk
+        bytes_read += len(chunk)
+        # Dekoder przechowuje niepełne znaki wielobajtowe (np. "ą") do kolejnej porcji
+        # Normalizujemy całą porcję naraz; niedokończone słówko z poprzedniej porcji łączy się
+        # tu ze swoimi znakami łączącymi (np. "a" + ogonek), więc wynik jest taki sam jak dla całego pliku
+        text = normalize_text(remainder + decoder.decode(chunk, final=final))
+        tokens = SEPARATORS.split(text)
+        # Ostatni fragment może być ucięty na granicy porcji, więc zostawiamy go na później
+        remainder = "" if final else tokens.pop()
+        for token in tokens:
+            token = token.strip()
+            if token:
+                yield token
+        if final:
+            return
+        if on_progress is not None:
+            on_progress(bytes_read)
+
+
+class WordPool:
+    """
+    A compact, deduplicated, read-only sequence of words.
+
+    Word `i` is stored in `buffer[offsets[i]:offsets[i + 1]]` as UTF-8. Duplicates are
+    detected while the pool is being built and skipped.
+
+    Attributes:
+        duplicates (int): The number of duplicated words skipped while building the pool.
+        metadata (bytes): One byte of metadata per word (the difficulty score, see
+                          `backend.Difficulty`), or None if not computed yet.
+        sources (list): For pools merged from several files, a report of every file
+                        (see `backend.Ingest`), otherwise None.
+
+    Methods:
+        add(word): Adds a word to the pool unless it is already there.
+        extend(pool): Adds all words of another pool that are not in this one yet.
+        freeze(): Finishes building the pool and releases the deduplication index.
+        without(indexes): Returns a copy of the pool without some of its words.
+    """
+
+    def __init__(self, words=()):
+        """
+        Initializes the WordPool instance.
+
+        Args:
+            words (iterable, optional): The words to add to the pool. Default is an empty tuple.
+        """
+        self._buffer = bytearray()  # Wszystkie słówka zapisane jedno za drugim w UTF-8
+        self._offsets = array('I', [0])  # Początek każdego słówka w buforze (+ koniec ostatniego)
+        self._lookup = {}  # hash słówka -> indeks (lub lista indeksów przy kolizji), tylko podczas budowania
+        self.duplicates = 0
+        self.metadata = None
+        self.sources = None
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        """
+        Adds a word to the pool unless it is already there.
+
+        Args:
+            word (str): The word to add.
+
+        Raises:
+            Exception: If the pool has already been frozen.
+
+        Returns:
+            bool: True if the word was added, False if it was a duplicate.
+        """
+        return self._add_bytes(word.encode('utf-8'))
+
+    def extend(self, pool):
+        """
+        Adds all words of another pool that are not in this one yet. Words are copied
+        as raw UTF-8 bytes, without decoding them.
+
+        Args:
+            pool (WordPool): The pool whose words are added.
+
+        Raises:
+            Exception: If this pool has already been frozen.
+
+        Returns:
+            int: The number of words added.
+        """
+        before = len(self)
+        for index in range(len(pool)):
+            self._add_bytes(bytes(pool._raw(index)))
+        return len(self) - before
+
+    def _add_bytes(self, data):
+        # Dodaje słówko zapisane w UTF-8, pomijając powtórzenia
+        if self._lookup is None:
+            raise Exception("Pula słówek jest już zamknięta")
+
+        key = hash(data)
+        found = self._lookup.get(key)
+        if found is not None:
+            # Ten sam hash nie musi oznaczać tego samego słówka, więc porównujemy bajty
+            candidates = found if isinstance(found, list) else (found,)
+            for index in candidates:
+                if self._raw(index) == data:
+                    self.duplicates += 1
+                    return False
+
+        index = len(self)
+        self._buffer += data
+        self._offsets.append(len(self._buffer))
+
+        if found is None:
+            self._lookup[key] = index
+        elif isinstance(found, list):
+            found.append(index)
+        else:
+            self._lookup[key] = [found, index]
+        return True
+
+    def freeze(self):
+        """
+        Finishes building the pool. The deduplication index is released, so only
+        the buffer and the offsets table stay in memory.
+
+        Returns:
+            WordPool: The pool itself, for chaining.
+        """
+        self._lookup = None
+        return self
+
+    def without(self, indexes):
+        """
+        Returns a frozen copy of the pool without the words at the given indexes. The words
+        between the removed ones are copied as whole runs of raw bytes, and their metadata
+        (difficulty scores) is kept.
+
+        Args:
+            indexes (iterable): The indexes of the words to leave out.
+
+        Returns:
+            WordPool: The new pool.
+        """
+        removed = sorted(set(indexes))
+        pool = WordPool()
+        metadata = bytearray() if self.metadata is not None else None
+        start = 0
+        for stop in removed + [len(self)]:
+            if start < stop:
+                # Kopiujemy naraz cały ciąg słówek między usuniętymi
+                blob, offsets_bytes = self._chunk(start, stop)
+                offsets = array('I')
+                offsets.frombytes(offsets_bytes)
+                shift = len(pool._buffer) - offsets[0]
+                pool._buffer += blob
+                pool._offsets.extend(offset + shift for offset in offsets[1:])
+                if metadata is not None:
+                    metadata += self.metadata[start:stop]
+            start = stop + 1
+        pool.metadata = bytes(metadata) if metadata is not None else None
+        pool.sources = self.sources
+        return pool.freeze()
+
+    def _raw(self, index):
+        # Surowe bajty słówka o podanym indeksie
+        return self._buffer[self._offsets[index]:self._offsets[index + 1]]
+
+    def _blob(self):
+        # Bufor ze wszystkimi słówkami i położenie w nim pierwszego słówka
+        return self._buffer, 0
+
+    def _chunk(self, start, stop):
+        # Bajty słówek [start, stop) i ich przesunięcia, do przekazania innemu procesowi
+        return bytes(self._buffer[self._offsets[start]:self._offsets[stop]]), self._offsets[start:stop + 1].tobytes()
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Indeks poza zakresem puli słówek")
+        return self._raw(index).decode('utf-8')
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self._raw(index).decode('utf-8')
+
+    def __repr__(self):
+        return f"WordPool({len(self)} words)"
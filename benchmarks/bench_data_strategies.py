@@ -0,0 +1,63 @@
+"""
+bench_data_strategies.py
+
+This benchmark compares the per-navigation cost of the router's data strategies when
+a game state is passed from one route to another. QUERY has to encode the state into
+the URL and decode it in the target view, while ROUTER_DATA and STATE pass the object
+itself by reference.
+
+Usage:
+    python -m benchmarks.bench_data_strategies [--navigations 20000]
+"""
+
+import argparse
+import json
+import time
+import flet as ft
+from Router import Router, DataStrategyEnum
+from backend.GameState import GameState
+from benchmarks.fake_page import FakePage
+
+def _target_view(router, page):
+    # Widok docelowy odczytuje przekazany stan gry
+    state = router.get_data(page, "game")
+    if isinstance(state, str):
+        state = GameState.restore(json.loads(state))  # QUERY: stan przychodzi jako tekst
+    return ft.Text(" ".join(state.pattern()))
+
+def measure(strategy, navigations):
+    """
+    Measures the average cost of one navigation passing a game state.
+
+    Args:
+        strategy (DataStrategyEnum): The data strategy of the router.
+        navigations (int): The number of navigations.
+
+    Returns:
+        float: The average time of one navigation, in microseconds.
+    """
+    page = FakePage()
+    router = Router(strategy)
+    router.routes = {"/play": _target_view}
+    page.on_route_change = lambda route: router.route_change(route, page)
+
+    state = GameState("konstantynopolitańczykowianeczka", 7)
+    for letter in "kota":
+        state.guess(letter)
+
+    started = time.perf_counter()
+    for _ in range(navigations):
+        if strategy == DataStrategyEnum.QUERY:
+            router.go(page, "/play", game=json.dumps(state.snapshot()))
+        else:
+            router.go(page, "/play", game=state)
+    return (time.perf_counter() - started) / navigations * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Koszt nawigacji dla strategii przekazywania danych")
+    parser.add_argument("--navigations", type=int, default=20000)
+    args = parser.parse_args()
+
+    for strategy in DataStrategyEnum:
+        print(f"{strategy.name:15} {measure(strategy, args.navigations):8.1f} µs / nawigacja")
@@ -0,0 +1,367 @@
+"""
+bench_suite.py
+
+This suite measures the hot paths of the app on a FakePage, without a Flet client:
+loading generated word lists with `read_file`, drawing words with `random_word`,
+guessing with `guess_letter`, building the sorted index of the pool browser,
+paging through the browser on a large pool (checking that the number of rows stays
+bounded), releasing an indexed pool (checking that its cached indexes are freed with it, and that
+a released memory-mapped pool stays readable while still in use),
+navigating with `Router.route_change` and building each view. Background tasks started
+by a view (such as the index of the pool browser) are run before the view is measured,
+so every route is measured in its ready state rather than its placeholder. Every benchmark records the time per call and the memory allocated
+(peak and retained, measured with tracemalloc in a separate run, so the tracing
+does not distort the timings). The results can be written as JSON and compared
+with an earlier run.
+
+Functions:
+    generate_word_list(count, seed):
+        Returns the path of a generated word list, creating it on first use.
+
+    measure(name, func, number, repeat):
+        Measures the time and allocations of a function.
+
+    run(sizes, repeat):
+        Runs all benchmarks and returns their results.
+
+    compare(results, baseline):
+        Prints the change of every benchmark against an earlier run.
+
+Usage:
+    python -m benchmarks.bench_suite [--sizes 1000 1000000] [--repeat 5]
+                                     [--output results.json] [--compare baseline.json]
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import weakref
+from datetime import datetime, timezone
+from backend.GameState import GameState
+from backend.Game import random_word, guess_letter
+from backend.History import ENV_VAR as HISTORY_ENV_VAR
+from backend.PoolRegistry import release_session_pool, session_pool
+from backend import Difficulty, PoolIndex
+from backend.PoolIndex import PAGE_SIZE, SortedIndex, get_sorted_index, is_indexed
+from backend.PoolFile import compile_pool, load_words
+from backend.Difficulty import get_difficulty_index
+from backend.Updates import batched
+from backend.Settings import read_file
+from routes import create_router
+from Router import DataStrategyEnum
+from benchmarks.fake_page import FakePage, FakeRouteEvent
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+ALPHABET = "aąbcćdeęfghijklłmnńoóprsśtuwyzźż"  # Polskie litery, żeby sprawdzać też dekodowanie UTF-8
+GAME_POOL_SIZE = 100_000  # Wielkość puli, na której mierzymy losowanie i zgadywanie
+GUESS_WORD = "konstantynopolitańczykowianeczka"
+BROWSER_POOL_SIZE = 1_000_000  # Wielkość puli, na której przeglądamy kolejne strony przeglądarki puli
+BROWSE_PAGES = 100  # Liczba stron przeglądanych w jednym pomiarze
+GUESSES = "kaxoqnvtwmy"  # Trafienia i pudła, które nie kończą gry przy limicie 26 pomyłek
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "wisielec-bench")
+
+# Widoki i gry z benchmarków nie trafiają do historii gracza
+os.environ.setdefault(HISTORY_ENV_VAR, ":memory:")
+
+def generate_word_list(count, seed=0):
+    """
+    Returns the path of a generated word list, creating it on first use. The lists are
+    kept in the temporary directory, so later runs do not generate them again.
+
+    Args:
+        count (int): The number of words.
+        seed (int, optional): The seed of the generator. Default is 0.
+
+    Returns:
+        str: The path of the word list (one word per line).
+    """
+    path = os.path.join(CACHE_DIR, f"words-{count}-{seed}.txt")
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    rng = random.Random(seed)
+    temporary = path + ".part"
+    with open(temporary, "w", encoding="utf-8") as file:
+        for start in range(0, count, 100_000):
+            words = ("".join(rng.choices(ALPHABET, k=rng.randint(4, 12))) for _ in range(min(100_000, count - start)))
+            file.write("\n".join(words))
+            file.write("\n")
+    os.replace(temporary, path)
+    return path
+
+def measure(name, func, number=1, repeat=5, setup=None):
+    """
+    Measures the time and allocations of a function.
+
+    The function is first timed `repeat` times, `number` calls each, and then called
+    `number` more times under tracemalloc to measure the memory it allocates.
+
+    Args:
+        name (str): The name of the benchmark.
+        func (callable): The measured function, called without arguments.
+        number (int, optional): The number of calls per measurement. Default is 1.
+        repeat (int, optional): The number of timed measurements. Default is 5.
+        setup (callable, optional): Called before every measurement, outside the timing.
+
+    Returns:
+        dict: The name, the best and mean time per call (µs) and the peak and retained
+              allocations per measurement (bytes).
+    """
+    times = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - started) / number)
+
+    if setup is not None:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for _ in range(number):
+        func()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "name": name,
+        "number": number,
+        "repeat": repeat,
+        "best_us": min(times) * 1e6,
+        "mean_us": sum(times) / len(times) * 1e6,
+        "peak_bytes": peak - before,
+        "retained_bytes": current - before,
+    }
+
+def _session(max_mistakes=26):
+    # Strona z routerem, tak jak w main(), ale bez klienta Fleta
+    page = FakePage()
+    router = create_router(DataStrategyEnum.CLIENT_STORAGE)
+    page.router = router
+    page.on_route_change = lambda route: router.route_change(route, page)
+    page.session.set("max_mistakes", max_mistakes)
+    page.add(router.body)
+    return page, router
+
+def _bench_read_file(sizes, repeat):
+    results = []
+    for size in sizes:
+        path = generate_word_list(size)
+        page, router = _session()
+
+        def load():
+            read_file(page, path, router)
+            release_session_pool(page)  # Ostatnie odwołanie usuwa pulę z rejestru, więc każde wczytanie jest pełne
+
+        results.append(measure(f"read_file[{size}]", load, repeat=repeat if size < 1_000_000 else 1))
+    return results
+
+def _bench_game(repeat):
+    page, router = _session()
+    read_file(page, generate_word_list(GAME_POOL_SIZE), router)
+    results = [measure("random_word", lambda: random_word(page), number=10_000, repeat=repeat)]
+
+    # Kontrolki widoku gry, jak po wejściu na /play
+    page.go("/play")
+    view = router.body.content
+    word_display, used_trials, gallows, letter_input = view.controls[0], view.controls[1], view.controls[2], view.controls[-1]
+
+    guess = batched(page, guess_letter)  # Jak w widoku gry: jedno zdarzenie, jedna aktualizacja
+
+    def play():
+        state = GameState(GUESS_WORD, 26)
+        page.session.set("game_state", state)
+        gallows.shapes.clear()  # Rysunek od zera, jak w nowej grze
+        gallows.data = 0
+        for letter in GUESSES:
+            letter_input.value = letter
+            guess(page, router, letter_input, state, word_display, used_trials, gallows)
+
+    result = measure("guess_letter", play, number=200, repeat=repeat)
+    for key in ("best_us", "mean_us"):
+        result[key] /= len(GUESSES)  # Czas jednego zgadnięcia
+
+    # Każde zgadnięcie to dokładnie jedna aktualizacja wysłana do klienta
+    updates = page.updates
+    play()
+    result["updates_per_guess"] = (page.updates - updates) / len(GUESSES)
+    assert result["updates_per_guess"] == 1, f"Zgadnięcie wysyła {result['updates_per_guess']} aktualizacji zamiast jednej"
+    results.append(result)
+    release_session_pool(page)
+    return results
+
+def _bench_routes(repeat):
+    page, router = _session()
+    read_file(page, generate_word_list(GAME_POOL_SIZE), router)
+    routes = list(router.routes)
+
+    # Indeks przeglądarki puli (w aplikacji budowany w tle przy pierwszym wejściu na /pool)
+    pool = session_pool(page)
+    results = [measure(f"pool_index[{len(pool)}]", lambda: SortedIndex(pool), repeat=repeat)]
+
+    # Przejścia między trasami zapamiętywanymi (widok budowany raz) i budowanymi od nowa;
+    # zadania w tle uruchomione przy pierwszym wejściu kończymy przed pomiarem
+    for route in routes:
+        page.go(route)
+        page.run_pending_tasks()
+        results.append(measure(
+            f"route_change[{route}]", lambda route=route: router.route_change(FakeRouteEvent(route), page),
+            number=1000, repeat=repeat, setup=lambda: page.go("/info" if route != "/info" else "/"),
+        ))
+
+    # Same konstruktory widoków (moduły widoków importujemy przez router, jak w aplikacji)
+    for route in routes:
+        view = router._handler(route)
+        results.append(measure(f"view[{view.__name__}]", lambda view=view: view(router, page), number=1000, repeat=repeat))
+
+    release_session_pool(page)
+    return results
+
+def _bench_pool_browser(repeat):
+    page, router = _session()
+    read_file(page, generate_word_list(BROWSER_POOL_SIZE), router)
+
+    # Jak w aplikacji: pierwsze wejście pokazuje postęp, a indeks powstaje w zadaniu w tle
+    page.go("/pool")
+    page.run_pending_tasks()  # Także komunikaty czekające w kolejce snack bara
+    assert is_indexed(session_pool(page)), "Przeglądarka puli nie uruchomiła budowy indeksu w tle"
+    view = router.body.content
+    search_field, mode = view.controls[1].controls
+    words_list = view.controls[3]
+    next_btn = view.controls[4].controls[2]
+    page.update()  # Widok trafia do klienta, więc kolejne strony wysyłają aktualizacje
+
+    results = []
+    for search_mode, text in (("prefix", ""), ("substring", "a")):
+        mode.value, search_field.value = search_mode, text
+        result = measure(
+            f"pool_browser_page[{search_mode},{BROWSER_POOL_SIZE}]", lambda: next_btn.on_click(None),
+            number=BROWSE_PAGES, repeat=repeat, setup=lambda: mode.on_change(None),
+        )
+        # Niezależnie od liczby przejrzanych stron lista ma tylko jedną stronę wierszy
+        result["rows"] = len(words_list.controls)
+        assert result["rows"] == PAGE_SIZE, f"Przeglądarka puli ma {result['rows']} wierszy zamiast {PAGE_SIZE}"
+        # Przejście na kolejną stronę to jedna aktualizacja
+        updates = page.updates
+        next_btn.on_click(None)
+        result["updates_per_page"] = page.updates - updates
+        assert result["updates_per_page"] == 1, f"Przejście na stronę wysyła {result['updates_per_page']} aktualizacji zamiast jednej"
+        results.append(result)
+
+    # Usunięcie zaznaczonego słówka: kliknięcie tylko uruchamia budowę kopii puli w tle
+    pool = session_pool(page)
+    save_btn = view.controls[2].controls[1]
+    result = measure(
+        f"pool_browser_save[{BROWSER_POOL_SIZE}]", lambda: save_btn.on_click(None),
+        repeat=1, setup=lambda: words_list.controls[0].trailing.on_click(None),
+    )
+    assert session_pool(page) is pool, "Kopia puli bez usuniętych słówek powstała w obsłudze kliknięcia"
+    page.run_pending_tasks()
+    assert len(session_pool(page)) == len(pool) - 1, "Pula sesji nie została zastąpiona kopią bez usuniętego słówka"
+    results.append(result)
+
+    release_session_pool(page)
+    return results
+
+def _check_pool_release():
+    # Pula zwolniona przez ostatnią sesję znika z pamięci razem ze swoimi indeksami
+    page, router = _session()
+    read_file(page, generate_word_list(GAME_POOL_SIZE), router)
+    pool = weakref.ref(session_pool(page))
+    get_sorted_index(pool())
+    release_session_pool(page)
+    gc.collect()
+    assert pool() is None, "Zwolniona pula nadal jest w pamięci"
+    assert len(PoolIndex._indexes) == 0, "Indeks zwolnionej puli nadal jest w pamięci podręcznej"
+    assert len(Difficulty._indexes) == 0, "Poziomy trudności zwolnionej puli nadal są w pamięci podręcznej"
+
+    # Zmapowany plik puli: po zwolnieniu przez sesję nadal można czytać pulę, której ktoś używa
+    # (indeks, zadanie w tle, gra), a mapowanie zamyka się dopiero, gdy nikt jej już nie używa
+    path = os.path.join(CACHE_DIR, f"words-{GAME_POOL_SIZE}.pool")
+    if not os.path.exists(path):
+        compile_pool(load_words(generate_word_list(GAME_POOL_SIZE)), path)
+    read_file(page, path, router)
+    mapped = session_pool(page)
+    index = get_sorted_index(mapped)
+    release_session_pool(page)
+    assert mapped[0] and index.prefix_range(mapped, mapped[0]) and get_difficulty_index(mapped), \
+        "Zwolniona pula zmapowana z pliku nie nadaje się do odczytu"
+    mapping = mapped._map
+    del mapped, index
+    gc.collect()
+    assert mapping.closed, "Mapowanie zwolnionej puli nie zostało zamknięte"
+
+def run(sizes=DEFAULT_SIZES, repeat=5):
+    """
+    Runs all benchmarks.
+
+    Args:
+        sizes (iterable, optional): The sizes of the word lists loaded with `read_file`.
+                                    Default is DEFAULT_SIZES.
+        repeat (int, optional): The number of timed measurements. Default is 5.
+
+    Returns:
+        dict: The environment of the run and the results of all benchmarks.
+    """
+    _check_pool_release()
+    results = _bench_read_file(sizes, repeat) + _bench_game(repeat) + _bench_pool_browser(repeat) + _bench_routes(repeat)
+    return {
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+def compare(results, baseline):
+    """
+    Prints the change of every benchmark against an earlier run.
+
+    Args:
+        results (dict): The results of this run.
+        baseline (dict): The results of an earlier run.
+
+    Returns:
+        None
+    """
+    previous = {result["name"]: result for result in baseline["results"]}
+    for result in results["results"]:
+        old = previous.get(result["name"])
+        if old is None:
+            continue
+        change = (result["best_us"] / old["best_us"] - 1) * 100 if old["best_us"] else 0.0
+        print(f"{result['name']:32} {old['best_us']:12.1f} -> {result['best_us']:12.1f} µs ({change:+.1f}%)  "
+              f"pamięć {old['peak_bytes']} -> {result['peak_bytes']} B")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarki aplikacji na zastępczej stronie (FakePage)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="liczby słówek w generowanych listach")
+    parser.add_argument("--repeat", type=int, default=5, help="liczba powtórzeń pomiaru czasu")
+    parser.add_argument("--output", help="plik, do którego zapisać wyniki (JSON)")
+    parser.add_argument("--compare", help="wyniki wcześniejszego uruchomienia (JSON) do porównania")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat)
+    for result in results["results"]:
+        print(f"{result['name']:32} {result['best_us']:12.1f} µs  (średnio {result['mean_us']:.1f} µs)  "
+              f"szczyt pamięci {result['peak_bytes']} B, zostaje {result['retained_bytes']} B")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            compare(results, json.load(file))
@@ -0,0 +1,184 @@
+"""
+fake_page.py
+
+This module defines an in-process stand-in for `ft.Page`, used by the benchmarks to run
+the router, views and backend functions without a Flet client.
+
+Classes:
+    FakeSession: A dictionary-backed replacement for `page.session`.
+    FakeClientStorage: A dictionary-backed replacement for `page.client_storage`.
+    FakeRouteEvent: The event passed to `page.on_route_change`.
+    FakePage: A replacement for `ft.Page` counting updates.
+"""
+
+import asyncio
+
+class FakeSession:
+    """
+    A dictionary-backed replacement for `page.session`. Like Flet's session, `remove`
+    raises KeyError for a missing key.
+    """
+
+    def __init__(self):
+        self._data = {}
+
+    def set(self, key, value):
+        self._data[key] = value
+
+    def get(self, key):
+        return self._data.get(key)
+
+    def contains_key(self, key):
+        return key in self._data
+
+    def remove(self, key):
+        del self._data[key]
+
+    def clear(self):
+        self._data.clear()
+
+
+class FakeClientStorage:
+    """
+    A dictionary-backed replacement for `page.client_storage`, counting writes.
+
+    Attributes:
+        writes (int): The number of `set` calls.
+    """
+
+    def __init__(self):
+        self._data = {}
+        self.writes = 0
+
+    def set(self, key, value):
+        self.writes += 1
+        self._data[key] = value
+
+    def get(self, key):
+        return self._data.get(key)
+
+    def contains_key(self, key):
+        return key in self._data
+
+    def remove(self, key):
+        self._data.pop(key, None)
+
+
+class FakeRouteEvent:
+    """
+    The event passed to `page.on_route_change`.
+
+    Attributes:
+        route (str): The new route.
+    """
+
+    def __init__(self, route):
+        self.route = route
+
+
+class FakePage:
+    """
+    A replacement for `ft.Page` keeping the state the app uses and counting updates.
+
+    Attributes:
+        session (FakeSession): The session storage.
+        client_storage (FakeClientStorage): The client storage.
+        overlay (list): The overlay controls.
+        controls (list): The page controls.
+        route (str): The current route.
+        width (int): The page width.
+        web (bool): Whether the app runs in a browser; always True, as there is no native window.
+        tasks (list): The asyncio tasks of the event handlers and background tasks started inside an event loop.
+        pending_tasks (list): The background tasks (handler and arguments) started outside an event loop,
+                              waiting for `run_pending_tasks`.
+        updates (int): The number of `update` calls.
+        updated_controls (int): The number of controls passed to `update`.
+    """
+
+    def __init__(self, route="/"):
+        self.session = FakeSession()
+        self.client_storage = FakeClientStorage()
+        self.overlay = []
+        self.controls = []
+        self.route = route
+        self.width = 800
+        self.web = True
+        self.on_route_change = None
+        self.on_close = None
+        self.updates = 0
+        self.updated_controls = 0
+        self.tasks = []
+        self.pending_tasks = []
+
+    def go(self, route):
+        # Podobnie jak Flet: zmiana trasy od razu wywołuje obsługę on_route_change
+        self.route = route
+        if self.on_route_change is not None:
+            result = self.on_route_change(FakeRouteEvent(route))
+            if asyncio.iscoroutine(result):
+                self._run(result)
+
+    def _run(self, coroutine):
+        # Asynchroniczne obsługi zdarzeń: w pętli zdarzeń jako zadanie, poza nią od razu
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            asyncio.run(coroutine)
+        else:
+            self.tasks.append(loop.create_task(coroutine))
+
+    def add(self, *controls):
+        self.controls.extend(controls)
+        self.update()
+
+    def update(self, *controls):
+        self.updates += 1
+        self.updated_controls += len(controls)
+        # Jak we Flecie: wysłane kontrolki dostają stronę, więc działa na nich update() i focus()
+        self._attach(controls or self.controls + self.overlay)
+
+    def _attach(self, controls):
+        pending = list(controls)
+        while pending:
+            control = pending.pop()
+            if control is None or not hasattr(control, "page"):
+                continue
+            try:
+                control.page = self
+            except AttributeError:
+                pass
+            pending.extend(getattr(control, "controls", None) or [])
+            pending.append(getattr(control, "content", None))
+
+    def run_task(self, handler, *args):
+        # Jak we Flecie zadanie startuje dopiero po obsłudze zdarzenia: w pętli zdarzeń jako zadanie,
+        # poza nią czeka na run_pending_tasks() (korutynę tworzymy dopiero przy uruchomieniu,
+        # więc zadania, których benchmark nie uruchomi, nie zostawiają nieoczekiwanych korutyn)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.pending_tasks.append((handler, args))
+        else:
+            self.tasks.append(loop.create_task(handler(*args)))
+
+    def run_pending_tasks(self):
+        """
+        Runs the background tasks started outside an event loop, including the ones they start.
+
+        Returns:
+            int: The number of tasks run.
+        """
+        count = 0
+        while self.pending_tasks:
+            handler, args = self.pending_tasks.pop(0)
+            count += asyncio.run(self._drain(handler(*args)))
+        return count
+
+    async def _drain(self, coroutine):
+        # Czekamy też na zadania uruchomione przez to zadanie, zanim asyncio.run zamknie pętlę
+        await coroutine
+        count = 1
+        while self.tasks:
+            await self.tasks.pop(0)
+            count += 1
+        return count
@@ -0,0 +1,138 @@
+"""
+startup.py
+
+This harness measures the cold start of the app in a fresh interpreter: how long the
+imports of `main` take (with the slowest modules, parsed from `python -X importtime`) and
+how long it takes from the start of `import main` until `main` sends its first
+`page.update()` to a FakePage. It exits with status 1 when the time to the first update
+exceeds the budget, so it can guard against startup regressions.
+
+Functions:
+    import_times(top):
+        Returns the total import time of `main` and its slowest imports.
+
+    time_to_first_update():
+        Measures the time from importing `main` in a fresh interpreter to the first page update.
+
+Usage:
+    python -m benchmarks.startup [--budget-ms 1500] [--top 15] [--json]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET_MS = 1500.0  # Dopuszczalny czas do pierwszego page.update()
+
+def _python(*args):
+    # Każdy pomiar w świeżym interpreterze, bez modułów załadowanych wcześniej
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+
+def import_times(top):
+    """
+    Returns the total import time of `main` and its slowest imports.
+
+    Args:
+        top (int): The number of the slowest imports to return.
+
+    Returns:
+        dict: The total time (ms) and a list of the slowest imports with their
+              self and cumulative times (ms).
+    """
+    result = _python("-X", "importtime", "-c", "import main")
+    modules = []
+    for line in result.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        modules.append({
+            "module": name.strip(),
+            "self_ms": int(own) / 1000,
+            "cumulative_ms": int(cumulative) / 1000,
+            "top_level": not name.startswith("  "),
+        })
+
+    total = sum(module["cumulative_ms"] for module in modules if module["top_level"])
+    modules.sort(key=lambda module: module["cumulative_ms"], reverse=True)
+    return {"total_ms": total, "slowest": modules[:top]}
+
+def time_to_first_update():
+    """
+    Measures, in a fresh interpreter, the time from importing `main` to the first page
+    update sent by `main`, and the time `main` itself takes to get there.
+
+    Returns:
+        dict: The times (ms) and the numbers of updates and loaded modules.
+    """
+    result = _python("-m", "benchmarks.startup", "--child")
+    return json.loads(result.stdout)
+
+def _child():
+    # Uruchamiane w świeżym procesie: import main i wywołanie main() na FakePage
+    import asyncio
+    import time
+
+    started = time.perf_counter()
+    import main
+    from benchmarks.fake_page import FakePage
+    imported = time.perf_counter()
+
+    class StartupPage(FakePage):
+        first_update = None
+
+        def update(self, *controls):
+            if self.first_update is None:
+                self.first_update = time.perf_counter()
+            super().update(*controls)
+
+    async def run():
+        page = StartupPage()
+        await main.main(page)
+        await asyncio.gather(*page.tasks)
+        return page
+
+    page = asyncio.run(run())
+    print(json.dumps({
+        "import_ms": (imported - started) * 1000,
+        "main_ms": (page.first_update - imported) * 1000,
+        "first_update_ms": (page.first_update - started) * 1000,
+        "updates": page.updates,
+        "modules": len(sys.modules),
+    }))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Czas uruchamiania aplikacji")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="dopuszczalny czas do pierwszego page.update() (ms)")
+    parser.add_argument("--top", type=int, default=15, help="ile najwolniejszych importów pokazać")
+    parser.add_argument("--json", action="store_true", help="wynik w formacie JSON")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _child()
+        sys.exit(0)
+
+    report = {"imports": import_times(args.top), "startup": time_to_first_update(), "budget_ms": args.budget_ms}
+    over_budget = report["startup"]["first_update_ms"] > args.budget_ms
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Importy main: {report['imports']['total_ms']:.1f} ms")
+        for module in report["imports"]["slowest"]:
+            print(f"  {module['cumulative_ms']:8.1f} ms  {module['module'].strip()}")
+        startup = report["startup"]
+        print(f"Do pierwszego page.update(): {startup['first_update_ms']:.1f} ms "
+              f"(importy {startup['import_ms']:.1f} ms, main {startup['main_ms']:.1f} ms, "
+              f"modułów: {startup['modules']})")
+        print(f"Budżet: {args.budget_ms:.0f} ms - {'PRZEKROCZONY' if over_budget else 'OK'}")
+
+    sys.exit(1 if over_budget else 0)
@@ -5,18 +5,24 @@ This is the entry point of the Flet application. It sets up the application rout
 navigation bar, and initializes the starting page.
 
 Functions:
-    main(page: ft.Page): Sets up the application, including routing and navigation bar, 
+    main(page: ft.Page): (async) Sets up the application, including routing and navigation bar, 
                          and initializes the starting page.
 
 Usage:
-    Run this file to start the Flet application.
+    Run this file to start the Flet application. Importing it does not start the app,
+    so tools such as benchmarks/startup.py can call `main` on their own page.
 """
-import platform
+import sys
+import multiprocessing
 import flet as ft
-from routes import router
+from routes import create_router
+from Router import DataStrategyEnum
 from user_controls.appbar import NavBar
+from backend.Updates import batched
+from backend.PoolRegistry import release_session_pool
+from backend.Persistence import enable_persistence, flush_persistence
 
-def main(page: ft.Page):
+async def main(page: ft.Page):
     """
     Initializes the main application.
 
@@ -28,12 +34,39 @@ def main(page: ft.Page):
         2. Configures route changes and updates the page accordingly.
         3. Sets the starting page and routing logic.
     """
+    # Każda sesja ma własny router (własne widoki, historię i dane)
+    # Strategia CLIENT_STORAGE: ustawienia i gra przetrwają przeładowanie aplikacji
+    router = create_router(DataStrategyEnum.CLIENT_STORAGE)
+
+    # Strategia CLIENT_STORAGE: ustawienia i gra są zapisywane w pamięci klienta
+    if router.data_strategy == DataStrategyEnum.CLIENT_STORAGE:
+        enable_persistence(page)
+
     # Ustawienie początkowego appbara w zależności od trasy
     page.appbar = NavBar(page)  # Musimy przekazać page do NavBar
 
     # Obsługa zmian tras i przekazywanie page do aktualizacji appbara
     # Przekazujemy route do routera, aby mógł zarządzać zmianami
-    page.on_route_change = lambda route: router.route_change(route, page)  
+    # Wszystkie aktualizacje wywołane zmianą trasy są wysyłane jednym page.update()
+    async def on_route_change(route):
+        await router.route_change_async(route, page)
+    page.on_route_change = batched(page, on_route_change)
+
+    # Po zamknięciu sesji zapisujemy zaległe zmiany i oddajemy jej odwołanie do wspólnej puli słówek
+    def on_close(e):
+        flush_persistence(page)
+        release_session_pool(page)
+    page.on_close = on_close
+
+    # W aplikacji desktopowej zapisujemy zaległe zmiany jeszcze przed zamknięciem okna,
+    # póki klient jest połączony (po zamknięciu sesji zapis do pamięci klienta może się nie udać)
+    if not page.web:
+        def on_window_event(e):
+            if e.type == ft.WindowEventType.CLOSE:
+                flush_persistence(page)
+                page.window.destroy()
+        page.window.prevent_close = True
+        page.window.on_event = on_window_event
 
     # Przypisanie routera do page (pozwala na dostęp w AppBarze)
     page.router = router  # Dodajemy router do page, co pozwala na globalny dostęp
@@ -49,15 +82,13 @@ def main(page: ft.Page):
     page.favicon = "assets/logo.png" #Ikona aplikacji
     page.title = "Wisielec" #Tytuł okienka
 
-    system_name = platform.system() #wykrywanie systemu operacyjnego
-    print(system_name)
-
-    if system_name == "Windows":
+    # Ikona okna tylko dla Windowsa (sys.platform nie uruchamia żadnych podprocesów)
+    if sys.platform == "win32":
         page.window_icon = "assets/icons/icon-192.png"
-    elif system_name == "Linux":
-        pass
-    elif system_name == "Darwin":
-        pass 
-# Uruchomienie aplikacji
-# Funkcja ft.app uruchamia główną pętlę aplikacji z targetem main
-ft.app(target=main, assets_dir="assets", icon="assets/icon.png")
+
+if __name__ == "__main__":
+    # Wymagane w aplikacji spakowanej PyInstallerem, bo pula procesów uruchamia ten plik ponownie
+    multiprocessing.freeze_support()
+    # Uruchomienie aplikacji
+    # Funkcja ft.app uruchamia główną pętlę aplikacji z targetem main
+    ft.app(target=main, assets_dir="assets", icon="assets/icon.png")
@@ -6,7 +6,18 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    hiddenimports=[
+        # Widoki są importowane leniwie przez router (routes.py), więc trzeba je wskazać jawnie
+        'views.index_view',
+        'views.info_view',
+        'views.settings_view',
+        'views.play_view',
+        'views.stats_view',
+        'views.pool_view',
+        'views.debug_view',
+        'backend.Hint',
+        'backend.Difficulty',
+    ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
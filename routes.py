@@ -3,35 +3,58 @@ routes.py
 
 This module sets up the application's routing by using the `Router` class from the `Router` module.
 It defines the mapping between URL paths and their corresponding view functions.
+View modules are given as "module:function" strings, so each one is imported only
+when its route is visited for the first time, which keeps the cold start short.
 
 Classes:
     None
 
 Functions:
-    None
+    create_router(data_strategy=DataStrategyEnum.QUERY):
+        Creates a router with all application routes registered.
 
 Attributes:
-    router (Router): An instance of the `Router` class used to manage application routes.
-    routes (dict): A dictionary mapping URL paths to their corresponding view functions.
+    None
 
 Usage:
-    Import this module to access the preconfigured `router` object for routing purposes.
+    Call `create_router()` once per session (page) to get a preconfigured router.
+    The `/debug/metrics` route is added only when WISIELEC_METRICS is set.
 """
 
 from Router import Router, DataStrategyEnum
-# Importy widoków aplikacji
-from views.index_view import IndexView
-from views.info_view import InfoView
-from views.settings_view import SettingView
-from views.play_view import GameView
-
-# Inicjalizacja routera z wybraną strategią zarządzania danymi
-router = Router(DataStrategyEnum.QUERY)
-
-# Rejestracja tras
-router.routes = {
-  "/": IndexView,  # Strona główna
-  "/info": InfoView,  # Strona informacji
-  "/settings": SettingView,  # Strona ustawień
-  "/play": GameView  # Strona gry
-}
+from backend import Metrics
+
+def create_router(data_strategy=DataStrategyEnum.QUERY):
+    """
+    Creates a router with all application routes registered. Every session (page)
+    needs its own router, as the router holds the session's views and history.
+
+    Args:
+        data_strategy (DataStrategyEnum, optional): The strategy used for passing data between
+            routes. QUERY encodes values into the URL; ROUTER_DATA and STATE pass objects by
+            reference; CLIENT_STORAGE passes them like ROUTER_DATA and additionally persists
+            settings and the game. Defaults to DataStrategyEnum.QUERY.
+
+    Returns:
+        Router: The configured router.
+    """
+    # Inicjalizacja routera z wybraną strategią zarządzania danymi
+    router = Router(data_strategy)
+
+    # Rejestracja tras (widoki importowane leniwie, przy pierwszej wizycie)
+    routes = {
+      "/": "views.index_view:IndexView",  # Strona główna
+      "/info": "views.info_view:InfoView",  # Strona informacji
+      "/settings": "views.settings_view:SettingView",  # Strona ustawień
+      "/play": "views.play_view:GameView",  # Strona gry
+      "/stats": "views.stats_view:StatsView",  # Strona statystyk
+      "/pool": "views.pool_view:PoolView"  # Przeglądarka puli słówek
+    }
+    # Strona z pomiarami tylko przy włączonej instrumentacji (WISIELEC_METRICS)
+    if Metrics.enabled():
+        routes["/debug/metrics"] = "views.debug_view:MetricsView"
+    router.routes = routes
+
+    # Widoki statyczne budujemy raz i używamy ponownie przy kolejnych wizytach
+    router.cached_routes = {"/", "/info"}
+    return router
@@ -0,0 +1,93 @@
+"""
+debug_view.py
+
+This module defines the MetricsView, a debug page listing the metrics recorded by the
+instrumentation layer (see `backend.Metrics`). The route is registered only when the
+instrumentation is enabled with the WISIELEC_METRICS environment variable.
+
+Functions:
+    MetricsView(router, page):
+        Renders the counters, gauges and histograms recorded so far.
+"""
+
+import flet as ft
+from backend import Metrics
+from backend.PoolRegistry import REGISTRY
+from backend.Updates import get_scheduler, batched
+from backend.Snack import add_snack
+from backend.CurrentRoute import CurrentRoute
+
+def _format(value):
+    # Liczby całkowite bez części ułamkowej, pozostałe z dwoma miejscami po przecinku
+    if value is None:
+        return "-"
+    return str(value) if isinstance(value, int) else f"{value:.2f}"
+
+def MetricsView(router, page):
+    """
+    Renders the counters, gauges and histograms recorded so far, together with the
+    update scheduler of the session and the shared pool registry.
+
+    Args:
+        router (Router): The router instance used for navigating between pages.
+        page (ft.Page): The Flet page instance where the UI components will be added.
+
+    Returns:
+        ft.ListView: The Flet ListView containing the metrics.
+    """
+    snapshot = Metrics.snapshot()
+    if snapshot is None:
+        return ft.Text("Pomiary są wyłączone (ustaw zmienną WISIELEC_METRICS=1)", color=ft.Colors.RED)
+
+    # Liczniki i wskaźniki (także te z harmonogramu aktualizacji sesji i rejestru pul)
+    values = dict(snapshot["counters"])
+    values.update(snapshot["gauges"])
+    values.update({f"scheduler.{name}": value for name, value in get_scheduler(page).stats().items()})
+    values.update({f"registry.{name}": value for name, value in REGISTRY.stats().items()})
+    counters = ft.DataTable(
+        columns=[ft.DataColumn(ft.Text("Licznik")), ft.DataColumn(ft.Text("Wartość"), numeric=True)],
+        rows=[
+            ft.DataRow(cells=[ft.DataCell(ft.Text(name)), ft.DataCell(ft.Text(_format(value)))])
+            for name, value in sorted(values.items())
+        ],
+    )
+
+    # Histogramy: czasy w ms, liczby kontrolek i słówek
+    histograms = ft.DataTable(
+        columns=[ft.DataColumn(ft.Text("Histogram"))] + [
+            ft.DataColumn(ft.Text(label), numeric=True) for label in ("Liczba", "Średnio", "Min", "Max")
+        ],
+        rows=[
+            ft.DataRow(cells=[ft.DataCell(ft.Text(name))] + [
+                ft.DataCell(ft.Text(_format(histogram[key]))) for key in ("count", "mean", "min", "max")
+            ])
+            for name, histogram in sorted(snapshot["histograms"].items())
+        ],
+    )
+
+    def save_clicked(e):
+        try:
+            saved = Metrics.dump()
+        except OSError as error:  # Np. brak katalogu albo uprawnień do zapisu
+            add_snack(content=f"Nie udało się zapisać pomiarów: {error}", color=ft.Colors.RED, page=page)
+            return
+        if saved:
+            add_snack(content="Zapisano pomiary do pliku", color=ft.Colors.GREEN, page=page)
+        else:
+            add_snack(content="Nie ustawiono pliku (WISIELEC_METRICS_FILE)", color=ft.Colors.RED, page=page)
+
+    content = ft.ListView(
+        [
+            ft.Text(f"Pomiary (od {snapshot['uptime']:.0f} s)", size=24),
+            ft.Row([
+                ft.ElevatedButton(text="Odśwież", on_click=batched(page, lambda e: router.reload_page(CurrentRoute(page=page), page))),
+                ft.ElevatedButton(text="Zapisz do pliku", on_click=save_clicked),
+            ]),
+            counters,
+            histograms,
+        ],
+        expand=True,
+        spacing=10,
+        padding=10,
+    )
+    return content
@@ -2,23 +2,26 @@
 index_view.py
 
 This module defines the IndexView, which represents the home page of the application. 
-The page includes buttons for navigating to the game view and the settings view.
+The page includes buttons for navigating to the game view, the settings view and the statistics view.
 
 Functions:
     IndexView(router, page):
         Renders the home page of the application with buttons to navigate to the game 
-        view and settings view.
+        view, settings view and statistics view.
 """
 
 import flet as ft
+from backend.Persistence import restore_session
+from backend.Settings import restore_word_pool
 
 def IndexView(router, page):
     """
     Renders the home page of the application.
 
-    This page contains two buttons:
+    This page contains three buttons:
         - Play: Navigates to the game page ("/play").
         - Settings: Navigates to the settings page ("/settings").
+        - Statistics: Navigates to the statistics page ("/stats").
 
     Args:
         router (Router): The router instance used for navigating between pages.
@@ -31,6 +34,10 @@ def IndexView(router, page):
     # Jeśli nie ma ustawionej liczby dopuszczalnych pomyłek w sesji, ustawiamy ją na domyślną wartość 7
     if not page.session.contains_key("max_mistakes"):
         page.session.set("max_mistakes", 7)
+        # Pierwsze uruchomienie w tej sesji: przywracamy stan zapisany w pamięci klienta
+        pool_path = restore_session(page)
+        if pool_path is not None:
+            page.run_task(restore_word_pool, page, pool_path)  # Pulę wczytujemy w tle
 
     # Ustawienie strony i routera w sesji
     page.session.set("page", page)
@@ -38,12 +45,16 @@ def IndexView(router, page):
 
     # Funkcja obsługująca kliknięcie przycisku "Graj"
     def play_btn_clicked(e):
-        page.go('/play')  # Przechodzi do strony gry
+        router.go(page, '/play')  # Przechodzi do strony gry
     
     # Funkcja obsługująca kliknięcie przycisku "Ustawienia"
     def settings_btn_clicked(e):
-        page.go('/settings')  # Przechodzi do strony ustawień
+        router.go(page, '/settings')  # Przechodzi do strony ustawień
     
+    # Funkcja obsługująca kliknięcie przycisku "Statystyki"
+    def stats_btn_clicked(e):
+        router.go(page, '/stats')  # Przechodzi do strony statystyk
+
     # Przyciski
     play_btn = ft.ElevatedButton(
         content=ft.Row(
@@ -69,6 +80,18 @@ def IndexView(router, page):
         on_click=settings_btn_clicked  # Obsługuje kliknięcie przycisku "Ustawienia"
     )
 
+    stats_btn = ft.ElevatedButton(
+        content=ft.Row(
+            [
+                ft.Icon(ft.Icons.BAR_CHART, size=40),
+                ft.Text("Statystyki", size=40)
+            ],
+            height=70,
+            alignment=ft.MainAxisAlignment.CENTER
+        ),
+        on_click=stats_btn_clicked  # Obsługuje kliknięcie przycisku "Statystyki"
+    )
+
     # Tytuł aplikacji
     title = ft.Text(
         "Wisielec",  # Tytuł gry
@@ -87,6 +110,7 @@ def IndexView(router, page):
             title,  # Tytuł
             play_btn,  # Przycisk "Graj"
             settings_btn,  # Przycisk "Ustawienia"
+            stats_btn,  # Przycisk "Statystyki"
         ],
     )
     
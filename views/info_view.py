@@ -70,5 +70,4 @@ def InfoView(router, page):
         padding=10,   # Odstępy wewnętrzne
     )
     
-    page.add(content)  # Dodanie zawartości do strony
     return content  # Zwrócenie zawartości
@@ -2,8 +2,8 @@
 play_view.py
 
 This module defines the GameView, which represents the main game page of the
-Hangman game. It handles the display of the word to guess, manages user input,
-and tracks the game state such as the number of mistakes and the letters guessed.
+Hangman game. It handles the display of the word to guess and of the hangman figure, manages user
+input, and tracks the game state such as the number of mistakes and the letters guessed.
 
 Functions:
     GameView(router, page):
@@ -13,7 +13,10 @@ Functions:
 
 import flet as ft
 from backend.Snack import add_snack
-from backend.Game import *
+from backend.Game import new_game, guess_letter, show_hint, set_hint_preparing, restart_game, handle_win, handle_loss
+from backend.Updates import batched
+from backend.PoolRegistry import session_pool
+from backend.Gallows import gallows_canvas
 
 def GameView(router, page):
     """
@@ -37,45 +40,35 @@ def GameView(router, page):
         return ft.Text("Nie masz wczytanych żadnych słówek!", color=ft.Colors.RED)
     
     # Zainicjalizowanie stanu gry z sesji, jeśli dostępny
-    if not page.session.contains_key("correct_word"):
-        correct_word = random_word(page=page)
-        page.session.set("correct_word", correct_word)
-    else:
-        correct_word = page.session.get("correct_word")
-
-    # Pobranie wartości z sesji, a jeśli nie istnieje, ustawienie wartości domyślnych
-    max_trials = page.session.get("max_mistakes")
-
-    guessed_letters = page.session.get("guessed_letters")
-    if guessed_letters is None:
-        guessed_letters = ['_'] * len(correct_word)  # Inicjalizacja zgadywanych liter
-    
-    mistakes = page.session.get("mistakes")
-    if mistakes is None:
-        mistakes = 0  # Inicjalizacja liczby błędów
-    
-    guessed_letters_set = page.session.get("guessed_letters_set")
-    if guessed_letters_set is None:
-        guessed_letters_set = set()  # Inicjalizacja zbioru zgadniętych liter
+    state = page.session.get("game_state")
+    if state is None:
+        state = new_game(page=page)
+    # Limit pomyłek mógł zostać zmieniony w ustawieniach w trakcie gry
+    state.max_mistakes = page.session.get("max_mistakes")
 
     # Interfejs użytkownika
-    word_display = ft.Text(" ".join(guessed_letters), size=50, text_align=ft.TextAlign.CENTER, width=page.width)
-    used_trials = ft.Text(f"Pomyłki: {mistakes}/{max_trials}", size=20)
-    word_pool = ft.Text(f"Pula słówek: {len(page.session.get('words'))}", color=ft.Colors.GREEN, size=20)
-    letter_input = ft.TextField(label="Wpisz literę", autofocus=True, on_submit=lambda e: guess_letter(page, router, letter_input, correct_word, guessed_letters, mistakes, guessed_letters_set, max_trials))
-    restart_btn = ft.ElevatedButton(text="Zacznij od nowa", on_click=lambda e: restart_game(page, router))
+    word_display = ft.Text(" ".join(state.pattern()), size=50, text_align=ft.TextAlign.CENTER, width=page.width)
+    used_trials = ft.Text(f"Pomyłki: {state.mistakes}/{state.max_mistakes}", size=20)
+    gallows = gallows_canvas(state)  # Rysunek wisielca, dorysowywany przy każdej pomyłce
+    word_pool = ft.Text(f"Pula słówek: {len(session_pool(page))}", color=ft.Colors.GREEN, size=20)
+    letter_input = ft.TextField(label="Wpisz literę", autofocus=True, on_submit=batched(page, lambda e: guess_letter(page, router, letter_input, state, word_display, used_trials, gallows)))
+    hint_btn = ft.TextButton(text="Podpowiedź", icon=ft.Icons.LIGHTBULB_OUTLINE, on_click=batched(page, lambda e: show_hint(page, state, hint_btn)))
+    # Indeks podpowiedzi może się jeszcze budować w tle (pierwsza podpowiedź dla tej puli)
+    set_hint_preparing(hint_btn, page.session.get("hint_indexing") is session_pool(page) is not None)
+    restart_btn = ft.ElevatedButton(text="Zacznij od nowa", on_click=batched(page, lambda e: restart_game(page, router)))
 
     content = ft.Column([  # Tworzenie kolumny z elementami
         word_display,
         used_trials,
+        gallows,
         word_pool,
+        hint_btn,
         letter_input
     ], alignment=ft.MainAxisAlignment.CENTER)
 
-    if "_" not in guessed_letters:  # Gracz wygrał
+    if state.is_won():  # Gracz wygrał
         handle_win(page, content, restart_btn, word_display)
-    elif mistakes >= max_trials:  # Gracz przegrał
-        handle_loss(page, content, restart_btn, correct_word, word_display)
+    elif state.is_lost():  # Gracz przegrał
+        handle_loss(page, content, restart_btn, state.word, word_display)
 
-    page.add(content)  # Dodajemy zawartość na stronę po jego stworzeniu
     return content  # Zwrócenie zawartości
@@ -0,0 +1,182 @@
+"""
+pool_view.py
+
+This module defines the PoolView, a browser of the session's word pool. The words are
+listed in alphabetical order, filtered by a prefix (binary search in the sorted index of
+the pool, see `backend.PoolIndex`) or by a substring (a scan of the pool's buffer). The
+results are shown one page at a time in a fixed set of PAGE_SIZE rows: moving to another
+page refills the same rows, so even a pool of millions of words never has more than one
+page of controls, however far the player browses. Words marked for removal are removed
+together, when the changes are saved.
+
+Functions:
+    PoolView(router, page):
+        Renders the pool browser.
+"""
+
+import asyncio
+import flet as ft
+from backend.PoolRegistry import session_pool
+from backend.PoolIndex import PAGE_SIZE, get_sorted_index, is_indexed, find_substring
+from backend.Settings import LOADER, remove_words
+from backend.Updates import get_scheduler, batched, request_scroll
+from backend.CurrentRoute import CurrentRoute
+
+STRUCK = ft.TextStyle(decoration=ft.TextDecoration.LINE_THROUGH, color=ft.Colors.RED)
+
+async def _build_index(router, page, pool):
+    # Indeks budujemy w wątku roboczym, a po zbudowaniu odświeżamy przeglądarkę, jeśli nadal jest otwarta
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(LOADER, get_sorted_index, pool)
+    if page.session.get("pool_indexing") is pool:
+        page.session.remove("pool_indexing")
+    if page.route == "/pool" and session_pool(page) is pool:
+        with get_scheduler(page).batch():
+            router.reload_page(current_route=CurrentRoute(page=page), page=page)
+
+def _pending_removals(page):
+    # Słówka zaznaczone do usunięcia; zaznaczenia dotyczą tylko puli, w której je zrobiono
+    handle = page.session.get("words")
+    pending = page.session.get("pool_removals")
+    if pending is None or pending[0] != handle.key:
+        pending = (handle.key, set())
+        page.session.set("pool_removals", pending)
+    return pending[1]
+
+def PoolView(router, page):
+    """
+    Renders the browser of the session's word pool: a search field, one page of the matching
+    words with buttons moving between pages, and the button removing the marked words.
+
+    Args:
+        router (Router): The router instance used for navigating between pages.
+        page (ft.Page): The Flet page instance where the UI components will be added.
+
+    Returns:
+        ft.Column: The Flet column containing the pool browser UI.
+    """
+    pool = session_pool(page)
+    if pool is None or len(pool) == 0:
+        return ft.Text("Nie dodano żadnych słówek!", color=ft.Colors.RED)
+
+    # Usuwanie zaznaczonych słówek: kopia puli powstaje w tle (Settings.remove_words)
+    if page.session.get("pool_removing") is pool:
+        return ft.Column([ft.ProgressRing(), ft.Text(f"Usuwanie słówek z puli {len(pool)} słówek...")])
+
+    # Pierwsze otwarcie dla tej puli: sortowanie dużej puli trwa, więc nie blokujemy widoku
+    if not is_indexed(pool):
+        if page.session.get("pool_indexing") is not pool:
+            page.session.set("pool_indexing", pool)
+            page.run_task(_build_index, router, page, pool)
+        return ft.Column([ft.ProgressRing(), ft.Text(f"Przygotowywanie indeksu {len(pool)} słówek...")])
+
+    index = get_sorted_index(pool)
+    pending = _pending_removals(page)
+    results = None  # Pozycje w indeksie (wyszukiwanie początku) albo None (wyszukiwanie fragmentu)
+    page_number = 0  # Numer wyświetlanej strony wyników
+    page_starts = [0]  # Słówka, od których zaczynają się kolejne strony wyszukiwania fragmentu
+
+    def fill_row(tile, word_index):
+        # Wiersz pokazuje słówko strony (albo jest ukryty); kliknięcie kosza zaznacza słówko do usunięcia albo cofa zaznaczenie
+        tile.visible = word_index is not None
+        if word_index is None:
+            return
+        marked = word_index in pending
+        tile.data = word_index
+        tile.title.value = pool[word_index]
+        tile.title.style = STRUCK if marked else None
+        tile.trailing.icon = ft.Icons.RESTORE if marked else ft.Icons.DELETE_OUTLINE
+        tile.trailing.tooltip = "Przywróć" if marked else "Usuń"
+
+    def new_row():
+        tile = ft.ListTile(title=ft.Text(), dense=True, visible=False)
+        tile.trailing = ft.IconButton(on_click=batched(page, lambda e: toggle(tile)))
+        return tile
+
+    def toggle(tile):
+        word_index = tile.data
+        if word_index in pending:
+            pending.discard(word_index)
+        else:
+            pending.add(word_index)
+        fill_row(tile, word_index)
+        update_save_button()
+        get_scheduler(page).request(tile, save_btn)
+
+    def show_page(number):
+        # Wypełniamy te same wiersze słówkami strony `number`
+        nonlocal page_number
+        page_number = number
+        if results is not None:
+            first = number * PAGE_SIZE
+            indexes = [index.order[position] for position in results[first:first + PAGE_SIZE]]
+            has_next = first + PAGE_SIZE < len(results)
+            summary.value = f"Wyniki: {len(results)}"
+        else:
+            indexes, next_start = find_substring(pool, search_field.value or "", page_starts[number])
+            if next_start is not None and len(page_starts) == number + 1:
+                page_starts.append(next_start)
+            has_next = next_start is not None
+            summary.value = f"Wyniki: {number * PAGE_SIZE + len(indexes)}{'+' if has_next else ''}"
+        for position, row in enumerate(rows):
+            fill_row(row, indexes[position] if position < len(indexes) else None)
+        page_label.value = f"Strona {number + 1}"
+        prev_btn.disabled = number == 0
+        next_btn.disabled = not has_next
+        if words_list.page is not None:  # Pierwsza strona trafia do klienta razem z całym widokiem
+            request_scroll(page, words_list)  # Nowa strona od góry, w tej samej aktualizacji
+            get_scheduler(page).request(summary, page_label, prev_btn, next_btn)
+
+    def turn_page(step):
+        # Przycisk mógł zostać kliknięty, zanim dotarło jego wyłączenie
+        if not (prev_btn if step < 0 else next_btn).disabled:
+            show_page(page_number + step)
+
+    def search(e=None):
+        # Nowe wyszukiwanie: lista zaczyna się od pierwszej strony wyników
+        nonlocal results, page_starts
+        text = search_field.value or ""
+        results = index.prefix_range(pool, text) if mode.value == "prefix" else None
+        page_starts = [0]
+        show_page(0)
+
+    def update_save_button():
+        save_btn.text = f"Usuń zaznaczone ({len(pending)})"
+        save_btn.disabled = not pending
+
+    def save(e):
+        indexes = list(pending)
+        pending.clear()
+        remove_words(page, router, indexes)  # Wywołanie funkcji z Settings
+
+    # Kontrolki
+    search_field = ft.TextField(label="Szukaj słówka", on_change=batched(page, search), width=300)
+    mode = ft.Dropdown(
+        value="prefix",
+        options=[
+            ft.dropdown.Option(key="prefix", text="Zaczyna się od"),
+            ft.dropdown.Option(key="substring", text="Zawiera"),
+        ],
+        on_change=batched(page, search),
+        width=200,
+    )
+    summary = ft.Text()
+    rows = [new_row() for _ in range(PAGE_SIZE)]  # Jedyne wiersze listy, wypełniane słówkami kolejnych stron
+    words_list = ft.ListView(rows, expand=True, spacing=0)
+    page_label = ft.Text()
+    prev_btn = ft.IconButton(icon=ft.Icons.CHEVRON_LEFT, tooltip="Poprzednia strona", on_click=batched(page, lambda e: turn_page(-1)))
+    next_btn = ft.IconButton(icon=ft.Icons.CHEVRON_RIGHT, tooltip="Następna strona", on_click=batched(page, lambda e: turn_page(1)))
+    save_btn = ft.ElevatedButton(on_click=batched(page, save))
+    update_save_button()
+    search()
+
+    return ft.Column(
+        [
+            ft.Text(f"Pula słówek ({len(pool)})", size=24),
+            ft.Row([search_field, mode]),
+            ft.Row([summary, save_btn]),
+            words_list,
+            ft.Row([prev_btn, page_label, next_btn]),
+        ],
+        expand=True,
+    )
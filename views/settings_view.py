@@ -2,8 +2,10 @@
 settings_view.py
 
 This module defines the SettingView, which is the settings page of the Hangman game. 
-It provides functionality to upload a file containing words and set the maximum 
-number of allowed mistakes in the game.
+It provides functionality to upload files (or a whole directory) containing words, set
+the maximum number of allowed mistakes in the game, select the difficulty of the words
+and treat letters with and without diacritics as the same letter. The loaded pool can
+be browsed and edited in the pool browser (see `views.pool_view`).
 
 Functions:
     SettingView(router, page):
@@ -11,8 +13,15 @@ Functions:
         set the maximum number of allowed mistakes for the game.
 """
 
+import os
 import flet as ft
-from backend.Settings import handle_file_select, on_max_mistakes_input_clicked
+from backend.Settings import handle_file_select, on_max_mistakes_input_clicked, on_difficulty_changed, on_fold_diacritics_changed
+from backend.Difficulty import Difficulty
+from backend.Ingest import WORD_FILE_EXTENSIONS
+from backend.Updates import batched
+from backend.PoolRegistry import session_pool
+
+REPORT_LINES = 20  # Ile plików wymieniamy w raporcie z wczytania
 
 def SettingView(router, page):
     """
@@ -27,15 +36,28 @@ def SettingView(router, page):
         ft.Column: The Flet column containing the settings page UI.
     """
 
-    # Tworzymy kontrolkę do wyboru pliku
-    file_picker = ft.FilePicker(
-        on_result=lambda e: handle_file_select(e, page, router)  # Wywołanie funkcji z Settings
-    )
+    # Pasek postępu widoczny podczas wczytywania pliku
+    progress_bar = ft.ProgressBar(width=300, visible=page.session.contains_key("file_loading"))
+
+    # Obsługa wyboru pliku; plik jest wczytywany w tle, a strona pozostaje responsywna
+    async def on_file_selected(e):
+        await handle_file_select(e, page, router, progress_bar)  # Wywołanie funkcji z Settings
+
+    # Kontrolka do wyboru pliku jest tworzona raz i współdzielona między wizytami na stronie
+    file_picker = router.singleton(page, "file_picker", ft.FilePicker)
+    file_picker.on_result = on_file_selected  # Obsługa musi wskazywać na aktualny widok
 
     # Przyciski
     open_file_picker_btn = ft.ElevatedButton(
-        text="Wybierz plik",
-        on_click=lambda e: file_picker.pick_files()  # Otwiera FilePicker
+        text="Wybierz pliki",
+        on_click=lambda e: file_picker.pick_files(  # Otwiera FilePicker (można wybrać kilka plików)
+            allow_multiple=True,
+            allowed_extensions=[extension.lstrip(".") for extension in WORD_FILE_EXTENSIONS],
+        )
+    )
+    open_directory_btn = ft.ElevatedButton(
+        text="Wybierz folder",
+        on_click=lambda e: file_picker.get_directory_path()  # Wszystkie listy słówek z folderu
     )
 
     # Pobranie wartości liczby maksymalnych pomyłek z sesji
@@ -43,32 +65,68 @@ def SettingView(router, page):
     max_mistakes_input = ft.TextField(
         hint_text="Podaj liczbę akceptowalnych pomyłek",
         value=max_mistakes,
-        on_submit=lambda e: on_max_mistakes_input_clicked(page, router, max_mistakes_input.value),  # Wywołanie funkcji z Settings
+        on_submit=batched(page, lambda e: on_max_mistakes_input_clicked(page, router, max_mistakes_input.value)),  # Wywołanie funkcji z Settings
         width=300
     )
 
     # Tekst informacyjny
     hint_text = ft.Text("Liczba dopuszczalnych pomyłek:")
 
+    # Wybór poziomu trudności losowanych słówek
+    difficulty = page.session.get("difficulty")
+    difficulty_dropdown = ft.Dropdown(
+        label="Poziom trudności",
+        value=Difficulty(difficulty).name if difficulty is not None else "ANY",
+        options=[
+            ft.dropdown.Option(key="ANY", text="Dowolny"),
+            ft.dropdown.Option(key=Difficulty.EASY.name, text="Łatwy"),
+            ft.dropdown.Option(key=Difficulty.MEDIUM.name, text="Średni"),
+            ft.dropdown.Option(key=Difficulty.HARD.name, text="Trudny"),
+        ],
+        on_change=batched(page, lambda e: on_difficulty_changed(page, difficulty_dropdown.value)),  # Wywołanie funkcji z Settings
+        width=300
+    )
+
+    # Tryb, w którym zgadnięcie "a" odsłania też "ą"
+    fold_switch = ft.Switch(
+        label="Litery bez ogonków (a = ą, z = ż, ź)",
+        value=bool(page.session.get("fold_diacritics")),
+        on_change=batched(page, lambda e: on_fold_diacritics_changed(page, fold_switch.value)),  # Wywołanie funkcji z Settings
+    )
+
     # Kolumna, która będzie zawierać przycisk
     content = ft.Column(
         controls=[
             hint_text,
             max_mistakes_input,
-            open_file_picker_btn,
+            difficulty_dropdown,
+            fold_switch,
+            ft.Row([open_file_picker_btn, open_directory_btn]),
+            progress_bar,
         ]
     )
 
     # Sprawdzamy, czy słowa zostały dodane do sesji
-    if not page.session.contains_key("words") or len(page.session.get("words")) == 0:
+    if not page.session.contains_key("words") or len(session_pool(page)) == 0:
         content.controls.append(ft.Text("Nie dodano żadnych słówek!", color=ft.Colors.RED))
     else:
-        content.controls.append(ft.Text(f"Dodano pulę {len(page.session.get('words'))} słówek", color=ft.Colors.GREEN))
-    
-    # Dodajemy FilePicker i content na stronę
-    page.add(
-        file_picker,  # Dodajemy kontrolkę FilePicker
-        content
-    )
+        pool = session_pool(page)
+        content.controls.append(ft.Row([
+            ft.Text(f"Dodano pulę {len(pool)} słówek", color=ft.Colors.GREEN),
+            ft.TextButton(text="Przeglądaj pulę", icon=ft.Icons.LIST, on_click=lambda e: router.go(page, "/pool")),
+        ]))
+        # Raport z wczytania kilku plików: ile słówek dał każdy z nich
+        sources = pool.sources or []
+        for entry in sources[:REPORT_LINES]:
+            name = os.path.basename(entry["path"])
+            if entry["error"] is not None:
+                content.controls.append(ft.Text(f"{name}: błąd ({entry['error']})", color=ft.Colors.RED))
+            else:
+                content.controls.append(ft.Text(
+                    f"{name}: {entry['words']} słówek, nowych {entry['added']}, powtórzeń w pliku {entry['duplicates']}"
+                ))
+        if len(sources) > REPORT_LINES:
+            content.controls.append(ft.Text(f"... i {len(sources) - REPORT_LINES} innych plików"))
+
 
     return content  # Zwrócenie zawartości
@@ -0,0 +1,134 @@
+"""
+stats_view.py
+
+This module defines the StatsView, the statistics page of the Hangman game. It shows
+the running statistics of all finished games, the most played words and the history
+of games, newest first. The history is read one page at a time (see `backend.History`)
+and shown in a fixed set of PAGE_SIZE rows: moving to older or newer games refills the
+same rows, so a long history never adds controls to the page.
+
+Functions:
+    StatsView(router, page):
+        Renders the statistics and the history of games, one page at a time.
+"""
+
+import sqlite3
+from datetime import datetime
+import flet as ft
+from backend.History import get_history, PAGE_SIZE
+from backend.Snack import add_snack
+from backend.Updates import get_scheduler, batched, request_scroll
+
+def _percent(value):
+    return "-" if value is None else f"{value:.0%}"
+
+def _number(value):
+    return "-" if value is None else f"{value:.2f}"
+
+def _game_row():
+    # Wiersz listy gier, wypełniany grami kolejnych stron
+    return ft.ListTile(leading=ft.Icon(), title=ft.Text(), subtitle=ft.Text(), dense=True, visible=False)
+
+def _fill_row(tile, game):
+    # Wiersz pokazuje jedną grę z historii (albo jest ukryty)
+    tile.visible = game is not None
+    if game is None:
+        return
+    result = "Wygrana" if game["won"] else "Przegrana"
+    played_at = datetime.fromtimestamp(game["played_at"]).strftime("%Y-%m-%d %H:%M")
+    tile.leading.name = ft.Icons.CHECK_CIRCLE if game["won"] else ft.Icons.CANCEL
+    tile.leading.color = ft.Colors.GREEN if game["won"] else ft.Colors.RED
+    tile.title.value = game["word"]
+    tile.subtitle.value = f"{result}, pomyłki {game['mistakes']}/{game['max_mistakes']}, liter {game['guesses']}, {played_at}"
+
+def StatsView(router, page):
+    """
+    Renders the statistics of all finished games, the most played words and one page
+    of the history of games, with buttons moving to older and newer games.
+
+    Args:
+        router (Router): The router instance used for navigating between pages.
+        page (ft.Page): The Flet page instance where the UI components will be added.
+
+    Returns:
+        ft.Column: The Flet column containing the statistics page UI.
+    """
+    try:
+        history = get_history()
+        summary = history.summary()
+        top_words = history.top_words()
+        first_page = history.games()
+    except (sqlite3.Error, OSError) as e:
+        return ft.Text(f"Nie udało się odczytać historii gier: {e}", color=ft.Colors.RED)
+    if summary["games"] == 0:
+        return ft.Text("Nie rozegrano jeszcze żadnej gry", size=20)
+
+    # Statystyki z liczników aktualizowanych przy każdej grze
+    totals = ft.Text(
+        f"Gry: {summary['games']}, wygrane: {summary['wins']}, przegrane: {summary['losses']}, "
+        f"skuteczność: {_percent(summary['win_rate'])}, średnio pomyłek: {_number(summary['average_mistakes'])}",
+        size=20,
+    )
+    words_table = ft.DataTable(
+        columns=[ft.DataColumn(ft.Text("Słówko"))] + [
+            ft.DataColumn(ft.Text(label), numeric=True) for label in ("Gry", "Skuteczność", "Średnio pomyłek")
+        ],
+        rows=[
+            ft.DataRow(cells=[
+                ft.DataCell(ft.Text(word)),
+                ft.DataCell(ft.Text(str(stats["games"]))),
+                ft.DataCell(ft.Text(_percent(stats["win_rate"]))),
+                ft.DataCell(ft.Text(_number(stats["average_mistakes"]))),
+            ])
+            for word, stats in top_words
+        ],
+    )
+
+    # Historia: te same wiersze wypełniamy grami kolejnych stron (od najnowszych)
+    page_befores = [None]  # Dla każdej odwiedzonej strony: id, poniżej którego zaczynają się jej gry
+    page_number = 0
+
+    def show_page(number, games):
+        nonlocal page_number
+        page_number = number
+        for position, row in enumerate(rows):
+            _fill_row(row, games[position] if position < len(games) else None)
+        if len(games) == PAGE_SIZE and len(page_befores) == number + 1:
+            page_befores.append(games[-1]["id"])
+        newer_btn.disabled = number == 0
+        older_btn.disabled = len(games) < PAGE_SIZE
+        page_label.value = f"Strona {number + 1}"
+        if games_list.page is not None:  # Pierwsza strona trafia do klienta razem z całym widokiem
+            request_scroll(page, games_list)
+            get_scheduler(page).request(page_label, newer_btn, older_btn)
+
+    def turn_page(step):
+        # Przycisk mógł zostać kliknięty, zanim dotarło jego wyłączenie
+        if (newer_btn if step < 0 else older_btn).disabled:
+            return
+        try:
+            games = history.games(before=page_befores[page_number + step])
+        except (sqlite3.Error, OSError) as e:
+            add_snack(content=f"Nie udało się odczytać historii gier: {e}", color=ft.Colors.RED, page=page)
+            return
+        show_page(page_number + step, games)
+
+    rows = [_game_row() for _ in range(PAGE_SIZE)]  # Jedyne wiersze listy gier
+    games_list = ft.ListView(rows, expand=True, spacing=2)
+    page_label = ft.Text()
+    newer_btn = ft.IconButton(icon=ft.Icons.CHEVRON_LEFT, tooltip="Nowsze gry", on_click=batched(page, lambda e: turn_page(-1)))
+    older_btn = ft.IconButton(icon=ft.Icons.CHEVRON_RIGHT, tooltip="Starsze gry", on_click=batched(page, lambda e: turn_page(1)))
+    show_page(0, first_page)
+
+    return ft.Column(
+        [
+            ft.Text("Statystyki", size=24),
+            totals,
+            ft.Text("Najczęściej losowane słówka", size=20),
+            words_table,
+            ft.Text("Historia gier", size=20),
+            games_list,
+            ft.Row([newer_btn, page_label, older_btn]),
+        ],
+        expand=True,
+    )